@@ -1,12 +1,103 @@
+"""
+Time source for the backend.
+
+Everything that needs "now" goes through the active clock, which is the
+real system clock unless a VirtualClock has been installed with
+set_clock() / use_clock(). Simulations and tests use a VirtualClock to
+drive months of usage in seconds.
+"""
+
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 
+
+class SystemClock:
+	"""Wall-clock and monotonic time from the operating system."""
+
+	def now_utc(self):
+		return datetime.now(timezone.utc)
+
+	def monotonic(self):
+		return time.monotonic()
+
+
+class VirtualClock:
+	"""Clock that only moves when advance() is called.
+
+	Local time is derived from the virtual UTC instant with the system time
+	zone, the same way SQLite's 'localtime' modifier does, so DST changes
+	behave like they would in real use.
+	"""
+
+	def __init__(self, start=None):
+		if start is None:
+			start = datetime.now(timezone.utc)
+		elif start.tzinfo is None:
+			start = start.astimezone()  # naive -> local wall time
+		self._utc = start.astimezone(timezone.utc)
+		self._mono = 0.0
+
+	def now_utc(self):
+		return self._utc
+
+	def monotonic(self):
+		return self._mono
+
+	def advance(self, seconds):
+		self._utc += timedelta(seconds=seconds)
+		self._mono += seconds
+
+
+_clock = SystemClock()
+
+
+def get_clock():
+	return _clock
+
+
+def set_clock(clock):
+	"""Install `clock` as the process-wide time source; returns the previous one."""
+	global _clock
+	previous, _clock = _clock, clock
+	return previous
+
+
+@contextmanager
+def use_clock(clock):
+	previous = set_clock(clock)
+	try:
+		yield clock
+	finally:
+		set_clock(previous)
+
+
+def now_utc():
+	"""Current time as an aware UTC datetime."""
+	return _clock.now_utc()
+
+
+def monotonic():
+	return _clock.monotonic()
+
+
+def unix_time():
+	"""Current time as integer Unix seconds."""
+	return int(_clock.now_utc().timestamp())
+
+
+def local_today():
+	"""Current local date (datetime.date)."""
+	return _clock.now_utc().astimezone().date()
+
+
 def utc_now_iso():
 	"""Return current UTC time as ISO8601 string (no microseconds)."""
-	return datetime.utcnow().replace(tzinfo=timezone.utc, microsecond=0).isoformat()
+	return _clock.now_utc().replace(microsecond=0).isoformat()
 
 def local_today_str():
 	"""Return local date as YYYY-MM-DD string."""
-	return datetime.now().date().isoformat()
+	return local_today().isoformat()
 
 def fmt_hms(seconds: int) -> str:
 	"""Format seconds as HH:MM:SS."""
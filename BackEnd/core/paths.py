@@ -16,3 +16,21 @@ def user_data_dir(app_name="StudyTracker"):
 def db_path():
 	"""Return Path to study.db inside user data dir."""
 	return user_data_dir() / "study.db"
+
+def journal_path():
+	"""Return Path to the heartbeat journal kept next to study.db."""
+	return user_data_dir() / "study.journal"
+
+def app_lock_path():
+	"""Return Path to the lock file held by the running app (single instance)."""
+	return user_data_dir() / "app.lock"
+
+def backups_dir():
+	"""Return Path to the directory holding study.db backups."""
+	path = user_data_dir() / "backups"
+	path.mkdir(exist_ok=True)
+	return path
+
+def day_cache_path():
+	"""Return Path to the memory-mapped per-day totals kept next to study.db."""
+	return user_data_dir() / "study.days"
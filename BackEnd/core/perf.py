@@ -0,0 +1,93 @@
+"""
+Lightweight latency histograms for diagnosing stalls.
+
+Code records samples with record(name, ms) or `with timed(name):`; the
+developer overlay reads snapshot() and export_report() writes everything
+to a JSON file that can be attached to a bug report.
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# upper bounds (ms) of the all-time histogram buckets; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class RollingHistogram:
+	"""Recent samples for percentiles plus all-time bucket counts."""
+
+	def __init__(self, window=2048):
+		self.samples = deque(maxlen=window)
+		self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+		self.count = 0
+		self.max_ms = 0.0
+		self.last_ms = 0.0
+
+	def add(self, ms):
+		self.samples.append(ms)
+		self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+		self.count += 1
+		self.last_ms = ms
+		self.max_ms = max(self.max_ms, ms)
+
+	def summary(self):
+		ordered = sorted(self.samples)
+
+		def pct(q):
+			return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+		return {
+			"count": self.count,
+			"last_ms": round(self.last_ms, 3),
+			"p50_ms": round(pct(0.50), 3),
+			"p95_ms": round(pct(0.95), 3),
+			"p99_ms": round(pct(0.99), 3),
+			"max_ms": round(self.max_ms, 3),
+			"buckets": dict(zip([f"<={b}" for b in BUCKET_BOUNDS_MS] + [f">{BUCKET_BOUNDS_MS[-1]}"], self.buckets)),
+		}
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def record(name, ms):
+	"""Add one sample (milliseconds) to histogram `name`."""
+	with _lock:
+		hist = _histograms.get(name)
+		if hist is None:
+			hist = _histograms[name] = RollingHistogram()
+		hist.add(ms)
+
+
+@contextmanager
+def timed(name):
+	t0 = time.perf_counter()
+	try:
+		yield
+	finally:
+		record(name, (time.perf_counter() - t0) * 1000)
+
+
+def snapshot():
+	"""Return {name: summary dict} for every histogram."""
+	with _lock:
+		return {name: hist.summary() for name, hist in sorted(_histograms.items())}
+
+
+def export_report(path=None):
+	"""Write snapshot() to a timestamped JSON report and return its path."""
+	if path is None:
+		from BackEnd.core.paths import user_data_dir
+		path = user_data_dir() / time.strftime("perf_report_%Y%m%d_%H%M%S.json")
+	report = {
+		"created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"metrics": snapshot(),
+	}
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump(report, f, indent=2)
+	return path
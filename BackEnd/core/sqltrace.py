@@ -0,0 +1,295 @@
+"""
+Optional SQL tracing for repository connections.
+
+Enable with the environment variable FOCUSLY_SQL_TRACE=1 (threshold for the
+slow-query log via FOCUSLY_SQL_SLOW_MS, default 50) or by calling enable().
+When disabled, connect() is a plain sqlite3.connect and nothing is wrapped.
+
+When enabled, every statement gets an execution count (including statements
+run inside executescript and triggers, via set_trace_callback), latency
+samples for p50/p99, and the number of rows fetched. A query's latency
+sample covers its execute call plus the fetches that read its rows, and is
+recorded once the result is drained, the cursor runs another statement or
+is closed. The stats are written to sqltrace.json on exit; dump them with:
+
+	python -m BackEnd.core.sqltrace [path/to/sqltrace.json]
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+SAMPLES_PER_STATEMENT = 1024
+
+_enabled = False
+_slow_ms = 50.0
+_stats = {}
+_lock = threading.Lock()
+
+
+class _Stat:
+	__slots__ = ("count", "traced", "rows", "total_ms", "max_ms", "samples")
+
+	def __init__(self):
+		self.count = 0
+		self.traced = 0
+		self.rows = 0
+		self.total_ms = 0.0
+		self.max_ms = 0.0
+		self.samples = deque(maxlen=SAMPLES_PER_STATEMENT)
+
+
+# the trace callback sees SQL with bound values expanded; replacing literals
+# with ? makes both views of a statement share one key
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def _key(sql):
+	return _LITERALS.sub("?", " ".join(sql.split()))[:240]
+
+
+def _stat(key):
+	stat = _stats.get(key)
+	if stat is None:
+		stat = _stats[key] = _Stat()
+	return stat
+
+
+def _record(key, elapsed_ms):
+	with _lock:
+		stat = _stat(key)
+		stat.count += 1
+		stat.total_ms += elapsed_ms
+		stat.max_ms = max(stat.max_ms, elapsed_ms)
+		stat.samples.append(elapsed_ms)
+	if elapsed_ms >= _slow_ms:
+		log.warning("slow query (%.1f ms): %s", elapsed_ms, key)
+
+
+def _add_rows(key, n):
+	if n:
+		with _lock:
+			_stat(key).rows += n
+
+
+def _on_trace(statement):
+	with _lock:
+		_stat(_key(statement)).traced += 1
+
+
+class TracedCursor(sqlite3.Cursor):
+	"""Cursor that times statements (execute plus fetches) and counts the rows fetched."""
+
+	_sql_key = None
+	_active = False      # a statement ran and its sample is not recorded yet
+	_pending_ms = 0.0    # time spent on that statement so far
+
+	def _finish(self):
+		if self._active:
+			self._active = False
+			_record(self._sql_key, self._pending_ms)
+
+	def _start(self, key):
+		self._finish()
+		self._sql_key = key
+		self._active = True
+		self._pending_ms = 0.0
+
+	def _timed(self, fn, *args):
+		if not self._active:
+			# fetches after the result was drained belong to no sample
+			return fn(*args)
+		t0 = time.perf_counter()
+		try:
+			return fn(*args)
+		finally:
+			self._pending_ms += (time.perf_counter() - t0) * 1000
+
+	def execute(self, sql, parameters=()):
+		self._start(_key(sql))
+		try:
+			return self._timed(super().execute, sql, parameters)
+		finally:
+			# statements without a result set are complete now
+			if self.description is None:
+				self._finish()
+
+	def executemany(self, sql, seq_of_parameters):
+		self._start(_key(sql))
+		try:
+			return self._timed(super().executemany, sql, seq_of_parameters)
+		finally:
+			self._finish()
+
+	def executescript(self, sql_script):
+		self._start("<script> " + _key(sql_script)[:80])
+		try:
+			return self._timed(super().executescript, sql_script)
+		finally:
+			self._finish()
+
+	def fetchone(self):
+		row = self._timed(super().fetchone)
+		_add_rows(self._sql_key, row is not None)
+		if row is None:
+			self._finish()
+		return row
+
+	def fetchmany(self, size=None):
+		size = self.arraysize if size is None else size
+		rows = self._timed(super().fetchmany, size)
+		_add_rows(self._sql_key, len(rows))
+		if len(rows) < size:
+			self._finish()
+		return rows
+
+	def fetchall(self):
+		rows = self._timed(super().fetchall)
+		_add_rows(self._sql_key, len(rows))
+		self._finish()
+		return rows
+
+	def __next__(self):
+		try:
+			row = self._timed(super().__next__)
+		except StopIteration:
+			self._finish()
+			raise
+		_add_rows(self._sql_key, 1)
+		return row
+
+	def close(self):
+		self._finish()
+		super().close()
+
+	def __del__(self):
+		# a query abandoned before its last row still gets its sample
+		try:
+			self._finish()
+		except Exception:
+			pass
+
+
+class TracedConnection(sqlite3.Connection):
+	"""Connection whose shortcut execute methods go through TracedCursor."""
+
+	def cursor(self, factory=TracedCursor):
+		return super().cursor(factory)
+
+	def execute(self, sql, parameters=()):
+		return self.cursor().execute(sql, parameters)
+
+	def executemany(self, sql, seq_of_parameters):
+		return self.cursor().executemany(sql, seq_of_parameters)
+
+	def executescript(self, sql_script):
+		return self.cursor().executescript(sql_script)
+
+
+def connect(database, **kwargs):
+	"""sqlite3.connect, instrumented only while tracing is enabled."""
+	if not _enabled:
+		return sqlite3.connect(database, **kwargs)
+	conn = sqlite3.connect(database, factory=TracedConnection, **kwargs)
+	conn.set_trace_callback(_on_trace)
+	return conn
+
+
+def enable(slow_ms=None):
+	"""Turn tracing on for connections opened from now on."""
+	global _enabled, _slow_ms
+	if slow_ms is not None:
+		_slow_ms = float(slow_ms)
+	if not _enabled:
+		_enabled = True
+		atexit.register(dump)
+
+
+def disable():
+	global _enabled
+	_enabled = False
+
+
+def is_enabled():
+	return _enabled
+
+
+def reset():
+	with _lock:
+		_stats.clear()
+
+
+def _percentile(sorted_samples, q):
+	if not sorted_samples:
+		return 0.0
+	return sorted_samples[min(len(sorted_samples) - 1, int(q * len(sorted_samples)))]
+
+
+def snapshot():
+	"""Return per-statement stats as a list of dicts, slowest total first."""
+	with _lock:
+		items = [(key, stat, sorted(stat.samples)) for key, stat in _stats.items()]
+	result = []
+	for key, stat, samples in items:
+		result.append({
+			"sql": key,
+			"count": stat.count,
+			"traced": stat.traced,
+			"rows": stat.rows,
+			"total_ms": round(stat.total_ms, 3),
+			"p50_ms": round(_percentile(samples, 0.50), 3),
+			"p99_ms": round(_percentile(samples, 0.99), 3),
+			"max_ms": round(stat.max_ms, 3),
+		})
+	result.sort(key=lambda r: r["total_ms"], reverse=True)
+	return result
+
+
+def _default_dump_path():
+	from BackEnd.core.paths import user_data_dir
+	return user_data_dir() / "sqltrace.json"
+
+
+def dump(path=None):
+	"""Write snapshot() as JSON (default: sqltrace.json in the user data dir)."""
+	stats = snapshot()
+	if not stats:
+		return None
+	path = path or _default_dump_path()
+	with open(path, "w", encoding="utf-8") as f:
+		json.dump({"slow_ms": _slow_ms, "statements": stats}, f, indent=2)
+	return path
+
+
+def format_table(stats, limit=30):
+	lines = [f"{'count':>7} {'traced':>7} {'rows':>8} {'p50 ms':>8} {'p99 ms':>8} {'total ms':>10}  sql"]
+	for r in stats[:limit]:
+		lines.append(
+			f"{r['count']:>7} {r['traced']:>7} {r['rows']:>8} {r['p50_ms']:>8.2f} "
+			f"{r['p99_ms']:>8.2f} {r['total_ms']:>10.1f}  {r['sql'][:100]}"
+		)
+	return "\n".join(lines)
+
+
+if os.environ.get("FOCUSLY_SQL_TRACE"):
+	enable(os.environ.get("FOCUSLY_SQL_SLOW_MS"))
+
+
+if __name__ == "__main__":
+	path = sys.argv[1] if len(sys.argv) > 1 else _default_dump_path()
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			data = json.load(f)
+	except FileNotFoundError:
+		print(f"No trace file at {path}. Run the app with FOCUSLY_SQL_TRACE=1 first.")
+		sys.exit(1)
+	print(format_table(data["statements"]))
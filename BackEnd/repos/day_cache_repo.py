@@ -0,0 +1,259 @@
+"""
+Per-day study totals in a memory-mapped file kept next to study.db.
+
+Layout: a 16-byte header (magic, version, base day, slot count) followed by
+little-endian int32 seconds, slot i holding local day `base + i` (days since
+1970-01-01, the numbering of analytics_service.day_number). Reads are
+numpy slices of the mapping, with no query and no parsing. session_repo
+writes the days each committed transaction touched back into their slots,
+so the file is updated in place instead of being recomputed.
+
+The file is only a cache of session_days. It is rebuilt when it is missing
+or unreadable, when a day before its base gains study time, and when its
+checksums (total seconds and seconds weighted by day number) disagree with
+the database at open.
+"""
+
+import datetime
+import logging
+import os
+import struct
+import numpy as np
+from BackEnd.core.clock import local_today
+from BackEnd.core.paths import day_cache_path
+
+MAGIC = b"SDAY"
+VERSION = 1
+# magic, version, base day, number of day slots
+HEADER = struct.Struct("<4sIiI")
+# slots are added in blocks so a new day rarely resizes the file
+GROW_DAYS = 64
+
+log = logging.getLogger(__name__)
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+# day number of session_days.local_date, computed in SQL
+_DAY_SQL = "CAST(julianday(local_date) - 2440587.5 AS INTEGER)"
+
+_shared = None
+
+
+def _day(iso):
+	return datetime.date.fromisoformat(iso).toordinal() - _EPOCH_ORDINAL
+
+
+class DayCache:
+	"""Seconds studied per local day, read through numpy.memmap."""
+
+	def __init__(self, path=None):
+		self.path = path or day_cache_path()
+		self.base = local_today().toordinal() - _EPOCH_ORDINAL
+		self.days = np.zeros(0, dtype="<i4")
+		self._ino = None
+
+	# ---- file ---------------------------------------------------------------
+
+	def open(self, verify=True):
+		"""Map the file; rebuild it when missing, unreadable or (with verify) stale."""
+		if not self._map() or (verify and not self._matches_db()):
+			self.rebuild()
+		return self
+
+	def close(self):
+		if isinstance(self.days, np.memmap):
+			self.days.flush()
+		# the mapping is released with the last reference to it
+		self.days = np.zeros(0, dtype="<i4")
+		self._ino = None
+
+	def _map(self):
+		try:
+			st = os.stat(self.path)
+			with open(self.path, "rb") as f:
+				magic, version, base, length = HEADER.unpack(f.read(HEADER.size))
+		except (OSError, struct.error):
+			return False
+		if magic != MAGIC or version != VERSION or st.st_size != HEADER.size + 4 * length:
+			return False
+		self.base = base
+		if length:
+			self.days = np.memmap(self.path, dtype="<i4", mode="r+", offset=HEADER.size, shape=(length,))
+		else:
+			self.days = np.zeros(0, dtype="<i4")
+		self._ino = st.st_ino
+		return True
+
+	def _current(self):
+		"""Remap when another process replaced, grew or removed the file."""
+		if self._ino is None:
+			return
+		try:
+			st = os.stat(self.path)
+		except OSError:
+			st = None
+		if st is None or st.st_ino != self._ino or st.st_size != HEADER.size + 4 * len(self.days):
+			self.close()
+			self.open(verify=False)
+
+	def _matches_db(self):
+		from BackEnd.repos import session_repo
+		with session_repo.connect() as conn:
+			total, moment = conn.execute(
+				f"SELECT COALESCE(SUM(seconds), 0), COALESCE(SUM(seconds * {_DAY_SQL}), 0) FROM session_days"
+			).fetchone()
+		days = self.days.astype(np.int64)
+		index = np.arange(self.base, self.base + len(days), dtype=np.int64)
+		return int(days.sum()) == total and int(days @ index) == moment
+
+	def rebuild(self):
+		"""Write the file from session_days (through a temp file) and map it."""
+		from BackEnd.repos import session_repo
+		with session_repo.connect() as conn:
+			rows = conn.execute(
+				f"SELECT {_DAY_SQL}, SUM(seconds) FROM session_days GROUP BY local_date"
+			).fetchall()
+		base = local_today().toordinal() - _EPOCH_ORDINAL
+		days = np.zeros(0, dtype="<i4")
+		if rows:
+			data = np.array([tuple(r) for r in rows], dtype=np.int64)
+			base = int(data[:, 0].min())
+			days = np.zeros(int(data[:, 0].max()) - base + 1, dtype="<i4")
+			days[data[:, 0] - base] = data[:, 1]
+		self.close()
+		tmp = self.path.with_name(self.path.name + ".tmp")
+		with open(tmp, "wb") as f:
+			f.write(HEADER.pack(MAGIC, VERSION, base, len(days)))
+			f.write(days.tobytes())
+		try:
+			os.replace(tmp, self.path)
+		except OSError:
+			# Windows refuses to replace a file another process has mapped:
+			# serve this process from memory until the next open
+			os.remove(tmp)
+			self.base, self.days = base, days
+			return
+		self._map()
+
+	def _grow(self, length):
+		length = -(-length // GROW_DAYS) * GROW_DAYS
+		if self._ino is None:
+			self.days = np.concatenate([self.days, np.zeros(length - len(self.days), dtype="<i4")])
+			return
+		self.close()
+		with open(self.path, "r+b") as f:
+			f.truncate(HEADER.size + 4 * length)
+			f.write(HEADER.pack(MAGIC, VERSION, self.base, length))
+		self._map()
+
+	# ---- writes -------------------------------------------------------------
+
+	def update(self, dates, conn=None):
+		"""Re-read the totals of local `dates` (YYYY-MM-DD) from session_days into their slots.
+
+		`conn` is the writer's connection, reused after its commit.
+		"""
+		from BackEnd.repos import session_repo
+		dates = sorted(set(dates))
+		if not dates:
+			return
+		self._current()
+		conn = conn or session_repo.connect()
+		totals = {}
+		# chunk to stay under SQLite's host-parameter limit
+		for i in range(0, len(dates), 500):
+			chunk = dates[i:i + 500]
+			cur = conn.execute(
+				f"SELECT local_date, SUM(seconds) FROM session_days "
+				f"WHERE local_date IN ({','.join('?' * len(chunk))}) GROUP BY local_date", chunk)
+			totals.update((row[0], row[1]) for row in cur.fetchall())
+		first, last = _day(dates[0]), _day(dates[-1])
+		if first < self.base:
+			self.rebuild()
+			return
+		if last >= self.base + len(self.days):
+			self._grow(last - self.base + 1)
+		# stores go straight to the shared mapping, visible to other processes;
+		# no msync per write since a cache lost to an OS crash fails its checksums
+		for date in dates:
+			self.days[_day(date) - self.base] = totals.get(date, 0)
+
+	# ---- reads --------------------------------------------------------------
+
+	def _view(self, first_day, last_day):
+		"""(offset into [first_day, last_day], view of the cached slots inside it)."""
+		self._current()
+		lo = max(first_day, self.base)
+		hi = min(last_day, self.base + len(self.days) - 1)
+		if lo > hi:
+			return 0, self.days[:0]
+		return lo - first_day, self.days[lo - self.base:hi - self.base + 1]
+
+	def slice(self, first_day, last_day):
+		"""Seconds per day for [first_day, last_day], zero outside the cached range."""
+		out = np.zeros(last_day - first_day + 1, dtype=np.int64)
+		offset, view = self._view(first_day, last_day)
+		out[offset:offset + len(view)] = view
+		return out
+
+	def seconds(self, first_day, last_day):
+		"""Total seconds studied in [first_day, last_day]."""
+		return int(self._view(first_day, last_day)[1].sum(dtype=np.int64))
+
+	def total_seconds(self):
+		self._current()
+		return int(self.days.sum(dtype=np.int64))
+
+	def days_studied(self):
+		self._current()
+		return int(np.count_nonzero(self.days))
+
+	def streak(self, today=None):
+		"""Consecutive days with study time ending today (0 if today has none)."""
+		today = local_today().toordinal() - _EPOCH_ORDINAL if today is None else today
+		if today < self.base:
+			return 0
+		studied = self.slice(self.base, today) > 0
+		if not studied[-1]:
+			return 0
+		gaps = np.flatnonzero(~studied)
+		return int(len(studied) - (gaps[-1] + 1 if len(gaps) else 0))
+
+
+def shared():
+	"""The process-wide cache, opened (and checked against study.db) on first use."""
+	global _shared
+	if _shared is None:
+		_shared = DayCache().open()
+	return _shared
+
+
+def update_days(dates, conn=None):
+	"""Write the totals of `dates` into the cache after `conn` committed them.
+
+	Uses this process's cache when one is open, otherwise the file on disk
+	if it exists (other processes see the change through their mapping).
+	Never raises: callers run it after their commit, inside retry_locked,
+	so a failure here (a lock, a full disk) drops the cache instead, and it
+	is rebuilt from session_days on next use.
+	"""
+	if not dates:
+		return
+	try:
+		if _shared is not None:
+			_shared.update(dates, conn)
+		elif day_cache_path().exists():
+			cache = DayCache().open(verify=False)
+			cache.update(dates, conn)
+			cache.close()
+	except Exception:
+		log.warning("day cache update failed; dropping the cache", exc_info=True)
+		invalidate()
+
+
+def invalidate():
+	"""Remove the cache file (study.db was replaced); it is rebuilt on next use."""
+	try:
+		os.remove(day_cache_path())
+	except OSError:
+		# missing, or mapped elsewhere on Windows: the checksums catch it at open
+		pass
@@ -0,0 +1,41 @@
+from BackEnd.core.clock import utc_now_iso
+from BackEnd.repos.session_repo import connect, retry_locked
+
+PERIODS = ("daily", "weekly")
+
+
+def list_goals():
+	"""Return all goals as dicts (id, period, subject, target_sec), daily first."""
+	with connect() as conn:
+		cur = conn.execute(
+			"SELECT id, period, subject, target_sec FROM goals "
+			"ORDER BY period = 'weekly', subject"
+		)
+		return [dict(row) for row in cur.fetchall()]
+
+
+@retry_locked
+def set_goal(period, target_sec, subject=""):
+	"""Create or replace the goal for (period, subject). Returns its id."""
+	if period not in PERIODS:
+		raise ValueError(f"unknown goal period: {period!r}")
+	subject = (subject or "").strip()
+	with connect() as conn:
+		conn.execute(
+			"""
+			INSERT INTO goals (period, subject, target_sec, updated_at) VALUES (?, ?, ?, ?)
+			ON CONFLICT (period, subject) DO UPDATE SET
+				target_sec = excluded.target_sec, updated_at = excluded.updated_at
+			""",
+			(period, subject, int(target_sec), utc_now_iso())
+		)
+		row = conn.execute(
+			"SELECT id FROM goals WHERE period=? AND subject=?", (period, subject)
+		).fetchone()
+		return row["id"]
+
+
+@retry_locked
+def delete_goal(goal_id):
+	with connect() as conn:
+		conn.execute("DELETE FROM goals WHERE id=?", (goal_id,))
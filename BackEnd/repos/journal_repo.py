@@ -0,0 +1,102 @@
+import os
+import struct
+from BackEnd.core import clock
+from BackEnd.core.paths import journal_path
+
+# Record kinds written by TimerService
+START = 1
+HEARTBEAT = 2
+PAUSE = 3
+RESUME = 4
+STOP = 5
+
+# kind, session_id, elapsed_sec, unix timestamp -> 20 bytes per record
+RECORD = struct.Struct("<BxxxIIq")
+
+
+class Journal:
+	"""Append-only journal of timer heartbeats and state transitions.
+
+	Records are written unbuffered, so a crash of the app loses nothing that
+	was appended. fsync is applied on every transition and every
+	`fsync_every` heartbeats, which bounds what an OS crash can lose.
+	"""
+
+	def __init__(self, path=None, fsync_every=5):
+		self.path = path or journal_path()
+		self.fsync_every = max(1, int(fsync_every))
+		self._fh = None
+		self._unsynced = 0
+		self._open = set()
+
+	def _file(self):
+		if self._fh is None:
+			self._fh = open(self.path, "ab", buffering=0)
+		return self._fh
+
+	def append(self, kind, session_id, elapsed_sec):
+		"""Append one record and fsync according to the policy."""
+		fh = self._file()
+		fh.write(RECORD.pack(kind, int(session_id), int(elapsed_sec), clock.unix_time()))
+		self._unsynced += 1
+		if kind != HEARTBEAT or self._unsynced >= self.fsync_every:
+			os.fsync(fh.fileno())
+			self._unsynced = 0
+		if kind in (START, RESUME):
+			self._open.add(session_id)
+		elif kind == STOP:
+			self._open.discard(session_id)
+			# nothing left to recover: keep the file from growing
+			if not self._open:
+				self.truncate()
+
+	def truncate(self):
+		"""Drop all records (after they were replayed or made obsolete)."""
+		fh = self._file()
+		fh.truncate(0)
+		os.fsync(fh.fileno())
+		self._unsynced = 0
+
+	def close(self):
+		if self._fh is not None:
+			self._fh.close()
+			self._fh = None
+
+
+def read_records(path=None):
+	"""Return list of (kind, session_id, elapsed_sec, ts) tuples; ignores a torn tail."""
+	path = path or journal_path()
+	if not path.exists():
+		return []
+	with open(path, "rb") as f:
+		data = f.read()
+	usable = len(data) - len(data) % RECORD.size
+	return list(RECORD.iter_unpack(data[:usable]))
+
+
+def latest_heartbeats(records):
+	"""Map session_id -> (elapsed_sec, ts) for sessions without a STOP record."""
+	latest = {}
+	for kind, session_id, elapsed, ts in records:
+		if kind == STOP:
+			latest.pop(session_id, None)
+			continue
+		prev = latest.get(session_id)
+		if prev is None or elapsed >= prev[0]:
+			latest[session_id] = (elapsed, ts)
+	return latest
+
+
+def replay(path=None):
+	"""Replay the journal into `sessions` and truncate it. Returns sessions updated."""
+	from BackEnd.repos import session_repo
+	path = path or journal_path()
+	records = read_records(path)
+	updated = 0
+	if records:
+		updated = session_repo.apply_heartbeats(latest_heartbeats(records))
+	if path.exists():
+		with open(path, "r+b") as f:
+			f.truncate(0)
+			os.fsync(f.fileno())
+	return updated
@@ -1,15 +1,120 @@
+import functools
+import re
 import sqlite3
+import time
+import uuid
+from collections import namedtuple
 from pathlib import Path
+from BackEnd.core import perf, sqltrace
 from BackEnd.core.paths import db_path
-from BackEnd.core.clock import utc_now_iso, local_today_str
+from BackEnd.core.clock import utc_now_iso, local_today_str, local_today
+from BackEnd.repos import day_cache_repo
 
 SCHEMA_PATH = Path(__file__).parent.parent.parent / "SQL" / "schema.sql"
 
+# Bumped when a migration needs a one-off data rebuild (PRAGMA user_version)
+SCHEMA_VERSION = 4
+
+# Lock policy for every connection to study.db (app, CLI tools, backups):
+# wait up to BUSY_TIMEOUT_MS for another connection's lock, and retry a
+# whole write transaction LOCK_RETRIES times if it still found the file busy.
+BUSY_TIMEOUT_MS = 2000
+LOCK_RETRIES = 3
+LOCK_RETRY_DELAY = 0.05   # seconds, grows linearly per attempt
+
+# wall-clock span of a finished session from its timestamps, stored in span_sec
+_SPAN_SQL = "CAST(strftime('%s', end_utc) AS INTEGER) - CAST(strftime('%s', start_utc) AS INTEGER)"
+
+# Split finished sessions into per-local-day slices. Runs entirely in SQLite
+# (recursive CTE) so rebuilding years of history is one statement. Sessions
+# whose recorded segments add up to duration_sec are split segment by
+# segment (pauses fall on the day they happened); others as one interval.
+_SPLIT_SQL = """
+WITH RECURSIVE
+src(id, subject, st, duration_sec, segmented) AS (
+	SELECT id, COALESCE(subject, ''),
+		CAST(strftime('%s', start_utc, 'localtime') AS INTEGER), duration_sec,
+		(SELECT SUM(length) FROM session_segments g WHERE g.session_id = sessions.id) = duration_sec
+	FROM sessions
+	WHERE end_utc IS NOT NULL AND duration_sec IS NOT NULL AND deleted_at IS NULL {filter}
+),
+base(id, subject, lo, hi) AS (
+	SELECT id, subject, st, st + duration_sec FROM src WHERE segmented IS NOT 1
+	UNION ALL
+	SELECT src.id, src.subject, src.st + g.start_offset, src.st + g.start_offset + g.length
+	FROM src JOIN session_segments g ON g.session_id = src.id
+	WHERE src.segmented = 1
+),
+parts(id, subject, lo, hi) AS (
+	SELECT id, subject, lo, hi FROM base
+	UNION ALL
+	SELECT id, subject, (lo / 86400 + 1) * 86400, hi FROM parts
+	WHERE (lo / 86400 + 1) * 86400 < hi
+)
+INSERT INTO session_days (session_id, local_date, subject, seconds)
+SELECT id, date(lo, 'unixepoch'), subject, SUM(MIN(hi, (lo / 86400 + 1) * 86400) - lo)
+FROM parts
+GROUP BY id, date(lo, 'unixepoch')
+"""
+
+# Compact read-side row: a plain tuple (no per-row dict) with timestamps as
+# Unix epoch seconds. end_ts/duration_sec are None while a session is open.
+SessionRecord = namedtuple(
+	"SessionRecord", "id local_date start_ts end_ts duration_sec subject source")
+
+_RECORD_SQL = """
+SELECT id, local_date,
+	CAST(strftime('%s', start_utc) AS INTEGER),
+	CAST(strftime('%s', end_utc) AS INTEGER),
+	duration_sec, COALESCE(subject, ''), COALESCE(source, 'timer')
+FROM sessions
+WHERE deleted_at IS NULL AND local_date BETWEEN ? AND ?
+ORDER BY start_utc DESC
+"""
+
+# Columns exchanged by sync; client_id identifies a session across devices
+SYNC_COLUMNS = (
+	"client_id", "start_utc", "end_utc", "duration_sec", "local_date", "subject",
+	"note", "updated_at", "deleted_at", "elapsed_sec", "source",
+)
+
+def is_locked_error(exc):
+	"""True for the OperationalErrors SQLite raises when another connection holds a lock."""
+	if not isinstance(exc, sqlite3.OperationalError):
+		return False
+	msg = str(exc).lower()
+	return "locked" in msg or "busy" in msg
+
+def retry_locked(fn):
+	"""Re-run a write transaction that failed on a lock (see LOCK_RETRIES).
+
+	Only for functions doing their writes in one `with connect()` block: the
+	failed attempt was rolled back, so running it again cannot apply twice.
+	Anything they do after the commit must not raise (see
+	day_cache_repo.update_days).
+	"""
+	@functools.wraps(fn)
+	def wrapper(*args, **kwargs):
+		for attempt in range(LOCK_RETRIES):
+			try:
+				return fn(*args, **kwargs)
+			except sqlite3.OperationalError as e:
+				if attempt == LOCK_RETRIES - 1 or not is_locked_error(e):
+					raise
+				time.sleep(LOCK_RETRY_DELAY * (attempt + 1))
+	return wrapper
+
 def connect():
 	"""Open SQLite connection and ensure schema is applied."""
 	dbfile = db_path()
-	conn = sqlite3.connect(dbfile)
+	conn = sqltrace.connect(dbfile, timeout=BUSY_TIMEOUT_MS / 1000)
 	conn.row_factory = sqlite3.Row
+	# New databases free pages on demand (PRAGMA incremental_vacuum) so purges
+	# can shrink the file without a full VACUUM. The mode can only be chosen
+	# before the first table exists, and setting it takes a write lock, so
+	# it is not part of the schema script that runs on every connect.
+	if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+		conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
 	with open(SCHEMA_PATH, encoding="utf-8") as f:
 		conn.executescript(f.read())
 
@@ -26,84 +131,415 @@ def connect():
 			conn.execute("ALTER TABLE sessions ADD COLUMN source TEXT DEFAULT 'timer'")
 		except Exception:
 			pass
+	if 'span_sec' not in cols:
+		try:
+			conn.execute("ALTER TABLE sessions ADD COLUMN span_sec INTEGER")
+		except Exception:
+			pass
+
+	# Migration: backfill per-day slices, the full-text index and span_sec
+	# for rows written before they existed
+	version = conn.execute("PRAGMA user_version").fetchone()[0]
+	if version < SCHEMA_VERSION:
+		with conn:
+			if version < 2:
+				refresh_session_days(conn)
+			if version < 3:
+				conn.execute("INSERT INTO sessions_fts (sessions_fts) VALUES ('rebuild')")
+			if version < 4:
+				conn.execute(f"UPDATE sessions SET span_sec = {_SPAN_SQL} WHERE end_utc IS NOT NULL")
+			conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+		if version < 2:
+			day_cache_repo.invalidate()
 	return conn
 
+def mark_history_rewritten(conn):
+	"""Replace the history version token inside the writer's transaction on `conn`.
+
+	For writes an updated_at watermark cannot see: hard deletes, and rows
+	merged with timestamps from another device's clock.
+	"""
+	conn.execute(
+		"INSERT INTO meta (key, value) VALUES ('history_version', ?) "
+		"ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+		(uuid.uuid4().hex,)
+	)
+
+def history_version():
+	"""Token that changes whenever history was rewritten (see mark_history_rewritten)."""
+	with connect() as conn:
+		row = conn.execute("SELECT value FROM meta WHERE key = 'history_version'").fetchone()
+		return row["value"] if row else ""
+
+def refresh_session_days(conn, session_ids=None):
+	"""Rebuild session_days for `session_ids` (all sessions when None) on `conn`.
+
+	Returns the set of local dates whose slices changed (None for a full rebuild),
+	for day_cache_repo.update_days() once the transaction is committed.
+	"""
+	if session_ids is None:
+		conn.execute("DELETE FROM session_days")
+		conn.execute(_SPLIT_SQL.format(filter=""))
+		return None
+	ids = [int(i) for i in session_ids]
+	dates = set()
+	# chunk to stay under SQLite's host-parameter limit
+	for i in range(0, len(ids), 500):
+		chunk = ids[i:i + 500]
+		marks = ",".join("?" * len(chunk))
+		touched = f"SELECT local_date FROM session_days WHERE session_id IN ({marks})"
+		dates.update(row[0] for row in conn.execute(touched, chunk))
+		conn.execute(f"DELETE FROM session_days WHERE session_id IN ({marks})", chunk)
+		conn.execute(_SPLIT_SQL.format(filter=f"AND id IN ({marks})"), chunk)
+		dates.update(row[0] for row in conn.execute(touched, chunk))
+	return dates
+
+@retry_locked
 def start_session(subject="", note="", source="timer"):
 	"""Start a new session and return session_id. Source is 'timer' or 'pomodoro'."""
 	now_utc = utc_now_iso()
 	today = local_today_str()
-	with connect() as conn:
+	with perf.timed("db_write"), connect() as conn:
 		cur = conn.execute(
 			"""
-			INSERT INTO sessions (start_utc, local_date, subject, note, updated_at, source)
-			VALUES (?, ?, ?, ?, ?, ?)
+			INSERT INTO sessions (start_utc, local_date, subject, note, updated_at, source, client_id)
+			VALUES (?, ?, ?, ?, ?, ?, ?)
 			""",
-			(now_utc, today, subject, note, now_utc, source)
+			(now_utc, today, subject, note, now_utc, source, uuid.uuid4().hex)
 		)
 		return cur.lastrowid
 
+@retry_locked
 def update_elapsed(session_id, elapsed_sec):
 	"""Update the elapsed_sec and updated_at for an active session (no end_utc)."""
 	now = utc_now_iso()
-	with connect() as conn:
+	with perf.timed("db_write"), connect() as conn:
 		conn.execute(
 			"UPDATE sessions SET elapsed_sec=?, updated_at=? WHERE id=?",
 			(int(elapsed_sec), now, session_id)
 		)
 		conn.commit()
 
-def stop_session(session_id):
-	"""Stop session, set end_utc, duration_sec, updated_at. Returns duration_sec."""
-	now_utc = utc_now_iso()
+@retry_locked
+def apply_heartbeats(heartbeats):
+	"""Apply {session_id: (elapsed_sec, unix_ts)} to still-open sessions in one transaction.
+
+	Used by journal replay; never moves elapsed_sec backwards. Returns rows updated.
+	"""
+	from datetime import datetime, timezone
+	params = [
+		(int(elapsed), datetime.fromtimestamp(ts, timezone.utc).isoformat(), session_id, int(elapsed))
+		for session_id, (elapsed, ts) in heartbeats.items()
+	]
+	if not params:
+		return 0
 	with connect() as conn:
+		cur = conn.executemany(
+			"""
+			UPDATE sessions SET elapsed_sec=?, updated_at=?
+			WHERE id=? AND end_utc IS NULL AND COALESCE(elapsed_sec, 0) <= ?
+			""",
+			params
+		)
+		return cur.rowcount
+
+@retry_locked
+def add_segment(session_id, start_offset, length):
+	"""Record an active interval of `length` seconds starting `start_offset` seconds after start_utc."""
+	if length <= 0:
+		return
+	with perf.timed("db_write"), connect() as conn:
+		conn.execute(
+			"INSERT OR REPLACE INTO session_segments (session_id, start_offset, length) VALUES (?, ?, ?)",
+			(session_id, int(start_offset), int(length))
+		)
+
+@retry_locked
+def stop_session(session_id, segments=()):
+	"""Stop session, set end_utc, duration_sec, span_sec, updated_at. Returns duration_sec.
+
+	Duration is the sum of the session's recorded segments (paused time
+	excluded) or end - start for sessions that were never paused.
+	`segments` are (start_offset, length) pairs not stored yet by
+	add_segment(); they are written in the same transaction.
+	"""
+	now_utc = utc_now_iso()
+	with perf.timed("db_write"), connect() as conn:
+		conn.executemany(
+			"INSERT OR REPLACE INTO session_segments (session_id, start_offset, length) "
+			"SELECT id, ?, ? FROM sessions WHERE id=? AND end_utc IS NULL",
+			[(int(start), int(length), session_id) for start, length in segments if length > 0]
+		)
 		cur = conn.execute(
-			"SELECT start_utc FROM sessions WHERE id=? AND end_utc IS NULL", (session_id,))
+			"SELECT start_utc, (SELECT SUM(length) FROM session_segments WHERE session_id = sessions.id) AS active "
+			"FROM sessions WHERE id=? AND end_utc IS NULL", (session_id,))
 		row = cur.fetchone()
 		if not row:
 			return None
-		start_utc = row["start_utc"]
-		start_dt = sqlite3.datetime.datetime.fromisoformat(start_utc)
+		start_dt = sqlite3.datetime.datetime.fromisoformat(row["start_utc"])
 		end_dt = sqlite3.datetime.datetime.fromisoformat(now_utc)
-		duration = int((end_dt - start_dt).total_seconds())
+		span = int((end_dt - start_dt).total_seconds())
+		duration = span if row["active"] is None else int(row["active"])
 		conn.execute(
 			"""
-			UPDATE sessions SET end_utc=?, duration_sec=?, updated_at=? WHERE id=?
+			UPDATE sessions SET end_utc=?, duration_sec=?, span_sec=?, updated_at=? WHERE id=?
 			""",
-			(now_utc, duration, now_utc, session_id)
+			(now_utc, duration, span, now_utc, session_id)
+		)
+		dates = refresh_session_days(conn, [session_id])
+	day_cache_repo.update_days(dates, conn)
+	return duration
+
+@retry_locked
+def close_orphaned_sessions(max_rows=5000):
+	"""Close every open session using its last heartbeat, in one transaction.
+
+	Duration comes from elapsed_sec when a heartbeat was recorded, otherwise
+	from updated_at - start_utc. At most `max_rows` rows are handled per call
+	to keep startup bounded. Returns a report dict.
+	"""
+	from datetime import datetime, timedelta
+	now = utc_now_iso()
+	report = {"closed": 0, "recovered_sec": 0, "ids": [], "remaining": False}
+	with connect() as conn:
+		rows = conn.execute(
+			"SELECT id, start_utc, updated_at, elapsed_sec FROM sessions WHERE end_utc IS NULL ORDER BY start_utc LIMIT ?",
+			(int(max_rows) + 1,)
+		).fetchall()
+		if len(rows) > max_rows:
+			report["remaining"] = True
+			rows = rows[:max_rows]
+		params = []
+		for row in rows:
+			start_dt = datetime.fromisoformat(row["start_utc"])
+			if row["elapsed_sec"] is not None:
+				duration = int(row["elapsed_sec"])
+			else:
+				duration = int((datetime.fromisoformat(row["updated_at"]) - start_dt).total_seconds())
+			duration = max(0, duration)
+			end_utc = (start_dt + timedelta(seconds=duration)).isoformat()
+			params.append((end_utc, duration, duration, now, row["id"]))
+			report["ids"].append(row["id"])
+			report["recovered_sec"] += duration
+		conn.executemany(
+			"UPDATE sessions SET end_utc=?, duration_sec=?, span_sec=?, updated_at=? WHERE id=? AND end_utc IS NULL",
+			params
 		)
-		return duration
+		dates = refresh_session_days(conn, report["ids"])
+	day_cache_repo.update_days(dates, conn)
+	report["closed"] = len(params)
+	return report
+
+@retry_locked
+def soft_delete_session(session_id):
+	"""Mark a session deleted (kept for sync so the delete reaches other devices)."""
+	now = utc_now_iso()
+	with connect() as conn:
+		conn.execute(
+			"UPDATE sessions SET deleted_at=?, updated_at=? WHERE id=? AND deleted_at IS NULL",
+			(now, now, session_id)
+		)
+		dates = refresh_session_days(conn, [session_id])
+	day_cache_repo.update_days(dates, conn)
+
+@retry_locked
+def purge_sessions(start_date=None, end_date=None, source=None, subject=None, dry_run=False):
+	"""Permanently delete finished sessions matching every given filter.
+
+	Dates are inclusive YYYY-MM-DD bounds on the local start day; subject ''
+	matches sessions without a subject. Open sessions are never touched. The
+	rows, their per-day slices and segments go in one transaction (the
+	slices and segments by ON DELETE CASCADE), then freed pages are returned
+	to the OS with incremental_vacuum. A database created before
+	auto_vacuum=INCREMENTAL is converted by one full VACUUM on its first
+	purge. This is a local cleanup: unlike soft_delete_session() nothing is
+	left for sync to send to other devices.
+
+	Returns {"sessions", "seconds", "pages_freed"}; with dry_run only counts.
+	"""
+	where, params = ["end_utc IS NOT NULL"], []
+	if start_date is not None:
+		where.append("local_date >= ?")
+		params.append(start_date)
+	if end_date is not None:
+		where.append("local_date <= ?")
+		params.append(end_date)
+	if subject:
+		where.append("subject = ?")
+		params.append(subject)
+	elif subject is not None:
+		where.append("(subject = '' OR subject IS NULL)")
+	if source is not None:
+		where.append("COALESCE(source, 'timer') = ?")
+		params.append(source)
+	if len(where) == 1:
+		raise ValueError("purge_sessions needs at least one filter")
+	where = " AND ".join(where)
+
+	report = {"sessions": 0, "seconds": 0, "pages_freed": 0}
+	conn = connect()
+	try:
+		with conn:
+			count, seconds = conn.execute(
+				f"SELECT COUNT(*), COALESCE(SUM(duration_sec), 0) FROM sessions WHERE {where}", params
+			).fetchone()
+			report.update(sessions=count, seconds=seconds)
+			if dry_run or not count:
+				return report
+			dates = [row[0] for row in conn.execute(
+				f"SELECT DISTINCT local_date FROM session_days "
+				f"WHERE session_id IN (SELECT id FROM sessions WHERE {where})", params)]
+			conn.execute(f"DELETE FROM sessions WHERE {where}", params)
+			mark_history_rewritten(conn)
+		day_cache_repo.update_days(dates, conn)
+		before = conn.execute("PRAGMA page_count").fetchone()[0]
+		try:
+			if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+				conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+				conn.execute("VACUUM")
+			else:
+				# frees one page per step; executescript runs it to completion
+				conn.executescript("PRAGMA incremental_vacuum;")
+		except sqlite3.OperationalError as e:
+			# the delete is committed; free pages are reclaimed by a later purge
+			if not is_locked_error(e):
+				raise
+		report["pages_freed"] = before - conn.execute("PRAGMA page_count").fetchone()[0]
+	finally:
+		conn.close()
+	return report
+
+@retry_locked
+def assign_client_ids():
+	"""Give rows created before sync existed a client_id. Returns rows updated."""
+	with connect() as conn:
+		cur = conn.execute(
+			"UPDATE sessions SET client_id=lower(hex(randomblob(16))) WHERE client_id IS NULL"
+		)
+		return cur.rowcount
+
+def changed_since(watermark=None):
+	"""Return finished sessions (incl. soft-deleted) with updated_at >= watermark, as dicts.
+
+	Uses idx_sessions_updated; open sessions are skipped until they are stopped.
+	"""
+	cols = ", ".join(SYNC_COLUMNS)
+	with connect() as conn:
+		cur = conn.execute(
+			f"SELECT {cols} FROM sessions WHERE updated_at >= ? AND end_utc IS NOT NULL "
+			"AND client_id IS NOT NULL ORDER BY updated_at",
+			(watermark or "",)
+		)
+		return [dict(row) for row in cur.fetchall()]
+
+@retry_locked
+def merge_remote_rows(rows):
+	"""Merge rows from another device, last-writer-wins on updated_at.
+
+	Runs in one transaction. Returns (inserted, updated) counts.
+	"""
+	inserted = updated = 0
+	cols = ", ".join(SYNC_COLUMNS)
+	marks = ", ".join("?" * len(SYNC_COLUMNS))
+	assigns = ", ".join(f"{c}=?" for c in SYNC_COLUMNS if c != "client_id")
+	with connect() as conn:
+		for row in rows:
+			values = [row.get(c) for c in SYNC_COLUMNS]
+			cur = conn.execute("SELECT updated_at FROM sessions WHERE client_id=?", (row["client_id"],))
+			local = cur.fetchone()
+			if local is None:
+				conn.execute(f"INSERT INTO sessions ({cols}) VALUES ({marks})", values)
+				inserted += 1
+			elif (row.get("updated_at") or "") > local["updated_at"]:
+				conn.execute(
+					f"UPDATE sessions SET {assigns} WHERE client_id=?",
+					values[1:] + [row["client_id"]]
+				)
+				updated += 1
+		if rows:
+			client_ids = [r["client_id"] for r in rows]
+			ids = []
+			for i in range(0, len(client_ids), 500):
+				chunk = client_ids[i:i + 500]
+				cur = conn.execute(
+					f"SELECT id FROM sessions WHERE client_id IN ({','.join('?' * len(chunk))})", chunk)
+				ids.extend(row["id"] for row in cur.fetchall())
+			for i in range(0, len(ids), 500):
+				chunk = ids[i:i + 500]
+				conn.execute(
+					f"UPDATE sessions SET span_sec = {_SPAN_SQL} "
+					f"WHERE id IN ({','.join('?' * len(chunk))}) AND end_utc IS NOT NULL", chunk)
+			dates = refresh_session_days(conn, ids)
+			if inserted or updated:
+				mark_history_rewritten(conn)
+	if rows:
+		day_cache_repo.update_days(dates, conn)
+	return inserted, updated
 
 def active_session():
 	"""Return dict for active session (end_utc IS NULL), or None."""
 	with connect() as conn:
 		cur = conn.execute(
-			"SELECT id, start_utc, local_date, subject, source, elapsed_sec FROM sessions WHERE end_utc IS NULL ORDER BY start_utc DESC LIMIT 1"
+			"SELECT id, start_utc, local_date, subject, source, elapsed_sec FROM sessions WHERE end_utc IS NULL AND deleted_at IS NULL ORDER BY start_utc DESC LIMIT 1"
 		)
 		row = cur.fetchone()
 		return dict(row) if row else None
 
 def today_total_seconds():
-	"""Sum duration_sec for sessions with local_date = today."""
+	"""Sum studied seconds falling on today's local date (midnight-split)."""
 	today = local_today_str()
 	with connect() as conn:
 		cur = conn.execute(
-			"SELECT COALESCE(SUM(duration_sec),0) as total FROM sessions WHERE local_date=? AND duration_sec IS NOT NULL",
+			"SELECT COALESCE(SUM(seconds),0) as total FROM session_days WHERE local_date=?",
 			(today,)
 		)
 		row = cur.fetchone()
 		return row["total"] if row else 0
 
+def daily_totals(start_date, end_date):
+	"""Return {local_date: seconds} for days in [start_date, end_date] with study time."""
+	with connect() as conn:
+		cur = conn.execute(
+			"""
+			SELECT local_date, SUM(seconds) AS total_sec
+			FROM session_days
+			WHERE local_date BETWEEN ? AND ?
+			GROUP BY local_date
+			""",
+			(start_date, end_date)
+		)
+		return {row["local_date"]: row["total_sec"] or 0 for row in cur.fetchall()}
+
+def day_slices(start_date, end_date):
+	"""Return every per-day slice in [start_date, end_date] as (local_date, subject, session_id, seconds) tuples.
+
+	One indexed range read for callers that aggregate many periods at once
+	(reports) instead of querying each period separately.
+	"""
+	with connect() as conn:
+		conn.row_factory = None
+		cur = conn.execute(
+			"""
+			SELECT local_date, subject, session_id, seconds
+			FROM session_days
+			WHERE local_date BETWEEN ? AND ?
+			ORDER BY local_date
+			""",
+			(start_date, end_date)
+		)
+		return cur.fetchall()
+
 def get_daily_streak():
 	"""
 	Calculate the current daily streak - consecutive days with study sessions.
 	Returns 0 if the user skipped a full day (from 12 AM to 12 AM).
 	"""
 	import datetime
-	today = datetime.date.today()
+	today = local_today()
 	with connect() as conn:
 		# Get all unique dates with completed sessions, ordered descending
 		cur = conn.execute(
-			"SELECT DISTINCT local_date FROM sessions WHERE duration_sec IS NOT NULL AND duration_sec > 0 ORDER BY local_date DESC"
+			"SELECT DISTINCT local_date FROM session_days WHERE seconds > 0 ORDER BY local_date DESC"
 		)
 		dates = [datetime.date.fromisoformat(row["local_date"]) for row in cur.fetchall()]
 	
@@ -133,7 +569,7 @@ def get_total_days_studied():
 	"""
 	with connect() as conn:
 		cur = conn.execute(
-			"SELECT COUNT(DISTINCT local_date) as total FROM sessions WHERE duration_sec IS NOT NULL AND duration_sec > 0"
+			"SELECT COUNT(DISTINCT local_date) as total FROM session_days WHERE seconds > 0"
 		)
 		row = cur.fetchone()
 		return row["total"] if row else 0
@@ -144,8 +580,246 @@ def get_total_hours_studied():
 	"""
 	with connect() as conn:
 		cur = conn.execute(
-			"SELECT COALESCE(SUM(duration_sec), 0) as total FROM sessions WHERE duration_sec IS NOT NULL AND duration_sec > 0"
+			"SELECT COALESCE(SUM(seconds), 0) as total FROM session_days"
 		)
 		row = cur.fetchone()
 		total_seconds = row["total"] if row else 0
 		return total_seconds / 3600.0  # Convert to hours
+
+# SQL expressions mapping a local_date to the first day of its bucket
+_BUCKET_SQL = {
+	"week": "date(local_date, 'weekday 0', '-6 days')",
+	"month": "strftime('%Y-%m-01', local_date)",
+	"quarter": "strftime('%Y-', local_date) || printf('%02d', (CAST(strftime('%m', local_date) AS INTEGER) - 1) / 3 * 3 + 1) || '-01'",
+	"year": "strftime('%Y-01-01', local_date)",
+}
+BUCKET_ORDER = ("week", "month", "quarter", "year")
+
+def _bucket_start(date, bucket):
+	import datetime
+	if bucket == "week":
+		return date - datetime.timedelta(days=date.weekday())
+	if bucket == "month":
+		return date.replace(day=1)
+	if bucket == "quarter":
+		return date.replace(month=(date.month - 1) // 3 * 3 + 1, day=1)
+	return date.replace(month=1, day=1)
+
+def _next_bucket(date, bucket):
+	import datetime
+	if bucket == "week":
+		return date + datetime.timedelta(days=7)
+	months = {"month": 1, "quarter": 3, "year": 12}[bucket]
+	m = date.month - 1 + months
+	return date.replace(year=date.year + m // 12, month=m % 12 + 1, day=1)
+
+def bucket_totals(start_date, end_date, bucket="week", max_buckets=60):
+	"""
+	Returns (bucket, [(bucket_start, seconds), ...]) for [start_date, end_date], grouped in SQL.
+
+	Buckets are 'week' (Monday start), 'month', 'quarter' or 'year'; empty buckets are
+	included. If the range needs more than `max_buckets`, the next coarser bucket is used.
+	"""
+	import datetime
+	start = datetime.date.fromisoformat(start_date)
+	end = datetime.date.fromisoformat(end_date)
+	level = BUCKET_ORDER.index(bucket)
+	while True:
+		starts = []
+		b = _bucket_start(start, bucket)
+		while b <= end:
+			starts.append(b)
+			b = _next_bucket(b, bucket)
+		if len(starts) <= max_buckets or level == len(BUCKET_ORDER) - 1:
+			break
+		level += 1
+		bucket = BUCKET_ORDER[level]
+	with connect() as conn:
+		cur = conn.execute(
+			f"""
+			SELECT {_BUCKET_SQL[bucket]} AS bucket_start, SUM(seconds) AS total_sec
+			FROM session_days
+			WHERE local_date BETWEEN ? AND ?
+			GROUP BY bucket_start
+			""",
+			(start_date, end_date)
+		)
+		totals = {row["bucket_start"]: row["total_sec"] or 0 for row in cur.fetchall()}
+	return bucket, [(b.isoformat(), totals.get(b.isoformat(), 0)) for b in starts]
+
+def analytics_rows(updated_since=None):
+	"""
+	Return plain tuples (id, local_start_epoch, duration_sec, span_sec, source, subject, updated_at, live)
+	for finished sessions, optionally only those with updated_at >= updated_since.
+	`live` is 0 for soft-deleted rows. local_start_epoch is local wall time as Unix seconds;
+	span_sec is end - start including pauses.
+	"""
+	with connect() as conn:
+		conn.row_factory = None
+		cur = conn.execute(
+			"""
+			SELECT id, CAST(strftime('%s', start_utc, 'localtime') AS INTEGER), duration_sec, span_sec,
+				COALESCE(source, 'timer'), COALESCE(subject, ''), updated_at, deleted_at IS NULL
+			FROM sessions
+			WHERE end_utc IS NOT NULL AND duration_sec IS NOT NULL AND updated_at >= ?
+			ORDER BY id
+			""",
+			(updated_since or "",)
+		)
+		return cur.fetchall()
+
+def iter_sessions(start_date="0000-01-01", end_date="9999-12-31", batch_size=500):
+	"""Yield SessionRecord tuples for local dates in [start_date, end_date], newest first."""
+	with connect() as conn:
+		conn.row_factory = None
+		cur = conn.execute(_RECORD_SQL, (start_date, end_date))
+		# dates, subjects and sources repeat a lot: share one string object each
+		shared = {}.setdefault
+		while True:
+			rows = cur.fetchmany(batch_size)
+			if not rows:
+				break
+			for sid, date, start_ts, end_ts, duration, subject, source in rows:
+				yield SessionRecord(
+					sid, shared(date, date), start_ts, end_ts, duration,
+					shared(subject, subject), shared(source, source))
+
+# Sortable Raw Data columns -> SQL sort key. Each expression matches an index
+# in schema.sql so ORDER BY key, id LIMIT n reads one page of the index.
+SORT_KEYS = {
+	"date": "local_date",
+	"start": "start_utc",
+	"end": "COALESCE(end_utc, '')",
+	"duration": "COALESCE(duration_sec, -1)",
+	"subject": "COALESCE(subject, '')",
+	"source": "COALESCE(source, 'timer')",
+}
+
+def page_sessions(sort="start", descending=True, after=None, limit=200,
+		start_date=None, end_date=None, source=None, subject=None,
+		min_duration=None, max_duration=None):
+	"""One page of SessionRecords ordered by SORT_KEYS[sort], plus the key of the next page.
+
+	Paging is keyset based: pass the returned key as `after` to continue
+	where the page ended, so deep pages cost the same as the first one.
+	Filters: inclusive local date range, source, subject ('' for none) and
+	duration range in seconds (open sessions have no duration and are
+	excluded by it). The next key is None on the last page.
+	"""
+	key = SORT_KEYS[sort]
+	where, params = ["deleted_at IS NULL"], []
+	if start_date is not None:
+		where.append("local_date >= ?")
+		params.append(start_date)
+	if end_date is not None:
+		where.append("local_date <= ?")
+		params.append(end_date)
+	if source is not None:
+		where.append("COALESCE(source, 'timer') = ?")
+		params.append(source)
+	if subject is not None:
+		where.append("COALESCE(subject, '') = ?")
+		params.append(subject)
+	if min_duration is not None:
+		where.append("duration_sec >= ?")
+		params.append(min_duration)
+	if max_duration is not None:
+		where.append("duration_sec <= ?")
+		params.append(max_duration)
+	op, order = ("<", "DESC") if descending else (">", "ASC")
+	if after is not None:
+		# spelled out rather than as a row value so expression keys get an index seek
+		where.append(f"{key} {op}= ? AND ({key} {op} ? OR id {op} ?)")
+		params.extend((after[0], after[0], after[1]))
+	with connect() as conn:
+		conn.row_factory = None
+		rows = conn.execute(
+			f"""
+			SELECT id, local_date,
+				CAST(strftime('%s', start_utc) AS INTEGER),
+				CAST(strftime('%s', end_utc) AS INTEGER),
+				duration_sec, COALESCE(subject, ''), COALESCE(source, 'timer'), {key}
+			FROM sessions
+			WHERE {" AND ".join(where)}
+			ORDER BY {key} {order}, id {order}
+			LIMIT ?
+			""",
+			params + [limit + 1]
+		).fetchall()
+	next_key = (rows[limit - 1][7], rows[limit - 1][0]) if len(rows) > limit else None
+	return [SessionRecord(*row[:7]) for row in rows[:limit]], next_key
+
+def fts_query(text):
+	"""Turn free text into an FTS5 query: every word must match as a prefix.
+
+	Words are quoted, so FTS5 operators and punctuation typed by the user
+	are searched for literally instead of raising a syntax error.
+	"""
+	words = re.findall(r"\w+", text or "")
+	return " ".join('"%s"*' % w for w in words)
+
+def search_sessions(text, limit=500, batch_size=50):
+	"""Yield lists of (SessionRecord, snippet) matching `text` in subject or note, best first.
+
+	Ranked by bm25 with subject matches weighted above note matches; the
+	snippet marks the matched words with [ ]. Results come in batches of
+	`batch_size` so callers can show the first ones while the rest load.
+	"""
+	query = fts_query(text)
+	if not query:
+		return
+	with connect() as conn:
+		conn.row_factory = None
+		cur = conn.execute(
+			"""
+			SELECT s.id, s.local_date,
+				CAST(strftime('%s', s.start_utc) AS INTEGER),
+				CAST(strftime('%s', s.end_utc) AS INTEGER),
+				s.duration_sec, COALESCE(s.subject, ''), COALESCE(s.source, 'timer'),
+				snippet(sessions_fts, -1, '[', ']', '…', 8)
+			FROM sessions_fts
+			JOIN sessions s ON s.id = sessions_fts.rowid
+			WHERE sessions_fts MATCH ? AND s.deleted_at IS NULL
+			ORDER BY bm25(sessions_fts, 4.0, 1.0), s.start_utc DESC
+			LIMIT ?
+			""",
+			(query, limit)
+		)
+		while True:
+			rows = cur.fetchmany(batch_size)
+			if not rows:
+				break
+			yield [(SessionRecord(*row[:7]), row[7]) for row in rows]
+
+def list_subjects():
+	"""Return distinct non-empty subjects, most recently used first."""
+	with connect() as conn:
+		cur = conn.execute(
+			"SELECT subject, MAX(local_date) AS last_date FROM sessions "
+			"WHERE subject IS NOT NULL AND subject <> '' AND deleted_at IS NULL "
+			"GROUP BY subject ORDER BY last_date DESC"
+		)
+		return [row["subject"] for row in cur.fetchall()]
+
+def subject_totals(start_date, end_date):
+	"""
+	Returns per-subject totals for local dates in [start_date, end_date] as a list of
+	dicts (subject, total_sec, sessions, share), largest first. Sessions without a
+	subject are reported under subject ''.
+	"""
+	with connect() as conn:
+		cur = conn.execute(
+			"""
+			SELECT subject, SUM(seconds) AS total_sec, COUNT(DISTINCT session_id) AS sessions
+			FROM session_days
+			WHERE local_date BETWEEN ? AND ?
+			GROUP BY subject
+			ORDER BY total_sec DESC
+			""",
+			(start_date, end_date)
+		)
+		rows = [dict(row) for row in cur.fetchall()]
+	grand = sum(r["total_sec"] or 0 for r in rows)
+	for r in rows:
+		r["share"] = (r["total_sec"] or 0) / grand if grand else 0.0
+	return rows
@@ -0,0 +1,259 @@
+"""
+Columnar analytics over the whole session history.
+
+Sessions are loaded once into NumPy arrays and kept current with incremental
+refreshes (rows whose updated_at moved). Every analytic is answered with
+vectorized operations on those arrays instead of per-query SQL and Python
+loops over rows.
+
+Day numbers are local days since 1970-01-01 (`day_number(date)`), so they
+index dense daily arrays directly.
+"""
+
+import datetime
+import threading
+import numpy as np
+from BackEnd.core.clock import local_today
+from BackEnd.repos import session_repo
+
+DAY = 86400
+HOUR = 3600
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def day_number(date):
+	"""Local day number of a datetime.date."""
+	return date.toordinal() - _EPOCH_ORDINAL
+
+
+def day_date(day):
+	"""datetime.date for a local day number."""
+	return datetime.date.fromordinal(int(day) + _EPOCH_ORDINAL)
+
+
+class SessionAnalytics:
+	"""In-memory column store of finished sessions with vectorized analytics."""
+
+	def __init__(self):
+		self.subjects = []
+		self.sources = []
+		self._subject_ids = {}
+		self._source_codes = {}
+		# refresh() may run on a background thread (initial load at startup)
+		self._lock = threading.Lock()
+		self._version = None
+		self.invalidate()
+
+	# ---- loading -------------------------------------------------------
+
+	def invalidate(self):
+		"""Drop everything; the next refresh() reloads from scratch (e.g. after hard deletes)."""
+		self.ids = np.empty(0, dtype=np.int64)
+		self.start = np.empty(0, dtype=np.int64)       # local epoch seconds
+		self.duration = np.empty(0, dtype=np.int64)
+		self.span = np.empty(0, dtype=np.int64)        # wall time start -> end, pauses included
+		self.day = np.empty(0, dtype=np.int32)
+		self.source = np.empty(0, dtype=np.int8)
+		self.subject = np.empty(0, dtype=np.int32)
+		self._watermark = None
+		self._index = None
+		self._hourly = None
+		self._dense = None
+
+	def refresh(self):
+		"""Apply sessions changed since the last refresh. Returns number of rows seen.
+
+		Purges, sync merges of remote history and restores change rows behind
+		the watermark; they replace session_repo.history_version(), and the
+		next refresh then reloads everything.
+		"""
+		with self._lock:
+			return self._refresh()
+
+	def _refresh(self):
+		version = session_repo.history_version()
+		if version != self._version:
+			self.invalidate()
+			self._version = version
+		rows = session_repo.analytics_rows(self._watermark)
+		if not rows:
+			return 0
+		ids, start, duration, span, source, subject, updated, live = zip(*rows)
+		ids = np.fromiter(ids, dtype=np.int64, count=len(rows))
+		live = np.fromiter(live, dtype=bool, count=len(rows))
+		start = np.fromiter(start, dtype=np.int64, count=len(rows))
+		duration = np.fromiter(duration, dtype=np.int64, count=len(rows))
+		span = np.fromiter(span, dtype=np.int64, count=len(rows))
+		source = np.fromiter((self._code(self._source_codes, self.sources, s) for s in source), dtype=np.int8, count=len(rows))
+		subject = np.fromiter((self._code(self._subject_ids, self.subjects, s) for s in subject), dtype=np.int32, count=len(rows))
+		self._watermark = max(updated)
+
+		# drop previous versions of re-sent rows, then append the live ones
+		if len(self.ids):
+			keep = ~np.isin(self.ids, ids, assume_unique=True)
+			if not keep.all():
+				self._take(keep)
+		self.ids = np.concatenate([self.ids, ids[live]])
+		self.start = np.concatenate([self.start, start[live]])
+		self.duration = np.concatenate([self.duration, duration[live]])
+		self.span = np.concatenate([self.span, span[live]])
+		self.day = np.concatenate([self.day, (start[live] // DAY).astype(np.int32)])
+		self.source = np.concatenate([self.source, source[live]])
+		self.subject = np.concatenate([self.subject, subject[live]])
+		self._index = None
+		self._hourly = None
+		self._dense = None
+		return len(rows)
+
+	@staticmethod
+	def _code(mapping, names, value):
+		code = mapping.get(value)
+		if code is None:
+			code = mapping[value] = len(names)
+			names.append(value)
+		return code
+
+	def _take(self, mask):
+		for name in ("ids", "start", "duration", "span", "day", "source", "subject"):
+			setattr(self, name, getattr(self, name)[mask])
+
+	def _prefix(self):
+		"""Sorted start/end times with prefix sums, rebuilt lazily after changes."""
+		if self._index is None:
+			starts = np.sort(self.start)
+			ends = np.sort(self.start + self.duration)
+			self._index = (
+				starts, np.concatenate([[0], np.cumsum(starts)]),
+				ends, np.concatenate([[0], np.cumsum(ends)]),
+			)
+		return self._index
+
+	def __len__(self):
+		return len(self.ids)
+
+	# ---- core primitive -------------------------------------------------
+
+	def studied_before(self, t):
+		"""Total seconds studied before each local epoch time in array `t`.
+
+		F(t) = sum(max(0, t - s)) - sum(max(0, t - e)) over sessions [s, e),
+		evaluated with binary searches into sorted starts/ends.
+		"""
+		starts, cs_starts, ends, cs_ends = self._prefix()
+		t = np.asarray(t, dtype=np.int64)
+		k = np.searchsorted(starts, t)
+		j = np.searchsorted(ends, t)
+		return (k * t - cs_starts[k]) - (j * t - cs_ends[j])
+
+	def _studied_before_hours(self, hours):
+		"""studied_before() at whole local hours, served from a cached hourly table.
+
+		The table covers first session -> last session end and is built once per
+		refresh; hours outside it clamp to 0 / the grand total.
+		"""
+		hours = np.asarray(hours, dtype=np.int64)
+		if not len(self.start):
+			return np.zeros(len(hours), dtype=np.int64)
+		if self._hourly is None:
+			base = int(self.start.min()) // HOUR
+			last = -(-int((self.start + self.duration).max()) // HOUR)
+			self._hourly = (base, self.studied_before(np.arange(base, last + 1, dtype=np.int64) * HOUR))
+		base, table = self._hourly
+		return table[np.clip(hours - base, 0, len(table) - 1)]
+
+	# ---- analytics ------------------------------------------------------
+
+	def first_day(self):
+		return int(self.day.min()) if len(self.day) else None
+
+	def daily_series(self, first_day, last_day):
+		"""Seconds studied on each local day in [first_day, last_day], split at midnight."""
+		edges = np.arange(first_day, last_day + 2, dtype=np.int64) * 24
+		return np.diff(self._studied_before_hours(edges))
+
+	def daily_array(self):
+		"""(first_day, seconds per day) for all history through today; cached until data changes."""
+		if self._dense is None:
+			today = day_number(local_today())
+			first = self.first_day()
+			if first is None:
+				self._dense = (today, np.zeros(0, dtype=np.int64))
+			else:
+				last = max(today, int(((self.start + self.duration - 1) // DAY).max()))
+				self._dense = (first, self.daily_series(first, last))
+		return self._dense
+
+	def daily_slice(self, first_day, last_day):
+		"""Seconds per day for [first_day, last_day] sliced from daily_array(), zero-padded."""
+		first, dense = self.daily_array()
+		out = np.zeros(last_day - first_day + 1, dtype=np.int64)
+		lo = max(first_day, first)
+		hi = min(last_day, first + len(dense) - 1)
+		if lo <= hi:
+			out[lo - first_day:hi - first_day + 1] = dense[lo - first:hi - first + 1]
+		return out
+
+	def rolling_average(self, first_day, last_day, window=7):
+		"""Trailing `window`-day mean of the daily series for [first_day, last_day]."""
+		daily = self.daily_series(first_day - window + 1, last_day)
+		cs = np.concatenate([[0], np.cumsum(daily)])
+		return (cs[window:] - cs[:-window]) / window
+
+	def weekday_profile(self, first_day=None, last_day=None):
+		"""Total seconds per weekday (index 0 = Monday) over the range (all history by default)."""
+		first_day, last_day = self._range(first_day, last_day)
+		if first_day is None:
+			return np.zeros(7, dtype=np.int64)
+		daily = self.daily_series(first_day, last_day)
+		# day 0 (1970-01-01) was a Thursday -> weekday index 3
+		weekday = (np.arange(first_day, last_day + 1) + 3) % 7
+		return np.bincount(weekday, weights=daily, minlength=7).astype(np.int64)
+
+	def hour_profile(self, first_day=None, last_day=None):
+		"""Total seconds per local hour of day over the range, split at hour boundaries."""
+		first_day, last_day = self._range(first_day, last_day)
+		if first_day is None:
+			return np.zeros(24, dtype=np.int64)
+		edges = np.arange(first_day * 24, (last_day + 1) * 24 + 1, dtype=np.int64)
+		hourly = np.diff(self._studied_before_hours(edges))
+		return hourly.reshape(-1, 24).sum(axis=0)
+
+	def streak(self, today=None):
+		"""Consecutive days with study time ending today (0 if today has none)."""
+		today = day_number(local_today()) if today is None else today
+		first = self.first_day()
+		if first is None or first > today:
+			return 0
+		studied = self.daily_series(first, today) > 0
+		if not studied[-1]:
+			return 0
+		gaps = np.flatnonzero(~studied)
+		return int(len(studied) - (gaps[-1] + 1 if len(gaps) else 0))
+
+	def days_studied(self):
+		"""Number of local days with any study time."""
+		first = self.first_day()
+		if first is None:
+			return 0
+		last = int(((self.start + self.duration - 1) // DAY).max())
+		return int(np.count_nonzero(self.daily_series(first, last)))
+
+	def total_seconds(self):
+		return int(self.duration.sum())
+
+	def focus_ratio(self, first_day=None, last_day=None):
+		"""Studied / wall-clock time of sessions started in the range (1.0 = never paused)."""
+		mask = np.ones(len(self.day), dtype=bool)
+		if first_day is not None:
+			mask &= self.day >= first_day
+		if last_day is not None:
+			mask &= self.day <= last_day
+		span = int(self.span[mask].sum())
+		return min(1.0, int(self.duration[mask].sum()) / span) if span > 0 else 1.0
+
+	def _range(self, first_day, last_day):
+		if first_day is None:
+			first_day = self.first_day()
+		if last_day is None:
+			last_day = day_number(local_today())
+		return first_day, last_day
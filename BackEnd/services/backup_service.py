@@ -0,0 +1,224 @@
+"""
+Online backups of study.db.
+
+Backups are taken with the SQLite backup API a few pages at a time, so
+the app's own connections can keep reading and writing between steps,
+and written to a temporary file that is only renamed into place once it
+passes an integrity check. BackupScheduler runs them on a daemon thread
+and keeps the newest `keep` files.
+
+	python -m BackEnd.services.backup_service create
+	python -m BackEnd.services.backup_service list
+	python -m BackEnd.services.backup_service restore study-20240101-120000.db
+"""
+
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from BackEnd.core import clock, perf
+from BackEnd.core.paths import app_lock_path, backups_dir, db_path, journal_path
+from BackEnd.repos import day_cache_repo, session_repo
+
+PREFIX = "study-"
+PAGES_PER_STEP = 256
+STEP_SLEEP = 0.01     # seconds between steps; writers get the lock meanwhile
+LOCK_TIMEOUT = 2.0    # seconds a copy waits for another connection's lock
+KEEP = 7
+INTERVAL_SEC = 24 * 3600
+STALE_TMP_SEC = 3600  # a temp copy untouched this long was left by an interrupted backup
+
+
+def _check(path):
+	"""Raise ValueError unless `path` is a readable, intact SQLite database."""
+	conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+	try:
+		result = conn.execute("PRAGMA quick_check").fetchone()[0]
+	except sqlite3.DatabaseError as e:
+		raise ValueError(f"{path} is not a usable database: {e}") from e
+	finally:
+		conn.close()
+	if result != "ok":
+		raise ValueError(f"{path} failed integrity check: {result}")
+
+
+def _copy(src_path, dst_path, pages=PAGES_PER_STEP, sleep=STEP_SLEEP):
+	src = sqlite3.connect(src_path, timeout=LOCK_TIMEOUT)
+	dst = sqlite3.connect(dst_path, timeout=LOCK_TIMEOUT)
+	try:
+		src.backup(dst, pages=pages, sleep=sleep)
+	finally:
+		dst.close()
+		src.close()
+
+
+def list_backups(directory=None):
+	"""Backup files, newest first."""
+	directory = directory or backups_dir()
+	return sorted(directory.glob(f"{PREFIX}*.db"), key=lambda p: (p.stat().st_mtime, p.name), reverse=True)
+
+
+def latest_backup_time(directory=None):
+	"""Modification time (Unix seconds) of the newest backup, or None."""
+	backups = list_backups(directory)
+	return backups[0].stat().st_mtime if backups else None
+
+
+def rotate(keep=KEEP, directory=None):
+	"""Delete all but the newest `keep` backups and stale temp copies. Returns the paths removed."""
+	directory = directory or backups_dir()
+	cutoff = clock.unix_time() - STALE_TMP_SEC
+	removed = list_backups(directory)[keep:]
+	removed += [p for p in directory.glob(f"{PREFIX}*.tmp") if p.stat().st_mtime < cutoff]
+	for path in removed:
+		try:
+			path.unlink()
+		except OSError:
+			pass
+	return removed
+
+
+def create_backup(directory=None, keep=KEEP, pages=PAGES_PER_STEP, sleep=STEP_SLEEP):
+	"""Copy study.db to a timestamped file in `directory` and rotate. Returns its Path."""
+	source = db_path()
+	if not source.exists():
+		return None
+	directory = directory or backups_dir()
+	stamp = clock.now_utc().astimezone().strftime("%Y%m%d-%H%M%S")
+	target = directory / f"{PREFIX}{stamp}.db"
+	n = 1
+	while target.exists():
+		target = directory / f"{PREFIX}{stamp}-{n}.db"
+		n += 1
+	tmp = target.with_suffix(".tmp")
+	try:
+		with perf.timed("backup"):
+			_copy(source, tmp, pages, sleep)
+			_check(tmp)
+		os.replace(tmp, target)
+	finally:
+		if tmp.exists():
+			tmp.unlink()
+	rotate(keep, directory)
+	return target
+
+
+def restore_backup(path, pages=PAGES_PER_STEP):
+	"""Replace the contents of study.db with backup `path`.
+
+	Refuses to run while the app holds its instance lock (RuntimeError), and
+	holds that lock itself so the app cannot start mid-restore. The current
+	database is backed up first (it is kept as the newest backup), the
+	heartbeat journal is cleared since its session ids refer to the
+	replaced history, and the per-day cache is dropped and the history
+	version replaced so both are rebuilt from the restored data. Returns the
+	Path of that safety backup, or None when there was no database yet.
+	"""
+	path = Path(path)
+	if not path.exists():
+		path = backups_dir() / path
+	if not path.exists():
+		raise FileNotFoundError(f"no backup named {path.name}")
+	_check(path)
+	from PySide6.QtCore import QLockFile
+	lock = QLockFile(str(app_lock_path()))
+	# same policy as the app: a lock left by a crashed process is taken over
+	lock.setStaleLockTime(0)
+	if not lock.tryLock(0):
+		raise RuntimeError("Study Tracker is running; close it before restoring a backup")
+	try:
+		safety = create_backup(keep=KEEP + 1)
+		# backup in the other direction rewrites the live file page by page,
+		# under SQLite's locks, instead of swapping the file under open handles
+		_copy(path, db_path(), pages, 0)
+		journal = journal_path()
+		if journal.exists():
+			with open(journal, "r+b") as f:
+				f.truncate(0)
+				os.fsync(f.fileno())
+		with session_repo.connect() as conn:
+			session_repo.mark_history_rewritten(conn)
+		day_cache_repo.invalidate()
+	finally:
+		lock.unlock()
+	return safety
+
+
+class BackupScheduler:
+	"""Background thread that backs up study.db once per `interval` seconds.
+
+	The age of the newest backup decides when the next one is due, so the
+	schedule survives restarts. The first check waits `delay` seconds so it
+	stays clear of startup work, then one runs every `poll` seconds.
+	"""
+
+	def __init__(self, interval=INTERVAL_SEC, keep=KEEP, poll=600, delay=60):
+		self.interval = interval
+		self.keep = keep
+		self.poll = poll
+		self.delay = delay
+		self.last_error = None
+		self._stop = threading.Event()
+		self._thread = None
+
+	def start(self):
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._run, name="backup", daemon=True)
+			self._thread.start()
+
+	def stop(self, timeout=None):
+		"""Ask the thread to exit and wait up to `timeout` seconds for a backup in progress.
+
+		A backup cut short by process exit leaves a temp copy behind; the
+		next rotate() removes it.
+		"""
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join(timeout)
+
+	def due(self):
+		last = latest_backup_time()
+		return last is None or clock.unix_time() - last >= self.interval
+
+	def _run(self):
+		self._stop.wait(self.delay)
+		while not self._stop.is_set():
+			try:
+				if self.due():
+					create_backup(keep=self.keep)
+				self.last_error = None
+			except Exception as e:
+				# a failed backup must never take the app down; retried next poll
+				self.last_error = e
+			self._stop.wait(self.poll)
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Back up or restore study.db.")
+	sub = parser.add_subparsers(dest="command", required=True)
+	create = sub.add_parser("create", help="take a backup now")
+	create.add_argument("--keep", type=int, default=KEEP, help="number of backups to keep")
+	sub.add_parser("list", help="show existing backups")
+	restore = sub.add_parser("restore", help="replace study.db with a backup (close the app first)")
+	restore.add_argument("backup", help="backup file name or path")
+	args = parser.parse_args()
+
+	if args.command == "create":
+		target = create_backup(keep=args.keep)
+		print(f"Backup written to {target}" if target else "No database found. Nothing to back up.")
+	elif args.command == "list":
+		for path in list_backups():
+			when = datetime.datetime.fromtimestamp(path.stat().st_mtime)
+			print(f"{path.name}  {path.stat().st_size // 1024:>6} KiB  {when:%Y-%m-%d %H:%M}")
+	else:
+		try:
+			safety = restore_backup(args.backup)
+		except (OSError, ValueError, RuntimeError) as e:
+			print(f"Restore failed: {e}")
+			sys.exit(1)
+		print(f"Restored {args.backup}.")
+		if safety:
+			print(f"The previous database was saved as {safety.name}.")
@@ -0,0 +1,66 @@
+"""
+Progress towards daily and weekly study goals.
+
+Completed time per period is read once from the per-day rollup (one
+indexed SUM per period) and cached; the running timers' live elapsed is
+added on top for every progress() call, so checking goals on each tick
+never touches the database. The cache is dropped by invalidate() when a
+session is written and rebuilt automatically when the local day changes.
+"""
+
+import datetime
+from collections import namedtuple
+from BackEnd.core.clock import local_today
+from BackEnd.repos import goal_repo, session_repo
+
+GoalProgress = namedtuple("GoalProgress", "id period subject target_sec done_sec ratio")
+
+
+def period_range(period, today):
+	"""First and last local date (datetime.date) of the goal period containing `today`."""
+	if period == "daily":
+		return today, today
+	monday = today - datetime.timedelta(days=today.weekday())
+	return monday, monday + datetime.timedelta(days=6)
+
+
+class GoalTracker:
+	def __init__(self):
+		self.goals = []
+		self._done = {}
+		self._day = None
+
+	def invalidate(self):
+		"""Reload goals and completed totals on the next progress() call."""
+		self._day = None
+
+	def _load(self, today):
+		self.goals = goal_repo.list_goals()
+		self._done = {}
+		for period in {g["period"] for g in self.goals}:
+			first, last = period_range(period, today)
+			rows = session_repo.subject_totals(first.isoformat(), last.isoformat())
+			self._done[period] = {r["subject"]: r["total_sec"] or 0 for r in rows}
+		self._day = today
+
+	def progress(self, live=(), today=None):
+		"""GoalProgress per goal; `live` is (subject, elapsed_sec) for each running session.
+
+		Live time counts towards the current period in full, even for a session
+		that started before midnight; it is split by day once the session stops.
+		"""
+		today = today or local_today()
+		if self._day != today:
+			self._load(today)
+		result = []
+		for g in self.goals:
+			done = self._done.get(g["period"], {})
+			if g["subject"]:
+				sec = done.get(g["subject"], 0) + sum(e for s, e in live if s == g["subject"])
+			else:
+				sec = sum(done.values()) + sum(e for _, e in live)
+			result.append(GoalProgress(
+				g["id"], g["period"], g["subject"], g["target_sec"], sec,
+				min(1.0, sec / g["target_sec"]),
+			))
+		return result
@@ -0,0 +1,191 @@
+"""
+Combined statistics over many members' study.db files.
+
+Each database is opened read-only (SQLite URI mode=ro, so a member's
+running app is never blocked or modified) in a pool of worker processes,
+which reduce it to a fixed-size summary: one int32 per day of the range,
+per-subject totals and a few counters. The parent folds each summary into
+the group totals as it arrives and keeps only the per-member counters,
+so memory stays bounded by the range length and subject count rather
+than by the number or size of the files.
+
+	python -m BackEnd.services.group_service alice/study.db bob/study.db --from 2024-01-01
+"""
+
+import argparse
+import datetime
+import os
+import sqlite3
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+METRICS = ("total_sec", "days_studied", "longest_streak", "current_streak", "sessions")
+
+
+def member_name(path):
+	"""Display name: the folder of a `study.db`, else the file name without extension."""
+	path = Path(path)
+	return path.parent.name if path.name == "study.db" and path.parent.name else path.stem
+
+
+def _longest_run(studied):
+	"""Length of the longest run of True in a bool array."""
+	if not studied.any():
+		return 0
+	# boundaries of runs: +1 where a run starts, -1 where it ends
+	edges = np.diff(np.concatenate([[0], studied.astype(np.int8), [0]]))
+	return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def read_member(path, start_date, end_date):
+	"""Summarise one database for [start_date, end_date]. Runs in worker processes."""
+	first = datetime.date.fromisoformat(start_date)
+	n = (datetime.date.fromisoformat(end_date) - first).days + 1
+	daily = np.zeros(n, dtype=np.int32)
+	subjects = Counter()
+	conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True, timeout=2.0)
+	try:
+		tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+		if "session_days" in tables:
+			rows = conn.execute(
+				"SELECT local_date, subject, SUM(seconds) FROM session_days "
+				"WHERE local_date BETWEEN ? AND ? GROUP BY local_date, subject",
+				(start_date, end_date))
+			sessions_sql = "SELECT COUNT(DISTINCT session_id) FROM session_days WHERE local_date BETWEEN ? AND ?"
+		else:
+			# databases from before the per-day rollup: bucket by start day
+			rows = conn.execute(
+				"SELECT local_date, COALESCE(subject, ''), SUM(duration_sec) FROM sessions "
+				"WHERE end_utc IS NOT NULL AND duration_sec IS NOT NULL AND deleted_at IS NULL "
+				"AND local_date BETWEEN ? AND ? GROUP BY local_date, subject",
+				(start_date, end_date))
+			sessions_sql = ("SELECT COUNT(*) FROM sessions WHERE end_utc IS NOT NULL AND deleted_at IS NULL "
+				"AND local_date BETWEEN ? AND ?")
+		for date, subject, seconds in rows:
+			daily[(datetime.date.fromisoformat(date) - first).days] += seconds or 0
+			subjects[subject or ""] += seconds or 0
+		sessions = conn.execute(sessions_sql, (start_date, end_date)).fetchone()[0]
+	finally:
+		conn.close()
+	studied = daily > 0
+	# consecutive studied days ending on the last day of the range
+	current = int(np.argmin(studied[::-1])) if not studied.all() else n
+	return {
+		"name": member_name(path),
+		"path": str(path),
+		"daily": daily,
+		"subjects": dict(subjects),
+		"total_sec": int(daily.sum()),
+		"days_studied": int(studied.sum()),
+		"longest_streak": _longest_run(studied),
+		"current_streak": current,
+		"sessions": sessions,
+	}
+
+
+class GroupStats:
+	"""Merged totals for a group over [first, last] (datetime.date, inclusive)."""
+
+	def __init__(self, first, last):
+		self.first = first
+		self.last = last
+		n = (last - first).days + 1
+		self.daily = np.zeros(n, dtype=np.int64)      # group seconds per day
+		self.active = np.zeros(n, dtype=np.int32)     # members who studied that day
+		self.subjects = Counter()
+		self.members = []   # per-member counters, without their daily arrays
+		self.errors = []    # (path, message) for files that could not be read
+
+	def add(self, summary):
+		daily = summary.pop("daily")
+		self.daily += daily
+		self.active += daily > 0
+		self.subjects.update(summary["subjects"])
+		summary["subjects"] = len(summary["subjects"])
+		self.members.append(summary)
+
+	def days(self):
+		return [self.first + datetime.timedelta(days=i) for i in range(len(self.daily))]
+
+	def total_seconds(self):
+		return int(self.daily.sum())
+
+	def leaderboard(self, metric="total_sec", top=None):
+		"""Members sorted by `metric` (one of METRICS), best first."""
+		if metric not in METRICS:
+			raise ValueError(f"unknown leaderboard metric: {metric!r}")
+		ranked = sorted(self.members, key=lambda m: (-m[metric], m["name"]))
+		return ranked[:top] if top else ranked
+
+	def subject_rows(self):
+		"""Group per-subject totals as subject_totals()-style dicts, largest first."""
+		total = sum(self.subjects.values())
+		return [
+			{"subject": s, "total_sec": sec, "share": sec / total if total else 0.0}
+			for s, sec in self.subjects.most_common() if sec
+		]
+
+
+def aggregate(paths, start_date, end_date, workers=None):
+	"""Read every database in `paths` in parallel and return the merged GroupStats.
+
+	At most a few summaries per worker are in flight at once, so hundreds of
+	files never pile up unmerged results in memory.
+	"""
+	group = GroupStats(datetime.date.fromisoformat(start_date), datetime.date.fromisoformat(end_date))
+	workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+	pending = {}
+	todo = iter(paths)
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		while True:
+			while len(pending) < workers * 2:
+				path = next(todo, None)
+				if path is None:
+					break
+				pending[pool.submit(read_member, str(path), start_date, end_date)] = path
+			if not pending:
+				break
+			done, _ = wait(pending, return_when=FIRST_COMPLETED)
+			for future in done:
+				path = pending.pop(future)
+				try:
+					group.add(future.result())
+				except (sqlite3.Error, OSError, ValueError) as e:
+					group.errors.append((str(path), str(e)))
+	return group
+
+
+if __name__ == "__main__":
+	from BackEnd.core.clock import fmt_hms, local_today
+
+	today = local_today()
+	parser = argparse.ArgumentParser(description="Combine several members' study.db files into group stats.")
+	parser.add_argument("databases", nargs="+", help="study.db files of the members")
+	parser.add_argument("--from", dest="start", default=(today - datetime.timedelta(days=364)).isoformat(),
+		metavar="YYYY-MM-DD", help="first day (default: one year ago)")
+	parser.add_argument("--to", dest="end", default=today.isoformat(), metavar="YYYY-MM-DD", help="last day (default: today)")
+	parser.add_argument("--top", type=int, default=10, help="leaderboard length")
+	parser.add_argument("--workers", type=int, help="reader processes (default: CPU count)")
+	parser.add_argument("--chart", help="also write a combined report page (.png or .pdf)")
+	args = parser.parse_args()
+
+	group = aggregate(args.databases, args.start, args.end, args.workers)
+	print(f"{len(group.members)} members, {group.total_seconds() / 3600:.1f} h studied "
+		f"between {args.start} and {args.end}")
+	for metric, title, fmt in (
+		("total_sec", "Most time studied", fmt_hms),
+		("days_studied", "Most days studied", str),
+		("longest_streak", "Longest streak (days)", str),
+	):
+		print(f"\n{title}")
+		for rank, m in enumerate(group.leaderboard(metric, args.top), 1):
+			print(f"{rank:>3}. {m['name']:<24}{fmt(m[metric]):>10}")
+	for path, message in group.errors:
+		print(f"skipped {path}: {message}")
+	if args.chart:
+		from FrontEnd.reports import render_group_report
+		render_group_report(group, args.chart, Path(args.chart).suffix.lstrip(".") or "png")
+		print(f"\nChart written to {args.chart}")
@@ -0,0 +1,24 @@
+class PomodoroCycle:
+	"""Pomodoro phase rules: study -> short break, every `cycles`-th study -> long break.
+
+	Pure logic with no timers or I/O, shared by the Pomodoro tab and the
+	simulation harness.
+	"""
+
+	def __init__(self, study_sec=25 * 60, short_break_sec=5 * 60, long_break_sec=15 * 60, cycles=4):
+		self.study_sec = study_sec
+		self.short_break_sec = short_break_sec
+		self.long_break_sec = long_break_sec
+		self.cycles = cycles
+
+	def next_phase(self, phase, cycle_count):
+		"""Return (phase, cycle_count, long_break) after `phase` ends or is skipped."""
+		if phase == 'study':
+			cycle_count += 1
+			return 'break', cycle_count, cycle_count % self.cycles == 0
+		return 'study', cycle_count, False
+
+	def duration(self, phase, long_break=False):
+		if phase == 'study':
+			return self.study_sec
+		return self.long_break_sec if long_break else self.short_break_sec
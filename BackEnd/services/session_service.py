@@ -0,0 +1,23 @@
+from BackEnd.repos import journal_repo, session_repo
+
+
+def run_startup_recovery():
+	"""Bring `sessions` up to date after an unclean shutdown.
+
+	Replays the heartbeat journal into open sessions and truncates it, then
+	closes every session still left open (timers never auto-resume, so any
+	open row at launch is an orphan). Returns a dict report of what was fixed.
+	"""
+	report = {"journal_sessions": 0, "orphans_closed": 0, "orphan_seconds": 0}
+	try:
+		report["journal_sessions"] = journal_repo.replay()
+	except Exception:
+		# a damaged journal must never block startup
+		pass
+	try:
+		closed = session_repo.close_orphaned_sessions()
+		report["orphans_closed"] = closed["closed"]
+		report["orphan_seconds"] = closed["recovered_sec"]
+	except Exception:
+		pass
+	return report
@@ -0,0 +1,225 @@
+"""
+Virtual-time simulation of study usage.
+
+Drives the real TimerService, pomodoro rules and session_repo against a
+throwaway database with a VirtualClock, so months of synthetic usage run
+in seconds. Afterwards the stored history is checked against the time the
+simulation knows it studied, and throughput numbers are reported.
+
+	python -m BackEnd.services.simulation --days 180 --seed 1
+"""
+
+import argparse
+import datetime
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from BackEnd.core import clock
+
+SUBJECTS = ("Math", "Physics", "History", "")
+
+_app = None
+
+
+@contextmanager
+def _isolated_data_dir(path):
+	"""Point user_data_dir() (and so study.db and the journal) at `path`."""
+	key = "LOCALAPPDATA" if os.name == "nt" else "XDG_DATA_HOME"
+	previous = os.environ.get(key)
+	os.environ[key] = str(path)
+	try:
+		yield
+	finally:
+		if previous is None:
+			os.environ.pop(key, None)
+		else:
+			os.environ[key] = previous
+
+
+class Simulation:
+	"""Synthetic usage over `days` local days starting at `start` (a date)."""
+
+	def __init__(self, days=90, seed=0, start=None, tick=60):
+		self.days = days
+		self.rng = random.Random(seed)
+		self.start = start or (clock.local_today() - datetime.timedelta(days=days))
+		self.tick = tick
+		self.expected = {}   # local date iso -> seconds studied
+		self.stats = {"sessions": 0, "pauses": 0, "ticks": 0, "pomodoros": 0}
+
+	# ---- ground truth ------------------------------------------------------
+
+	def _studied(self, seconds):
+		"""Credit `seconds` of study ending now, split at local midnight like session_days."""
+		end = clock.now_utc().astimezone().replace(tzinfo=None)
+		lo = end - datetime.timedelta(seconds=seconds)
+		while lo < end:
+			midnight = datetime.datetime.combine(lo.date() + datetime.timedelta(days=1), datetime.time())
+			part = min(end, midnight)
+			key = lo.date().isoformat()
+			self.expected[key] = self.expected.get(key, 0) + int((part - lo).total_seconds())
+			lo = part
+
+	def _advance_to(self, local_dt):
+		target = local_dt.astimezone(datetime.timezone.utc)
+		delta = (target - clock.now_utc()).total_seconds()
+		if delta > 0:
+			clock.get_clock().advance(int(delta))
+
+	# ---- usage patterns ------------------------------------------------------
+
+	def _stopwatch(self, timer):
+		timer.start(subject=self.rng.choice(SUBJECTS))
+		runs = self.rng.randint(1, 3)
+		for i in range(runs):
+			remaining = self.rng.randint(10, 90) * 60
+			self._studied_run(timer, remaining)
+			if i < runs - 1:
+				timer.pause_resume()
+				clock.get_clock().advance(self.rng.randint(2, 20) * 60)
+				timer.pause_resume()
+				self.stats["pauses"] += 1
+		timer.stop()
+		self.stats["sessions"] += 1
+
+	def _studied_run(self, timer, seconds):
+		while seconds > 0:
+			step = min(self.tick, seconds)
+			clock.get_clock().advance(step)
+			timer._on_tick(step)
+			self._studied(step)
+			self.stats["ticks"] += 1
+			seconds -= step
+
+	def _pomodoro_block(self, cycle):
+		from BackEnd.repos import session_repo
+		count = 0
+		for _ in range(self.rng.randint(1, 6)):
+			sid = session_repo.start_session(subject=self.rng.choice(SUBJECTS), source='pomodoro')
+			# one in eight study phases is skipped early
+			study = cycle.study_sec if self.rng.random() > 0.125 else self.rng.randint(60, cycle.study_sec)
+			clock.get_clock().advance(study)
+			session_repo.stop_session(sid)
+			self._studied(study)
+			self.stats["sessions"] += 1
+			self.stats["pomodoros"] += 1
+			phase, count, long_break = cycle.next_phase('study', count)
+			clock.get_clock().advance(cycle.duration(phase, long_break))
+
+	def run(self):
+		from BackEnd.repos.day_cache_repo import DayCache
+		from BackEnd.services.pomodoro_service import PomodoroCycle
+		from BackEnd.services.timer_service import TimerService
+		timer = TimerService()
+		cycle = PomodoroCycle()
+		# create study.days up front so every stop updates it in place
+		DayCache().open().close()
+		for d in range(self.days):
+			day = self.start + datetime.timedelta(days=d)
+			if self.rng.random() < 0.15:
+				continue  # day off
+			# sessions start between 07:00 and 23:00 and may run past midnight
+			hour = self.rng.randint(7, 12)
+			for _ in range(self.rng.randint(1, 3)):
+				self._advance_to(datetime.datetime.combine(day, datetime.time(hour, self.rng.randint(0, 59))))
+				if self.rng.random() < 0.6:
+					self._stopwatch(timer)
+				else:
+					self._pomodoro_block(cycle)
+				hour = clock.now_utc().astimezone().hour + self.rng.randint(1, 3)
+				if clock.now_utc().astimezone().date() != day or hour > 23:
+					break
+		self._advance_to(datetime.datetime.combine(
+			max(clock.local_today(), self.start + datetime.timedelta(days=self.days)), datetime.time(23, 59)))
+		return timer
+
+	# ---- verification --------------------------------------------------------
+
+	def check(self):
+		"""Compare stored aggregates with the simulated ground truth; returns a list of problems."""
+		from BackEnd.core.paths import journal_path
+		from BackEnd.repos import session_repo
+		from BackEnd.repos.day_cache_repo import DayCache
+		from BackEnd.services.analytics_service import SessionAnalytics, day_number
+		problems = []
+		last = clock.local_today().isoformat()
+		stored = session_repo.daily_totals(self.start.isoformat(), last)
+		for key in sorted(set(stored) | set(self.expected)):
+			if stored.get(key, 0) != self.expected.get(key, 0):
+				problems.append(f"{key}: stored {stored.get(key, 0)} s, expected {self.expected.get(key, 0)} s")
+		# the day cache as left by in-place updates, without a rebuild
+		cache = DayCache().open(verify=False)
+		first = day_number(self.start)
+		cached = cache.slice(first, day_number(clock.local_today()))
+		for i in map(int, cached.nonzero()[0]):
+			key = (self.start + datetime.timedelta(days=i)).isoformat()
+			if cached[i] != stored.get(key, 0):
+				problems.append(f"{key}: day cache {cached[i]} s, stored {stored.get(key, 0)} s")
+		if cache.total_seconds() != sum(stored.values()):
+			problems.append(f"day cache total {cache.total_seconds()} s, stored {sum(stored.values())} s")
+		cache.close()
+		analytics = SessionAnalytics()
+		analytics.refresh()
+		total = sum(self.expected.values())
+		if analytics.total_seconds() != total:
+			problems.append(f"analytics total {analytics.total_seconds()} s, expected {total} s")
+		if analytics.streak() != session_repo.get_daily_streak():
+			problems.append(f"streak: analytics {analytics.streak()}, repo {session_repo.get_daily_streak()}")
+		if session_repo.active_session() is not None:
+			problems.append("a session is still open")
+		if journal_path().exists() and journal_path().stat().st_size:
+			problems.append("heartbeat journal was not truncated after the last stop")
+		return problems
+
+
+def simulate(days=90, seed=0, tick=60, data_dir=None, keep=False):
+	"""Run a simulation in an isolated data dir and return a report dict."""
+	global _app
+	from PySide6.QtCore import QCoreApplication
+	# TimerService owns a QTimer; it is never started by an event loop here
+	_app = QCoreApplication.instance() or QCoreApplication([])
+	path = data_dir or tempfile.mkdtemp(prefix="focusly-sim-")
+	sim = Simulation(days=days, seed=seed, tick=tick)
+	start = datetime.datetime.combine(sim.start, datetime.time(0, 0))
+	try:
+		with _isolated_data_dir(path), clock.use_clock(clock.VirtualClock(start)):
+			t0 = time.perf_counter()
+			sim.run()
+			wall = time.perf_counter() - t0
+			problems = sim.check()
+	finally:
+		if not keep and data_dir is None:
+			shutil.rmtree(path, ignore_errors=True)
+	return dict(sim.stats, **{
+		"days": days,
+		"studied_sec": sum(sim.expected.values()),
+		"wall_sec": round(wall, 3),
+		"sessions_per_sec": round(sim.stats["sessions"] / wall, 1) if wall else None,
+		"ticks_per_sec": round(sim.stats["ticks"] / wall, 1) if wall else None,
+		"problems": problems,
+		"data_dir": path if keep or data_dir else None,
+	})
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Replay synthetic study usage in virtual time.")
+	parser.add_argument("--days", type=int, default=90)
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--tick", type=int, default=60, help="virtual seconds per timer tick")
+	parser.add_argument("--keep", action="store_true", help="keep the generated database")
+	args = parser.parse_args()
+	report = simulate(days=args.days, seed=args.seed, tick=args.tick, keep=args.keep)
+	print(f"Simulated {report['days']} days: {report['sessions']} sessions "
+		f"({report['pomodoros']} pomodoros, {report['pauses']} pauses), "
+		f"{report['studied_sec'] / 3600:.1f} h studied")
+	print(f"Wall time {report['wall_sec']} s: {report['sessions_per_sec']} sessions/s, "
+		f"{report['ticks_per_sec']} ticks/s")
+	if report["data_dir"]:
+		print(f"Database kept in {report['data_dir']}")
+	for problem in report["problems"]:
+		print(f"MISMATCH {problem}")
+	sys.exit(1 if report["problems"] else 0)
@@ -0,0 +1,140 @@
+"""
+Incremental delta sync of study sessions between devices.
+
+Only rows whose updated_at moved past the last push watermark are sent, and
+pulls resume from a per-remote cursor, so a sync after a day of use moves a
+handful of rows. Conflicts resolve last-writer-wins on updated_at; soft
+deletes travel as ordinary updates of deleted_at.
+"""
+
+import json
+import sys
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from BackEnd.core.clock import utc_now_iso
+from BackEnd.core.paths import user_data_dir
+from BackEnd.repos import session_repo
+
+
+class SyncRemote(ABC):
+	"""Pluggable sync backend. `key` must identify the remote across runs."""
+
+	key = None
+
+	@abstractmethod
+	def push(self, device_id, rows):
+		"""Store `rows` (list of dicts) published by `device_id`."""
+
+	@abstractmethod
+	def pull(self, device_id, cursor):
+		"""Return (rows, new_cursor) for changes from other devices since `cursor`."""
+
+
+class FolderRemote(SyncRemote):
+	"""Shared folder (cloud drive, network share) with one append-only log per device.
+
+	Each device appends JSON lines to `<folder>/<device_id>.jsonl`; the pull
+	cursor is the byte offset already consumed from every other log.
+	"""
+
+	def __init__(self, folder):
+		self.folder = Path(folder)
+		self.key = f"folder:{self.folder.resolve()}"
+
+	def push(self, device_id, rows):
+		if not rows:
+			return
+		self.folder.mkdir(parents=True, exist_ok=True)
+		with open(self.folder / f"{device_id}.jsonl", "a", encoding="utf-8") as f:
+			for row in rows:
+				f.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+	def pull(self, device_id, cursor):
+		rows = []
+		new_cursor = dict(cursor or {})
+		if not self.folder.exists():
+			return rows, new_cursor
+		for log in sorted(self.folder.glob("*.jsonl")):
+			if log.stem == device_id:
+				continue
+			offset = int(new_cursor.get(log.stem, 0))
+			with open(log, "rb") as f:
+				f.seek(offset)
+				for line in f:
+					# a peer may be mid-write: stop at a partial last line
+					if not line.endswith(b"\n"):
+						break
+					rows.append(json.loads(line))
+					offset += len(line)
+			new_cursor[log.stem] = offset
+		return rows, new_cursor
+
+
+def _state_path():
+	return user_data_dir() / "sync_state.json"
+
+
+def _load_state():
+	try:
+		with open(_state_path(), "r", encoding="utf-8") as f:
+			state = json.load(f)
+	except Exception:
+		state = {}
+	if not state.get("device_id"):
+		state["device_id"] = uuid.uuid4().hex
+	state.setdefault("remotes", {})
+	return state
+
+
+def _save_state(state):
+	with open(_state_path(), "w", encoding="utf-8") as f:
+		json.dump(state, f, indent=2)
+
+
+def sync(remote):
+	"""Pull and merge remote changes, then push local ones. Returns a report dict."""
+	state = _load_state()
+	device_id = state["device_id"]
+	rstate = state["remotes"].setdefault(remote.key, {"push_watermark": "", "pull_cursor": {}})
+
+	incoming, cursor = remote.pull(device_id, rstate["pull_cursor"])
+	inserted, updated = session_repo.merge_remote_rows(incoming)
+	rstate["pull_cursor"] = cursor
+
+	# Rows we just received carry the peer's clock: they are neither echoed
+	# back nor allowed to move the watermark. Rows already pushed at the
+	# watermark second are skipped too (updated_at only has 1 s resolution,
+	# so the query is >=).
+	session_repo.assign_client_ids()
+	watermark = rstate["push_watermark"]
+	received = {(r["client_id"], r["updated_at"]) for r in incoming}
+	edge = {(cid, watermark) for cid in rstate.get("push_edge", [])}
+	local = [r for r in session_repo.changed_since(watermark)
+		if (r["client_id"], r["updated_at"]) not in received]
+	outgoing = [r for r in local if (r["client_id"], r["updated_at"]) not in edge]
+	remote.push(device_id, outgoing)
+	if local:
+		# Rows merged in an earlier sync are no longer in `received`; one
+		# stamped ahead of our clock is resent until the clock passes it, but
+		# the watermark never moves past local now, so local edits made after
+		# this sync are always newer than it.
+		mark = min(local[-1]["updated_at"], utc_now_iso())
+		rstate["push_watermark"] = mark
+		rstate["push_edge"] = [r["client_id"] for r in local if r["updated_at"] == mark]
+	_save_state(state)
+	return {
+		"pushed": len(outgoing),
+		"pulled": len(incoming),
+		"inserted": inserted,
+		"updated": updated,
+	}
+
+
+if __name__ == "__main__":
+	if len(sys.argv) != 2:
+		print("usage: python -m BackEnd.services.sync_service <shared-folder>")
+		sys.exit(2)
+	report = sync(FolderRemote(sys.argv[1]))
+	print(f"Pushed {report['pushed']}, pulled {report['pulled']} "
+		f"({report['inserted']} new, {report['updated']} updated)")
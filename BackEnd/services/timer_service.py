@@ -1,27 +1,45 @@
+import logging
+from datetime import datetime
 from PySide6.QtCore import QObject, Signal, QTimer
-from BackEnd.repos import session_repo
+from BackEnd.core import clock, perf
+from BackEnd.repos import session_repo, journal_repo
+
+log = logging.getLogger(__name__)
 
 class TimerService(QObject):
 	tick = Signal(int)  # emits elapsed seconds
 	state_changed = Signal(str)  # emits 'idle', 'running', 'paused', 'stopped'
 
-	def __init__(self):
+	def __init__(self, journal=None):
 		super().__init__()
+		# heartbeats go to an append-only journal instead of rewriting the row
+		self._journal = journal if journal is not None else journal_repo.Journal()
 		self.running = False
 		self.paused = False
 		self.elapsed_sec = 0
 		self.session_id = None
+		self.subject = ""
+		# monotonic time of the session start and offset of the current unpaused run
+		self._t0 = None
+		self._run_start = None
+		# closed segments not yet stored; stop() writes them with the session
+		self._pending_segments = []
 		self._timer = QTimer()
 		self._timer.setInterval(1000)
 		self._timer.timeout.connect(self._on_tick)
 
-	def start(self):
+	def start(self, subject=""):
 		if self.running:
 			return
-		self.session_id = session_repo.start_session()
+		self.session_id = session_repo.start_session(subject=subject or "")
+		self.subject = subject or ""
 		self.elapsed_sec = 0
 		self.running = True
 		self.paused = False
+		self._t0 = clock.monotonic()
+		self._run_start = 0
+		self._pending_segments = []
+		self._journal_write(journal_repo.START)
 		self._timer.start()
 		self.state_changed.emit('running')
 
@@ -31,10 +49,14 @@ class TimerService(QObject):
 		if self.paused:
 			self._timer.start()
 			self.paused = False
+			self._run_start = self._offset()
+			self._journal_write(journal_repo.RESUME)
 			self.state_changed.emit('running')
 		else:
 			self._timer.stop()
 			self.paused = True
+			self._close_segment()
+			self._journal_write(journal_repo.PAUSE)
 			self.state_changed.emit('paused')
 
 	def stop(self):
@@ -42,10 +64,11 @@ class TimerService(QObject):
 			return
 		self._timer.stop()
 		if self.session_id is not None:
-			session_repo.stop_session(self.session_id)
+			self._stop_session()
 		self.running = False
 		self.paused = False
 		self.session_id = None
+		self.subject = ""
 		self.elapsed_sec = 0
 		self.state_changed.emit('idle')
 
@@ -53,22 +76,57 @@ class TimerService(QObject):
 		"""Force end session without UI reset (for confirmation dialog)."""
 		if self.running and self.session_id is not None:
 			self._timer.stop()
-			session_repo.stop_session(self.session_id)
+			self._stop_session()
 			self.running = False
 			self.paused = False
 			self.session_id = None
+			self.subject = ""
 			self.elapsed_sec = 0
 			self.state_changed.emit('idle')
 
-	def _on_tick(self):
-		self.elapsed_sec += 1
+	def _on_tick(self, seconds=1):
+		# QTimer ticks one second at a time; simulations may pass larger steps
+		self.elapsed_sec += seconds
 		self.tick.emit(self.elapsed_sec)
-		# persist periodically for crash-safety (every 5 seconds)
+		# journal every tick for crash-safety; replayed into the DB on startup
+		self._journal_write(journal_repo.HEARTBEAT)
+
+	def _offset(self):
+		return int(round(clock.monotonic() - self._t0))
+
+	def _close_segment(self):
+		"""Store the unpaused run that is ending as a (start offset, length) segment.
+
+		A segment that cannot be written now stays pending and is stored by
+		stop_session() in the transaction that sums the segments, so a failed
+		write never shortens the session.
+		"""
+		if self._run_start is None or self.session_id is None:
+			return
+		start, self._run_start = self._run_start, None
+		self._pending_segments.append((start, self._offset() - start))
+		while self._pending_segments:
+			try:
+				session_repo.add_segment(self.session_id, *self._pending_segments[0])
+			except Exception:
+				log.exception("could not store segment of session %s; retrying at stop", self.session_id)
+				return
+			self._pending_segments.pop(0)
+
+	def _stop_session(self):
+		self._close_segment()
+		session_repo.stop_session(self.session_id, segments=self._pending_segments)
+		self._pending_segments = []
+		self._journal_write(journal_repo.STOP)
+
+	def _journal_write(self, kind):
+		if self.session_id is None:
+			return
 		try:
-			if self.elapsed_sec % 5 == 0 and self.session_id is not None:
-				session_repo.update_elapsed(self.session_id, self.elapsed_sec)
+			with perf.timed("journal_write"):
+				self._journal.append(kind, self.session_id, self.elapsed_sec)
 		except Exception:
-			# don't let DB issues break the timer loop
+			# don't let journal I/O issues break the timer loop
 			pass
 
 	def resume_active_session(self, paused: bool = False):
@@ -81,16 +139,20 @@ class TimerService(QObject):
 		if active:
 			# prefer persisted elapsed_sec if available (exact saved seconds)
 			self.session_id = active['id']
+			self.subject = active.get('subject') or ""
 			if active.get('elapsed_sec') is not None:
 				self.elapsed_sec = int(active.get('elapsed_sec') or 0)
 			else:
-				from datetime import datetime, timezone
-				start_utc = active['start_utc']
-				start_dt = datetime.fromisoformat(start_utc)
-				now = datetime.now(timezone.utc)
-				self.elapsed_sec = int((now - start_dt).total_seconds())
+				start_dt = datetime.fromisoformat(active['start_utc'])
+				self.elapsed_sec = int((clock.now_utc() - start_dt).total_seconds())
 			self.running = True
 			self.paused = bool(paused)
+			# anchor segment offsets to the stored start time
+			since_start = (clock.now_utc() - datetime.fromisoformat(active['start_utc'])).total_seconds()
+			self._t0 = clock.monotonic() - since_start
+			self._run_start = None if self.paused else self._offset()
+			self._pending_segments = []
+			self._journal_write(journal_repo.PAUSE if self.paused else journal_repo.RESUME)
 			if not self.paused:
 				self._timer.start()
 				self.state_changed.emit('running')
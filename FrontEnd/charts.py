@@ -0,0 +1,167 @@
+"""
+Matplotlib drawing routines for the study charts.
+
+Functions draw onto a plain matplotlib Figure and never touch Qt, so the
+same code serves the live history canvas and headless rendering.
+"""
+
+import calendar
+import datetime
+import numpy as np
+import matplotlib.style
+from matplotlib.colors import LinearSegmentedColormap
+
+# Apply modern matplotlib styling
+matplotlib.style.use('seaborn-v0_8-whitegrid')
+
+HEATMAP_CMAP = LinearSegmentedColormap.from_list('focusly', ['#EEF3F8', '#8FAEC4', '#1E3A56'])
+HEATMAP_CMAP.set_bad(alpha=0.0)
+
+
+def draw_daily_bars(fig, x, y, xlabel, rotate_labels=False):
+	"""Bar chart of hours per day (or per bucket) labelled with their values."""
+	fig.clear()
+	# Set figure background to match app theme
+	fig.patch.set_facecolor('#E2E8F0')
+	fig.patch.set_alpha(0.0)  # Transparent to blend with app
+	plot_daily_bars(fig.add_subplot(111), x, y, xlabel, rotate_labels)
+	# Add extra padding to prevent title/label cutoff
+	fig.tight_layout(pad=2.0)
+
+
+def plot_daily_bars(ax, x, y, xlabel, rotate_labels=False, value_labels=True):
+	"""draw_daily_bars() into an existing Axes (e.g. one panel of a report page)."""
+	# Set axis background
+	ax.set_facecolor('#F7FAFC')
+	
+	# Modern color palette - gradient blue matching app theme
+	bars = ax.bar(x, y, color='#8FAEC4', edgecolor='#7B9BB0', linewidth=1.5, alpha=0.9)
+	
+	# Add value labels on top of bars for better readability
+	for i, (bar, value) in enumerate(zip(bars, y)):
+		if value > 0 and value_labels:
+			ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.05,
+			       f'{value:.1f}h', ha='center', va='bottom', 
+			       fontsize=9, fontweight='600', color='#1E3A56')
+	
+	# Styling
+	ax.set_ylabel("Hours Studied", fontsize=12, fontweight='600', color='#1E3A56', labelpad=10)
+	ax.set_xlabel(xlabel, fontsize=12, fontweight='600', color='#1E3A56', labelpad=10)
+	ax.set_title(f"Study Time by {xlabel}", fontsize=14, fontweight='bold', 
+	            color='#1E3A56', pad=15)
+	ax.set_ylim(bottom=0)
+	
+	# Grid styling - soft transparency
+	ax.grid(True, axis='y', alpha=0.25, linestyle='--', linewidth=0.8, color='#C9D8E2')
+	ax.set_axisbelow(True)  # Grid behind bars
+	
+	# Tick styling
+	ax.tick_params(axis='both', colors='#1E3A56', labelsize=10)
+	
+	# Spine styling - cleaner look
+	for spine in ['top', 'right']:
+		ax.spines[spine].set_visible(False)
+	for spine in ['bottom', 'left']:
+		ax.spines[spine].set_color('#C9D8E2')
+		ax.spines[spine].set_linewidth(1.2)
+	
+	# Rotate x-labels if month view for better readability
+	if rotate_labels:
+		ax.tick_params(axis='x', rotation=45)
+
+
+def draw_subject_bars(fig, rows, prev):
+	"""Horizontal bars per subject with share of the period and change vs `prev` ({subject: seconds})."""
+	fig.clear()
+	fig.patch.set_facecolor('#E2E8F0')
+	fig.patch.set_alpha(0.0)
+	if plot_subject_bars(fig.add_subplot(111), rows, prev):
+		fig.tight_layout(pad=2.0)
+
+
+def plot_subject_bars(ax, rows, prev, title=None):
+	"""draw_subject_bars() into an existing Axes. Returns False if there was nothing to plot.
+
+	With `prev` None the change column is left out; `title` replaces the default.
+	"""
+	ax.set_facecolor('#F7FAFC')
+	if not rows:
+		ax.text(0.5, 0.5, "No study sessions in this period", ha='center', va='center',
+		       fontsize=12, color='#1E3A56', transform=ax.transAxes)
+		ax.set_axis_off()
+		return False
+	# largest subject on top
+	rows = rows[::-1]
+	names = [r["subject"] or "Unassigned" for r in rows]
+	hours = [(r["total_sec"] or 0) / 3600 for r in rows]
+	bars = ax.barh(names, hours, color='#8FAEC4', edgecolor='#7B9BB0', linewidth=1.5, alpha=0.9)
+	for bar, r, h in zip(bars, rows, hours):
+		label = f'{h:.1f}h · {r["share"]*100:.0f}%'
+		if prev is not None:
+			delta = ((r["total_sec"] or 0) - prev.get(r["subject"], 0)) / 3600
+			arrow = "▲" if delta > 0 else ("▼" if delta < 0 else "•")
+			label += f'  {arrow}{abs(delta):.1f}h'
+		ax.text(bar.get_width() + 0.05, bar.get_y() + bar.get_height()/2, label,
+		       ha='left', va='center', fontsize=9, fontweight='600', color='#1E3A56')
+	ax.set_xlabel("Hours Studied", fontsize=12, fontweight='600', color='#1E3A56', labelpad=10)
+	if title is None:
+		title = "Study Time by Subject" + (" (change vs previous period)" if prev is not None else "")
+	ax.set_title(title, fontsize=14, fontweight='bold', color='#1E3A56', pad=15)
+	ax.set_xlim(0, max(hours) * 1.35 or 1)
+	ax.grid(True, axis='x', alpha=0.25, linestyle='--', linewidth=0.8, color='#C9D8E2')
+	ax.set_axisbelow(True)
+	ax.tick_params(axis='both', colors='#1E3A56', labelsize=10)
+	for spine in ['top', 'right']:
+		ax.spines[spine].set_visible(False)
+	for spine in ['bottom', 'left']:
+		ax.spines[spine].set_color('#C9D8E2')
+		ax.spines[spine].set_linewidth(1.2)
+	return True
+
+
+def year_grid(year, daily):
+	"""Lay out `daily` (seconds for each day of `year`) as a 7 x weeks array.
+
+	Rows are weekdays (Mon..Sun), columns are calendar weeks; cells outside the
+	year are NaN so they render transparent.
+	"""
+	jan1 = datetime.date(year, 1, 1)
+	offset = jan1.weekday()
+	n = len(daily)
+	weeks = (offset + n + 6) // 7
+	grid = np.full(weeks * 7, np.nan)
+	grid[offset:offset + n] = np.asarray(daily, dtype=float) / 3600
+	# fill column-major: consecutive days go down a week column
+	return grid.reshape(weeks, 7).T
+
+
+def draw_year_heatmap(fig, year, daily):
+	"""Contributions-style calendar of hours per day for `year`, drawn as a single image."""
+	fig.clear()
+	fig.patch.set_facecolor('#E2E8F0')
+	fig.patch.set_alpha(0.0)
+	ax = fig.add_subplot(111)
+	ax.set_facecolor('#F7FAFC')
+	grid = year_grid(year, daily)
+	vmax = max(1.0, float(np.nanmax(grid)) if np.isfinite(grid).any() else 1.0)
+	img = ax.imshow(grid, cmap=HEATMAP_CMAP, vmin=0, vmax=vmax, aspect='equal', interpolation='nearest')
+
+	# month labels at the week column containing each month's first day
+	offset = datetime.date(year, 1, 1).weekday()
+	ticks = [(offset + datetime.date(year, m, 1).timetuple().tm_yday - 1) // 7 for m in range(1, 13)]
+	ax.set_xticks(ticks)
+	ax.set_xticklabels([calendar.month_abbr[m] for m in range(1, 13)])
+	ax.set_yticks([0, 2, 4])
+	ax.set_yticklabels(['Mon', 'Wed', 'Fri'])
+	ax.tick_params(axis='both', colors='#1E3A56', labelsize=9, length=0)
+	ax.grid(False)
+	for spine in ax.spines.values():
+		spine.set_visible(False)
+	total = float(np.nansum(grid))
+	ax.set_title(f"Study Time in {year} ({total:.1f}h)", fontsize=14, fontweight='bold',
+	            color='#1E3A56', pad=15)
+	cbar = fig.colorbar(img, ax=ax, orientation='horizontal', fraction=0.05, pad=0.12, aspect=40)
+	cbar.set_label("Hours per day", color='#1E3A56', fontsize=10)
+	cbar.outline.set_visible(False)
+	cbar.ax.tick_params(colors='#1E3A56', labelsize=8)
+	fig.tight_layout(pad=2.0)
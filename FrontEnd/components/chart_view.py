@@ -0,0 +1,151 @@
+import logging
+import threading
+import time
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QWidget
+from BackEnd.core import perf
+
+log = logging.getLogger(__name__)
+
+
+class ChartRenderer(QObject):
+    """Rasterizes charts with Agg on a worker thread, latest request wins.
+
+    Each submit() bumps a generation number; a newer submit replaces any
+    pending job and the render in flight is dropped at its next checkpoint,
+    so paging quickly through periods only renders the last one.
+    """
+
+    rendered = Signal(int, object)  # generation, (rgba buffer, width, height)
+    failed = Signal(int, str)       # generation, error message
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cond = threading.Condition()
+        self._job = None
+        self._generation = 0
+        self._thread = None
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def submit(self, draw, args, kwargs, width, height, dpi):
+        """Queue draw(fig, *args, **kwargs) on a width x height px figure; returns its generation."""
+        with self._cond:
+            self._generation += 1
+            self._job = (self._generation, draw, args, kwargs, width, height, dpi)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chart-render", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self._generation
+
+    def cancel(self):
+        with self._cond:
+            self._generation += 1
+            self._job = None
+
+    def _stale(self, generation):
+        return generation != self._generation
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._job is None:
+                    self._cond.wait()
+                generation, draw, args, kwargs, width, height, dpi = self._job
+                self._job = None
+            t0 = time.perf_counter()
+            try:
+                fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+                canvas = FigureCanvasAgg(fig)
+                draw(fig, *args, **kwargs)
+                if self._stale(generation):
+                    continue
+                canvas.draw()
+                if self._stale(generation):
+                    continue
+                w, h = canvas.get_width_height(physical=True)
+                # the memoryview keeps the Agg renderer (and its pixels) alive
+                result = (canvas.buffer_rgba(), w, h)
+            except Exception as e:
+                log.exception("chart render failed (%s)", getattr(draw, "__name__", draw))
+                self.failed.emit(generation, f"{type(e).__name__}: {e}")
+                continue
+            perf.record("chart_render", (time.perf_counter() - t0) * 1000)
+            self.rendered.emit(generation, result)
+
+
+class ChartView(QWidget):
+    """Shows charts rendered off the GUI thread by ChartRenderer."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.renderer = ChartRenderer(self)
+        self.renderer.rendered.connect(self._on_rendered)
+        self.renderer.failed.connect(self._on_failed)
+        self._job = None
+        self._image = None
+        self._error = None
+        self._buffer = None
+        # re-render at the new size once resizing settles; until then the old image is scaled
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(120)
+        self._resize_timer.timeout.connect(self._submit)
+
+    def render(self, draw, *args, **kwargs):
+        """Render draw(fig, *args, **kwargs) in the background and show it when done."""
+        self._job = (draw, args, kwargs)
+        self._submit()
+
+    def _submit(self):
+        if self._job is None:
+            return
+        draw, args, kwargs = self._job
+        ratio = self.devicePixelRatioF()
+        width = max(1, round(self.width() * ratio))
+        height = max(1, round(self.height() * ratio))
+        self.renderer.submit(draw, args, kwargs, width, height, 100 * ratio)
+
+    def _on_rendered(self, generation, result):
+        if generation != self.renderer.generation:
+            return
+        buffer, width, height = result
+        # QImage wraps the Agg buffer without copying; keep the buffer referenced
+        self._buffer = buffer
+        self._image = QImage(buffer, width, height, width * 4, QImage.Format_RGBA8888)
+        self._image.setDevicePixelRatio(self.devicePixelRatioF())
+        self._error = None
+        self.update()
+
+    def _on_failed(self, generation, message):
+        if generation != self.renderer.generation:
+            return
+        # show the failure instead of a chart for another period
+        self._image = self._buffer = None
+        self._error = message
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._job is not None:
+            self._resize_timer.start()
+
+    def paintEvent(self, event):
+        if self._error is not None:
+            painter = QPainter(self)
+            painter.drawText(self.rect(), Qt.AlignCenter | Qt.TextWordWrap,
+                             f"Chart could not be drawn.\n{self._error}")
+            painter.end()
+            return
+        if self._image is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawImage(self.rect(), self._image)
+        painter.end()
@@ -0,0 +1,131 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QDialog, QListWidget,
+    QListWidgetItem, QPushButton, QComboBox, QDoubleSpinBox, QMessageBox
+)
+from BackEnd.repos import goal_repo, session_repo
+
+
+def fmt_goal_time(sec):
+    """Compact duration for goal rows, e.g. 1h 05m or 45m."""
+    h, m = divmod(int(sec) // 60, 60)
+    return f"{h}h {m:02d}m" if h else f"{m}m"
+
+
+def goal_title(period, subject):
+    return f"{'Today' if period == 'daily' else 'This week'} · {subject or 'All subjects'}"
+
+
+class GoalProgressPanel(QWidget):
+    """One label + progress bar per goal; hidden when there are no goals."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._layout = QVBoxLayout()
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(6)
+        self.setLayout(self._layout)
+        self._rows = {}
+        self.setVisible(False)
+
+    def set_progress(self, progress):
+        """Update from a list of GoalProgress; rows are rebuilt only when the goal set changes."""
+        ids = [p.id for p in progress]
+        if ids != list(self._rows):
+            self._rebuild(progress)
+        for p in progress:
+            label, bar = self._rows[p.id]
+            label.setText(f"{goal_title(p.period, p.subject)}   "
+                          f"{fmt_goal_time(p.done_sec)} / {fmt_goal_time(p.target_sec)}")
+            value = int(p.ratio * 1000)
+            if bar.value() != value:
+                bar.setValue(value)
+            complete = p.ratio >= 1.0
+            if bar.property("complete") != complete:
+                bar.setProperty("complete", complete)
+                bar.style().unpolish(bar)
+                bar.style().polish(bar)
+        self.setVisible(bool(progress))
+
+    def _rebuild(self, progress):
+        while self._layout.count():
+            item = self._layout.takeAt(0)
+            if item.widget() is not None:
+                item.widget().deleteLater()
+        self._rows = {}
+        for p in progress:
+            label = QLabel()
+            label.setObjectName("GoalLabel")
+            bar = QProgressBar()
+            bar.setObjectName("GoalBar")
+            bar.setRange(0, 1000)
+            bar.setTextVisible(False)
+            self._layout.addWidget(label)
+            self._layout.addWidget(bar)
+            self._rows[p.id] = (label, bar)
+
+
+class GoalDialog(QDialog):
+    """Add, change and remove daily / weekly study goals."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Study Goals")
+        self.changed = False
+        layout = QVBoxLayout()
+        self.goal_list = QListWidget()
+        layout.addWidget(self.goal_list)
+        remove_btn = QPushButton("Remove Selected")
+        remove_btn.clicked.connect(self._remove)
+        layout.addWidget(remove_btn)
+
+        form = QHBoxLayout()
+        self.period_combo = QComboBox()
+        self.period_combo.addItems(["Daily", "Weekly"])
+        self.subject_combo = QComboBox()
+        self.subject_combo.setEditable(True)
+        self.subject_combo.addItem("All subjects")
+        try:
+            self.subject_combo.addItems(session_repo.list_subjects())
+        except Exception:
+            pass
+        self.hours_spin = QDoubleSpinBox()
+        self.hours_spin.setRange(0.25, 100.0)
+        self.hours_spin.setSingleStep(0.25)
+        self.hours_spin.setValue(2.0)
+        self.hours_spin.setSuffix(" h")
+        set_btn = QPushButton("Set Goal")
+        set_btn.clicked.connect(self._set)
+        for widget in (self.period_combo, self.subject_combo, self.hours_spin, set_btn):
+            form.addWidget(widget)
+        layout.addLayout(form)
+        self.setLayout(layout)
+        self._reload()
+
+    def _reload(self):
+        self.goal_list.clear()
+        for g in goal_repo.list_goals():
+            item = QListWidgetItem(f"{goal_title(g['period'], g['subject'])}: {fmt_goal_time(g['target_sec'])}")
+            item.setData(Qt.UserRole, g["id"])
+            self.goal_list.addItem(item)
+
+    def _set(self):
+        subject = self.subject_combo.currentText().strip()
+        if subject == "All subjects":
+            subject = ""
+        try:
+            goal_repo.set_goal(self.period_combo.currentText().lower(),
+                               round(self.hours_spin.value() * 3600), subject)
+        except Exception as e:
+            QMessageBox.warning(self, "Study Goals", f"Could not save goal: {e}")
+            return
+        self.changed = True
+        self._reload()
+
+    def _remove(self):
+        item = self.goal_list.currentItem()
+        if item is None:
+            return
+        goal_repo.delete_goal(item.data(Qt.UserRole))
+        self.changed = True
+        self._reload()
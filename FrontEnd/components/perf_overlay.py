@@ -0,0 +1,117 @@
+import time
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from BackEnd.core import perf
+
+# metric name -> label shown in the overlay
+METRICS = [
+    ("event_loop_lag", "Event-loop lag"),
+    ("tick_jitter.timer", "Timer tick jitter"),
+    ("tick_jitter.pomodoro", "Pomodoro tick jitter"),
+    ("chart_render", "Chart render"),
+    ("db_write", "DB write"),
+    ("journal_write", "Journal write"),
+    ("raw_search_first", "Search first batch"),
+]
+
+
+class PerfMonitor(QObject):
+    """Feeds event-loop lag and timer tick jitter into BackEnd.core.perf histograms."""
+
+    PROBE_MS = 250
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._probe = QTimer(self)
+        self._probe.setInterval(self.PROBE_MS)
+        self._probe.timeout.connect(self._on_probe)
+        self._last_probe = None
+        self._last_tick = {}
+
+    def start(self):
+        self._last_probe = time.perf_counter()
+        self._probe.start()
+
+    def _on_probe(self):
+        # how late the probe fired = time the event loop was busy elsewhere
+        now = time.perf_counter()
+        perf.record("event_loop_lag", max(0.0, (now - self._last_probe) * 1000 - self.PROBE_MS))
+        self._last_probe = now
+
+    def watch_ticks(self, name, interval_ms=1000):
+        """Return a slot that records |actual - expected| tick interval for `name`.
+
+        Every interval is recorded, stalls included; the owner calls
+        reset_ticks(name) when the timer starts or resumes so the gap of a
+        pause is never measured.
+        """
+        def on_tick(*_):
+            now = time.perf_counter()
+            last = self._last_tick.get(name)
+            self._last_tick[name] = now
+            if last is not None:
+                perf.record(f"tick_jitter.{name}", abs((now - last) * 1000 - interval_ms))
+        return on_tick
+
+    def reset_ticks(self, name):
+        """Forget the last tick of `name` (its timer was started or resumed)."""
+        self._last_tick.pop(name, None)
+
+
+class PerfOverlay(QWidget):
+    """Developer panel with live latency percentiles (toggle with Ctrl+Shift+P)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Tool)
+        self.setWindowTitle("Performance")
+        layout = QVBoxLayout()
+        self.text = QLabel()
+        font = QFont("Monospace")
+        font.setStyleHint(QFont.TypeWriter)
+        self.text.setFont(font)
+        self.text.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.text)
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.status = QLabel("")
+        buttons.addWidget(self.status)
+        export_btn = QPushButton("Export Report")
+        export_btn.clicked.connect(self._export)
+        buttons.addWidget(export_btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+        self._refresh = QTimer(self)
+        self._refresh.setInterval(500)
+        self._refresh.timeout.connect(self.update_text)
+
+    def showEvent(self, event):
+        self.update_text()
+        self._refresh.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._refresh.stop()
+        super().hideEvent(event)
+
+    def update_text(self):
+        stats = perf.snapshot()
+        lines = [f"{'metric':<22}{'last':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'n':>8}"]
+        for key, label in METRICS:
+            s = stats.get(key)
+            if s is None:
+                lines.append(f"{label:<22}{'-':>9}")
+                continue
+            lines.append(
+                f"{label:<22}{s['last_ms']:>9.1f}{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}"
+                f"{s['p99_ms']:>9.1f}{s['max_ms']:>9.1f}{s['count']:>8}"
+            )
+        lines.append("(all values in ms)")
+        self.text.setText("\n".join(lines))
+
+    def _export(self):
+        try:
+            path = perf.export_report()
+            self.status.setText(f"Saved {path.name}")
+        except Exception as e:
+            self.status.setText(f"Export failed: {e}")
@@ -0,0 +1,74 @@
+"""
+Coalesced refresh of data-driven views.
+
+Code that changes session data calls mark_dirty() instead of redrawing
+labels and charts itself. The bus runs one pass on the next idle turn of
+the event loop and redraws only the dirty views whose widget is currently
+visible. Views read the data they share through shared_fetch(), which runs
+the bus's `fetch` (the app's incremental analytics refresh) at most once
+per pass. Hidden views stay dirty and are redrawn when they are shown
+(flush() on page change).
+"""
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class RefreshBus(QObject):
+	def __init__(self, fetch=None, parent=None):
+		super().__init__(parent)
+		self._fetch = fetch
+		self._views = {}
+		self._dirty = set()
+		self._in_pass = False
+		self._fetched = None
+		self._timer = QTimer(self)
+		self._timer.setSingleShot(True)
+		self._timer.setInterval(0)
+		self._timer.timeout.connect(self.flush)
+
+	def register(self, name, callback, widget=None):
+		"""Add a view; `widget` gates it on visibility (None = always refresh)."""
+		self._views[name] = (callback, widget)
+
+	def mark_dirty(self, *names):
+		"""Mark views (all when no names are given) stale and schedule a pass."""
+		self._dirty.update(names or self._views)
+		self.schedule()
+
+	def schedule(self):
+		"""Run a pass on the next idle turn; repeated calls before then coalesce."""
+		if self._dirty and not self._timer.isActive():
+			self._timer.start()
+
+	def flush(self):
+		"""Refresh dirty visible views now (normally run from the idle timer)."""
+		self._timer.stop()
+		due = [name for name in self._views if name in self._dirty and self._is_visible(name)]
+		if not due:
+			return
+		self._in_pass = True
+		self._fetched = None
+		try:
+			for name in due:
+				self._dirty.discard(name)
+				self._views[name][0]()
+		finally:
+			self._in_pass = False
+			self._fetched = None
+
+	def shared_fetch(self):
+		"""Result of `fetch`, computed at most once per pass (always fresh outside one)."""
+		if self._fetch is None:
+			return None
+		if not self._in_pass:
+			return self._fetch()
+		if self._fetched is None:
+			self._fetched = self._fetch()
+		return self._fetched
+
+	def is_dirty(self, name):
+		return name in self._dirty
+
+	def _is_visible(self, name):
+		widget = self._views[name][1]
+		return widget is None or widget.isVisible()
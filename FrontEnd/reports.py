@@ -0,0 +1,248 @@
+"""
+Headless study reports (PNG or PDF), one page per week or month.
+
+All periods are read from the per-day rollup in one range query and
+reduced to small per-period payloads in this process; rendering (the slow
+part) runs in a process pool, each worker drawing with the Agg/PDF
+backends onto plain Figures, so nothing here needs Qt or a display.
+
+	python -m FrontEnd.reports --period week --count 52 --format png
+"""
+
+import argparse
+import calendar
+import datetime
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from BackEnd.core.clock import local_today
+
+PAGE_SIZE = (8.27, 11.69)  # A4 portrait, inches
+PERIODS = ("week", "month")
+
+
+def period_bounds(period, count, end=None):
+	"""The last `count` weeks/months up to the one containing `end`, oldest first, as (first, last) dates."""
+	if count < 1:
+		raise ValueError(f"report count must be at least 1, got {count}")
+	end = end or local_today()
+	bounds = []
+	if period == "week":
+		monday = end - datetime.timedelta(days=end.weekday())
+		for i in range(count - 1, -1, -1):
+			first = monday - datetime.timedelta(weeks=i)
+			bounds.append((first, first + datetime.timedelta(days=6)))
+	elif period == "month":
+		for i in range(count - 1, -1, -1):
+			m = end.year * 12 + end.month - 1 - i
+			year, month = divmod(m, 12)
+			first = datetime.date(year, month + 1, 1)
+			bounds.append((first, first.replace(day=calendar.monthrange(year, month + 1)[1])))
+	else:
+		raise ValueError(f"unknown report period: {period!r}")
+	return bounds
+
+
+def _period_name(period, first):
+	if period == "week":
+		year, week, _ = first.isocalendar()
+		return f"{year}-W{week:02d}", f"Week {week}, {year} ({first:%b %d} - {first + datetime.timedelta(days=6):%b %d})"
+	return f"{first:%Y-%m}", f"{first:%B %Y}"
+
+
+def build_jobs(period="week", count=4, end=None):
+	"""Per-period report payloads (plain dicts, cheap to send to workers)."""
+	from BackEnd.repos import session_repo
+	bounds = period_bounds(period, count, end)
+	# one extra period in front so the first report can compare with its predecessor
+	lead = period_bounds(period, count + 1, bounds[-1][1])[0]
+	by_day = defaultdict(lambda: defaultdict(int))
+	sessions_by_day = defaultdict(set)
+	for date, subject, session_id, seconds in session_repo.day_slices(lead[0].isoformat(), bounds[-1][1].isoformat()):
+		by_day[date][subject] += seconds
+		sessions_by_day[date].add(session_id)
+
+	def subject_seconds(first, last):
+		totals = defaultdict(int)
+		d = first
+		while d <= last:
+			for subject, sec in by_day.get(d.isoformat(), {}).items():
+				totals[subject] += sec
+			d += datetime.timedelta(days=1)
+		return totals
+
+	jobs = []
+	prev = subject_seconds(*lead)
+	for first, last in bounds:
+		days = [first + datetime.timedelta(days=i) for i in range((last - first).days + 1)]
+		daily = [sum(by_day.get(d.isoformat(), {}).values()) for d in days]
+		subjects = subject_seconds(first, last)
+		total = sum(daily)
+		sessions = set()
+		for d in days:
+			sessions |= sessions_by_day.get(d.isoformat(), set())
+		rows = [
+			{"subject": s, "total_sec": sec, "share": sec / total if total else 0.0}
+			for s, sec in sorted(subjects.items(), key=lambda kv: -kv[1]) if sec
+		]
+		studied = [sec for sec in daily if sec > 0]
+		best = max(range(len(days)), key=daily.__getitem__) if studied else None
+		key, title = _period_name(period, first)
+		jobs.append({
+			"period": period,
+			"key": key,
+			"title": title,
+			"x": [d.strftime("%a") for d in days] if period == "week" else [str(d.day) for d in days],
+			"y": [sec / 3600 for sec in daily],
+			"xlabel": "Day of Week" if period == "week" else "Day of Month",
+			"subjects": rows,
+			"prev": dict(prev),
+			"stats": {
+				"total_sec": total,
+				"prev_total_sec": sum(prev.values()),
+				"days_studied": len(studied),
+				"days": len(days),
+				"avg_sec": total // len(studied) if studied else 0,
+				"best_day": days[best].strftime("%a %b %d") if best is not None else "-",
+				"best_sec": daily[best] if best is not None else 0,
+				"sessions": len(sessions),
+			},
+		})
+		prev = subjects
+	return jobs
+
+
+def render_report(job, path, fmt="png", dpi=110):
+	"""Draw one report page to `path`. Runs in worker processes; returns the path."""
+	from matplotlib.backends.backend_agg import FigureCanvasAgg
+	from matplotlib.figure import Figure
+	from BackEnd.core.clock import fmt_hms
+	from FrontEnd import charts
+
+	fig = Figure(figsize=PAGE_SIZE, dpi=dpi)
+	FigureCanvasAgg(fig)
+	fig.patch.set_facecolor('white')
+	grid = fig.add_gridspec(3, 1, height_ratios=[0.9, 2.2, 2.0], hspace=0.45)
+
+	head = fig.add_subplot(grid[0])
+	head.set_axis_off()
+	st = job["stats"]
+	change = (st["total_sec"] - st["prev_total_sec"]) / 3600
+	head.text(0, 0.95, "Study Report", fontsize=20, fontweight='bold', color='#1E3A56', va='top')
+	head.text(0, 0.62, job["title"], fontsize=13, color='#1E3A56', va='top')
+	cards = [
+		("Total", f"{st['total_sec'] / 3600:.1f}h", f"{'+' if change >= 0 else '-'}{abs(change):.1f}h vs previous"),
+		("Days studied", f"{st['days_studied']}/{st['days']}", f"{st['sessions']} sessions"),
+		("Daily average", fmt_hms(st["avg_sec"]), "on days studied"),
+		("Best day", f"{st['best_sec'] / 3600:.1f}h", st["best_day"]),
+	]
+	for i, (label, value, note) in enumerate(cards):
+		x = i * 0.26
+		head.text(x, 0.32, label, fontsize=9, color='#5A7184', va='top')
+		head.text(x, 0.18, value, fontsize=15, fontweight='bold', color='#1E3A56', va='top')
+		head.text(x, -0.08, note, fontsize=8, color='#5A7184', va='top')
+
+	charts.plot_daily_bars(fig.add_subplot(grid[1]), job["x"], job["y"], job["xlabel"],
+		rotate_labels=len(job["x"]) > 15)
+	charts.plot_subject_bars(fig.add_subplot(grid[2]), job["subjects"], job["prev"])
+	fig.subplots_adjust(left=0.16, right=0.94, top=0.95, bottom=0.06)
+	fig.savefig(path, format=fmt, facecolor=fig.get_facecolor())
+	return str(path)
+
+
+def _render_one(args):
+	return render_report(*args)
+
+
+def generate_reports(period="week", count=4, out_dir=".", fmt="png", end=None, workers=None, dpi=110):
+	"""Write one report per period into `out_dir`. Returns the list of paths, oldest first."""
+	if fmt not in ("png", "pdf"):
+		raise ValueError(f"unsupported report format: {fmt!r}")
+	out_dir = Path(out_dir)
+	out_dir.mkdir(parents=True, exist_ok=True)
+	jobs = build_jobs(period, count, end)
+	tasks = [(job, out_dir / f"report-{job['period']}-{job['key']}.{fmt}", fmt, dpi) for job in jobs]
+	workers = workers or os.cpu_count() or 1
+	if workers == 1 or len(tasks) == 1:
+		return [_render_one(t) for t in tasks]
+	with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+		# a few pages per task keeps per-task pickling overhead small
+		return list(pool.map(_render_one, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def render_group_report(group, path, fmt="png", dpi=110, top=15):
+	"""One page of combined stats for a group_service.GroupStats: totals, timeline, subjects, leaderboard."""
+	from matplotlib.backends.backend_agg import FigureCanvasAgg
+	from matplotlib.figure import Figure
+	from FrontEnd import charts
+
+	days = group.days()
+	# long ranges are shown per week (Monday start) to keep the bars readable
+	if len(days) > 62:
+		weeks = {}
+		for d, sec in zip(days, group.daily):
+			monday = d - datetime.timedelta(days=d.weekday())
+			weeks[monday] = weeks.get(monday, 0) + int(sec)
+		x = [f"{d:%b %d}" for d in weeks]
+		y = [sec / 3600 for sec in weeks.values()]
+		xlabel = "Week"
+	else:
+		x = [f"{d:%d}" for d in days]
+		y = [int(sec) / 3600 for sec in group.daily]
+		xlabel = "Day"
+	total = group.total_seconds()
+	leaders = [
+		{"subject": m["name"], "total_sec": m["total_sec"], "share": m["total_sec"] / total if total else 0.0}
+		for m in group.leaderboard("total_sec", top)
+	]
+	busiest = int(group.active.argmax()) if len(group.active) else 0
+
+	fig = Figure(figsize=(PAGE_SIZE[0], PAGE_SIZE[1] * 1.3), dpi=dpi)
+	FigureCanvasAgg(fig)
+	fig.patch.set_facecolor('white')
+	grid = fig.add_gridspec(4, 1, height_ratios=[0.9, 2.0, 2.0, 2.4], hspace=0.5)
+	head = fig.add_subplot(grid[0])
+	head.set_axis_off()
+	head.text(0, 0.95, "Group Study Report", fontsize=20, fontweight='bold', color='#1E3A56', va='top')
+	head.text(0, 0.62, f"{group.first:%b %d, %Y} - {group.last:%b %d, %Y}", fontsize=13, color='#1E3A56', va='top')
+	cards = [
+		("Members", str(len(group.members))),
+		("Total", f"{total / 3600:.0f}h"),
+		("Per member", f"{total / 3600 / max(1, len(group.members)):.1f}h"),
+		("Most active day", f"{days[busiest]:%b %d} ({int(group.active[busiest])})" if days else "-"),
+	]
+	for i, (label, value) in enumerate(cards):
+		head.text(i * 0.26, 0.32, label, fontsize=9, color='#5A7184', va='top')
+		head.text(i * 0.26, 0.18, value, fontsize=15, fontweight='bold', color='#1E3A56', va='top')
+	# group hours run to thousands: value labels only fit a short timeline
+	charts.plot_daily_bars(fig.add_subplot(grid[1]), x, y, xlabel,
+		rotate_labels=len(x) > 15, value_labels=len(x) <= 16)
+	charts.plot_subject_bars(fig.add_subplot(grid[2]), group.subject_rows(), None)
+	charts.plot_subject_bars(fig.add_subplot(grid[3]), leaders, None, title=f"Top {len(leaders)} Members")
+	fig.subplots_adjust(left=0.2, right=0.94, top=0.96, bottom=0.05)
+	fig.savefig(path, format=fmt, facecolor=fig.get_facecolor())
+	return str(path)
+
+
+def _count_arg(text):
+	count = int(text)
+	if count < 1:
+		raise argparse.ArgumentTypeError("must be at least 1")
+	return count
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Render weekly or monthly study reports.")
+	parser.add_argument("--period", choices=PERIODS, default="week")
+	parser.add_argument("--count", type=_count_arg, default=4, help="number of periods, ending with the current one")
+	parser.add_argument("--end", type=datetime.date.fromisoformat, help="a date in the last period (YYYY-MM-DD)")
+	parser.add_argument("--format", choices=("png", "pdf"), default="png")
+	parser.add_argument("--out", default="reports", help="output directory")
+	parser.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+	parser.add_argument("--dpi", type=int, default=110)
+	args = parser.parse_args()
+	t0 = time.perf_counter()
+	paths = generate_reports(args.period, args.count, args.out, args.format, args.end, args.workers, args.dpi)
+	print(f"Wrote {len(paths)} reports to {args.out} in {time.perf_counter() - t0:.1f} s")
@@ -0,0 +1,73 @@
+"""
+Single-instance guard for the app.
+
+The first launch takes a lock file next to study.db and listens on a local
+socket. A later launch fails to take the lock, sends "activate" over the
+socket so the running window comes to the front, and exits, so only one
+process ever runs timers against the database.
+"""
+
+import hashlib
+from PySide6.QtCore import QLockFile, QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from BackEnd.core.paths import app_lock_path, user_data_dir
+
+ACTIVATE = b"activate"
+
+
+def _server_name():
+	# one name per data directory, so separate profiles don't collide
+	digest = hashlib.sha1(str(user_data_dir()).encode("utf-8")).hexdigest()[:12]
+	return f"StudyTracker-{digest}"
+
+
+class SingleInstance(QObject):
+	"""Owns the instance lock; emits `activated` when another launch forwards to us."""
+
+	activated = Signal()
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self._name = _server_name()
+		self._lock = QLockFile(str(app_lock_path()))
+		# a lock left by a crashed process is detected by PID and taken over
+		self._lock.setStaleLockTime(0)
+		self._server = None
+		self.primary = self._lock.tryLock(100)
+		if self.primary:
+			self._listen()
+
+	def _listen(self):
+		# a socket file left by a crash would make listen() fail on Unix
+		QLocalServer.removeServer(self._name)
+		self._server = QLocalServer(self)
+		self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+		self._server.newConnection.connect(self._on_connection)
+		self._server.listen(self._name)
+
+	def _on_connection(self):
+		while self._server.hasPendingConnections():
+			sock = self._server.nextPendingConnection()
+			sock.readyRead.connect(lambda s=sock: self._on_message(s))
+			sock.disconnected.connect(sock.deleteLater)
+
+	def _on_message(self, sock):
+		if bytes(sock.readAll()).strip() == ACTIVATE:
+			self.activated.emit()
+
+	def forward(self, timeout_ms=1000):
+		"""Ask the primary instance to show its window. Returns True if it was reached."""
+		sock = QLocalSocket()
+		sock.connectToServer(self._name)
+		if not sock.waitForConnected(timeout_ms):
+			return False
+		sock.write(ACTIVATE + b"\n")
+		ok = sock.waitForBytesWritten(timeout_ms)
+		sock.disconnectFromServer()
+		return ok
+
+	def release(self):
+		if self._server is not None:
+			self._server.close()
+		if self.primary:
+			self._lock.unlock()
@@ -2,22 +2,58 @@ from PySide6.QtWidgets import (
 	QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget,
 	QStackedWidget, QListWidgetItem, QTableWidget, QTableWidgetItem, QSizePolicy, QComboBox
 )
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 import datetime
-from PySide6.QtCore import Qt
+import threading
+from PySide6.QtCore import Qt, Signal
 from BackEnd.services.timer_service import TimerService
-from BackEnd.repos import session_repo
-from BackEnd.core.clock import fmt_hms
+from BackEnd.services.analytics_service import SessionAnalytics, day_date, day_number
+from BackEnd.services.goal_service import GoalTracker
+from BackEnd.services.pomodoro_service import PomodoroCycle
+from BackEnd.repos import day_cache_repo, session_repo
+from BackEnd.core.clock import fmt_hms, local_today
 from FrontEnd.styles.design_tokens import COLORS, FONTS
 from FrontEnd.resource_helper import resource_path
+from FrontEnd import charts
+from FrontEnd.components.perf_overlay import PerfMonitor, PerfOverlay
+from FrontEnd.components.chart_view import ChartView
+from FrontEnd.components.goal_progress import GoalProgressPanel, GoalDialog
+from FrontEnd.refresh_bus import RefreshBus
+
+
+def _utc_text(ts):
+	"""Epoch seconds -> stored ISO8601 UTC text ('' for None)."""
+	if ts is None:
+		return ""
+	return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat()
+
+
+# Raw Data column -> session_repo.SORT_KEYS name (Match is not sortable)
+_RAW_SORT_COLUMNS = {0: "date", 1: "start", 2: "end", 3: "duration", 4: "subject", 5: "source"}
 
 
 class MainWindow(QMainWindow):
+	# emitted (from a worker thread) once the day cache is open and the
+	# initial analytics load finished
+	analytics_loaded = Signal()
+
 	def __init__(self):
 		super().__init__()
 		self.setWindowTitle("Study Tracker")
 		self.resize(1000, 650)
+		# in-memory columnar history used by stats and charts (refreshed incrementally)
+		self.analytics = SessionAnalytics()
+		# per-day totals memory-mapped from study.days; session writes update it in
+		# place. Opened (and checked against study.db) by the background load; the
+		# views that read it keep the snapshot until then.
+		self.day_cache = None
+		# stats/charts/labels redraw in one coalesced idle pass after data changes
+		self.refresh_bus = RefreshBus(fetch=self._fetch_analytics, parent=self)
+		# goal progress: cached completed totals + live timer elapsed
+		self.goals = GoalTracker()
+		# latency probes for the developer overlay (Ctrl+Shift+P)
+		self.perf_monitor = PerfMonitor(self)
+		self.perf_monitor.start()
+		self.perf_overlay = None
 
 		# Apply QSS stylesheet for the new design system
 		qss_path = resource_path("FrontEnd/styles/studytracker.qss")
@@ -133,7 +169,22 @@ class MainWindow(QMainWindow):
 		container.setLayout(main_layout)
 		self.setCentralWidget(container)
 
+		# Paint last session's dashboard values right away; the live numbers
+		# replace them once the history has been loaded in the background.
+		self._paint_dashboard_snapshot()
+		self.analytics_loaded.connect(self._on_analytics_loaded)
+		self.refresh_bus.register("goals", self._update_goal_progress)
+		self.refresh_bus.mark_dirty("goals")
+		threading.Thread(target=self._load_analytics, name="analytics-load", daemon=True).start()
+
+		# daily online backup of study.db, taken off the GUI thread
+		from BackEnd.services.backup_service import BackupScheduler
+		self.backups = BackupScheduler()
+		self.backups.start()
+
 		self.sidebar.currentRowChanged.connect(self.stack.setCurrentIndex)
+		# views that went stale while hidden are redrawn when their page is shown
+		self.stack.currentChanged.connect(lambda i: self.refresh_bus.schedule())
 		self.menu_btn.clicked.connect(self._toggle_sidebar)
 
 		# Make the menu button a fixed-position child so it stays anchored
@@ -163,6 +214,14 @@ class MainWindow(QMainWindow):
 		# start hidden
 		self._sidebar_opacity.setOpacity(0.0)
 
+		from PySide6.QtGui import QShortcut, QKeySequence
+		QShortcut(QKeySequence("Ctrl+Shift+P"), self, activated=self._toggle_perf_overlay)
+
+	def _toggle_perf_overlay(self):
+		if self.perf_overlay is None:
+			self.perf_overlay = PerfOverlay(self)
+		self.perf_overlay.setVisible(not self.perf_overlay.isVisible())
+
 	def closeEvent(self, event):
 		# On close: detect running or paused timers (main timer and pomodoro),
 		# persist their elapsed seconds to the DB and mark sessions stopped so
@@ -184,11 +243,12 @@ class MainWindow(QMainWindow):
 							svc.pause_resume()
 						except Exception:
 							pass
-					# Persist elapsed and stop session (if any)
+					# Persist elapsed and stop session (if any); force_end() also
+					# stores segments left pending by a failed write and journals STOP
 					if sid is not None:
 						try:
 							session_repo.update_elapsed(sid, elapsed)
-							session_repo.stop_session(sid)
+							svc.force_end()
 						except Exception:
 							pass
 					else:
@@ -205,7 +265,7 @@ class MainWindow(QMainWindow):
 			# ---- Pomodoro handling ----
 			try:
 				p_sid = getattr(self, 'pomo_session_id', None)
-				p_elapsed = int(getattr(self, 'pomo_elapsed', 0) or 0)
+				p_elapsed = int(getattr(self, 'pomo_session_elapsed', 0) or 0)
 				# If there's an open pomodoro DB session, persist and stop it
 				if p_sid is not None:
 					try:
@@ -218,6 +278,9 @@ class MainWindow(QMainWindow):
 		except Exception:
 			# If the repo import or DB ops fail, don't block closing
 			pass
+		if getattr(self, 'backups', None) is not None:
+			# let a backup in progress finish instead of leaving a temp copy
+			self.backups.stop(timeout=5)
 		# Save Pomodoro UI snapshot for informational display on next start
 		try:
 			if hasattr(self, '_save_pomodoro_state'):
@@ -226,6 +289,80 @@ class MainWindow(QMainWindow):
 			pass
 		super().closeEvent(event)
 
+	def _load_analytics(self):
+		# runs on a worker thread; views wait for analytics_loaded instead of blocking on it
+		try:
+			day_cache_repo.shared()
+		except Exception:
+			pass
+		try:
+			self.analytics.refresh()
+		except Exception:
+			pass
+		self.analytics_loaded.emit()
+
+	def _on_analytics_loaded(self):
+		try:
+			self.day_cache = day_cache_repo.shared()
+		except Exception:
+			return
+		self.refresh_bus.mark_dirty("chart", "stats", "today")
+
+	def _dashboard_snapshot_path(self):
+		from BackEnd.core.paths import user_data_dir
+		return user_data_dir() / "dashboard_snapshot.json"
+
+	def _save_dashboard_snapshot(self, **parts):
+		"""Merge `parts` (stats / chart) into the persisted dashboard snapshot."""
+		import json
+		import os
+		snapshot = getattr(self, '_dashboard_snapshot', None) or {}
+		snapshot.update(parts)
+		self._dashboard_snapshot = snapshot
+		path = self._dashboard_snapshot_path()
+		try:
+			tmp = path.with_suffix(".tmp")
+			with open(tmp, 'w', encoding='utf-8') as f:
+				json.dump(snapshot, f)
+			os.replace(tmp, path)
+		except Exception:
+			pass
+
+	def _load_dashboard_snapshot(self):
+		import json
+		path = self._dashboard_snapshot_path()
+		if not path.exists():
+			return None
+		try:
+			with open(path, 'r', encoding='utf-8') as f:
+				return json.load(f)
+		except Exception:
+			return None
+
+	def _paint_dashboard_snapshot(self):
+		"""Show the stats and current-period chart saved by the last run."""
+		snapshot = self._load_dashboard_snapshot()
+		if not snapshot:
+			return
+		self._dashboard_snapshot = snapshot
+		stats = snapshot.get("stats")
+		if stats:
+			self.streak_value_label.setText(str(stats.get("streak", 0)))
+			self.total_days_value_label.setText(str(stats.get("total_days", 0)))
+			self.total_hours_value_label.setText(f"{stats.get('total_hours', 0.0):.1f}h")
+			self.focus_value_label.setText(f"{stats.get('focus', 1.0):.0%}")
+		chart = snapshot.get("chart")
+		today = local_today().isoformat()
+		# only while the saved period is still the current one for the selected timeframe
+		if (chart and chart.get("timeframe") == self.timeframe_combo.currentText().lower()
+				and self.history_view_combo.currentText() == "Daily Totals"
+				and chart.get("start", "") <= today <= chart.get("end", "")):
+			x = chart["x"]
+			self.chart_view.render(charts.draw_daily_bars, x, chart["y"], chart["xlabel"],
+				rotate_labels=(chart["timeframe"] != "week" and len(x) > 15))
+			self.hist_period_label.setText(chart.get("label", ""))
+			self.hist_next_btn.setEnabled(False)
+
 	def _pomodoro_state_path(self):
 		from BackEnd.core.paths import user_data_dir
 		return user_data_dir() / "pomodoro_state.json"
@@ -240,6 +377,7 @@ class MainWindow(QMainWindow):
 			"pomo_cycle_count": getattr(self, 'pomo_cycle_count', 0),
 			"pomo_running": bool(getattr(self, 'pomo_running', False)),
 			"pomo_session_id": getattr(self, 'pomo_session_id', None),
+			"pomo_session_elapsed": getattr(self, 'pomo_session_elapsed', 0),
 			"pomo_target": getattr(self, 'pomo_target', None),
 		}
 		try:
@@ -272,6 +410,7 @@ class MainWindow(QMainWindow):
 		self.pomo_elapsed = int(state.get('pomo_elapsed', 0) or 0)
 		self.pomo_cycle_count = int(state.get('pomo_cycle_count', 0) or 0)
 		self.pomo_session_id = state.get('pomo_session_id')
+		self.pomo_session_elapsed = int(state.get('pomo_session_elapsed', 0) or 0)
 		# determine target for phase
 		if self.pomo_phase == 'study':
 			self.pomo_target = self.POMO_STUDY_SEC
@@ -405,6 +544,11 @@ class MainWindow(QMainWindow):
 		self.timer_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 		timer_card_layout.addWidget(self.timer_label)
 
+		# Subject picker (editable: pick a recent subject or type a new one)
+		self.subject_combo = self._make_subject_combo()
+		timer_card_layout.addSpacing(12)
+		timer_card_layout.addWidget(self.subject_combo, alignment=Qt.AlignmentFlag.AlignHCenter)
+
 		# Buttons row
 		btn_layout = QHBoxLayout()
 		btn_layout.setSpacing(24)
@@ -419,6 +563,10 @@ class MainWindow(QMainWindow):
 		timer_card_layout.addLayout(btn_layout)
 
 		outer.addWidget(timer_card, alignment=Qt.AlignmentFlag.AlignHCenter)
+		outer.addSpacing(24)
+		self.timer_goals = GoalProgressPanel()
+		self.timer_goals.setFixedWidth(420)
+		outer.addWidget(self.timer_goals, alignment=Qt.AlignmentFlag.AlignHCenter)
 		outer.addStretch()
 
 		# Removed Today footer for a minimal Timer page (layout remains centered)
@@ -428,8 +576,11 @@ class MainWindow(QMainWindow):
 		# Timer logic
 		self.timer_service = TimerService()
 		self.timer_service.tick.connect(self._on_tick)
+		self.timer_service.tick.connect(self.perf_monitor.watch_ticks("timer"))
+		self.timer_service.state_changed.connect(lambda _s: self.perf_monitor.reset_ticks("timer"))
 		self.timer_service.state_changed.connect(self._on_state)
-		self._update_today_label()
+		self.refresh_bus.register("today", self._update_today_label)
+		self.refresh_bus.mark_dirty("today")
 
 		self.start_pause_btn.clicked.connect(self._start_pause)
 		self.end_btn.clicked.connect(self._end)
@@ -442,6 +593,28 @@ class MainWindow(QMainWindow):
 
 		return w
 
+	def _make_subject_combo(self):
+		combo = QComboBox()
+		combo.setEditable(True)
+		combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+		combo.setMinimumWidth(240)
+		combo.lineEdit().setPlaceholderText("Subject (optional)")
+		try:
+			combo.addItems(session_repo.list_subjects())
+		except Exception:
+			pass
+		combo.setCurrentIndex(-1)
+		return combo
+
+	def _selected_subject(self, combo):
+		"""Return the trimmed subject text and remember it in both subject pickers."""
+		subject = combo.currentText().strip()
+		if subject:
+			for c in (getattr(self, 'subject_combo', None), getattr(self, 'pomo_subject_combo', None)):
+				if c is not None and c.findText(subject) < 0:
+					c.insertItem(0, subject)
+		return subject
+
 	def _build_history_tab(self):
 		w = QWidget()
 		layout = QVBoxLayout()
@@ -501,12 +674,43 @@ class MainWindow(QMainWindow):
 		hours_layout.addWidget(self.total_hours_value_label)
 		hours_layout.addWidget(hours_title)
 		hours_card.setLayout(hours_layout)
+
+		# Focus Ratio card (studied time / wall-clock time incl. pauses)
+		focus_card = QWidget()
+		focus_card.setObjectName("SummaryCard")
+		focus_layout = QVBoxLayout()
+		focus_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+		focus_layout.setSpacing(8)
+		self.focus_value_label = QLabel("100%")
+		self.focus_value_label.setObjectName("SummaryValue")
+		self.focus_value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+		focus_title = QLabel("Focus Ratio")
+		focus_title.setObjectName("SummaryTitle")
+		focus_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+		focus_layout.addWidget(self.focus_value_label)
+		focus_layout.addWidget(focus_title)
+		focus_card.setLayout(focus_layout)
 		
 		summary_layout.addWidget(streak_card)
 		summary_layout.addWidget(total_card)
 		summary_layout.addWidget(hours_card)
+		summary_layout.addWidget(focus_card)
 		summary_layout.addStretch()
 		layout.addLayout(summary_layout)
+		layout.addSpacing(16)
+
+		# Goal progress with an editor button
+		goals_layout = QHBoxLayout()
+		goals_layout.setContentsMargins(70, 0, 0, 0)
+		self.history_goals = GoalProgressPanel()
+		self.history_goals.setMaximumWidth(640)
+		goals_layout.addWidget(self.history_goals, 1)
+		from PySide6.QtWidgets import QPushButton
+		goals_btn = QPushButton("Edit Goals")
+		goals_btn.clicked.connect(self._edit_goals)
+		goals_layout.addWidget(goals_btn, alignment=Qt.AlignmentFlag.AlignTop)
+		goals_layout.addStretch()
+		layout.addLayout(goals_layout)
 		layout.addSpacing(24)
 
 		# Time frame selector - place it at the right side for better balance.
@@ -515,10 +719,15 @@ class MainWindow(QMainWindow):
 		timeframe_layout.addStretch()
 		timeframe_label = QLabel("Show study time for:")
 		self.timeframe_combo = QComboBox()
-		self.timeframe_combo.addItems(["Week", "Month"])
+		self.timeframe_combo.addItems(["Week", "Month", "Quarter", "Year", "All Time", "Year Heatmap"])
 		self.timeframe_combo.setCurrentIndex(0)  # Default to Week
 		self.timeframe_combo.setMinimumWidth(140)
+		self.history_view_combo = QComboBox()
+		self.history_view_combo.addItems(["Daily Totals", "By Subject"])
+		self.history_view_combo.setMinimumWidth(160)
 		# Add widgets (label first, then combo) so they appear right-aligned.
+		timeframe_layout.addWidget(self.history_view_combo)
+		timeframe_layout.addSpacing(16)
 		timeframe_layout.addWidget(timeframe_label)
 		timeframe_layout.addWidget(self.timeframe_combo)
 		# Prev/Next controls will sit in a centered pill below the combo
@@ -541,10 +750,10 @@ class MainWindow(QMainWindow):
 		graph_container.setObjectName("GraphContainer")
 		graph_layout = QVBoxLayout()
 		graph_layout.setContentsMargins(16, 16, 16, 16)  # Add padding around graph
-		self.figure = Figure(figsize=(10, 5))
-		self.canvas = FigureCanvas(self.figure)
-		self.canvas.setMinimumHeight(400)  # Ensure adequate height
-		graph_layout.addWidget(self.canvas)
+		# charts are rasterized on a worker thread and shown as an image
+		self.chart_view = ChartView()
+		self.chart_view.setMinimumHeight(400)  # Ensure adequate height
+		graph_layout.addWidget(self.chart_view)
 		graph_container.setLayout(graph_layout)
 		layout.addWidget(graph_container)
 		
@@ -558,6 +767,7 @@ class MainWindow(QMainWindow):
 			self._update_bar_chart()
 
 		self.timeframe_combo.currentIndexChanged.connect(_on_timeframe_changed)
+		self.history_view_combo.currentIndexChanged.connect(lambda i: self._update_bar_chart())
 		self.hist_prev_btn.clicked.connect(lambda: (setattr(self, 'history_offset', self.history_offset + 1), self._update_bar_chart()))
 		self.hist_next_btn.clicked.connect(lambda: (setattr(self, 'history_offset', max(0, self.history_offset - 1)), self._update_bar_chart()))
 
@@ -579,11 +789,10 @@ class MainWindow(QMainWindow):
 		nav_row.addStretch()
 		layout.addLayout(nav_row)
 
-		# populate initial view
+		# populated from the dashboard snapshot, then live once analytics_loaded fires
 		self.history_offset = 0
-		self._refresh_history()
-		self._update_bar_chart()
-		self._update_summary_stats()
+		self.refresh_bus.register("chart", self._update_bar_chart, w)
+		self.refresh_bus.register("stats", self._update_summary_stats, w)
 		return w
 
 	def _build_raw_data_tab(self):
@@ -593,12 +802,18 @@ class MainWindow(QMainWindow):
 		layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 		layout.setContentsMargins(32, 32, 32, 32)
 
-		# Time frame selector - place it at the right side
+		# Search box on the left, time frame selector on the right
+		from PySide6.QtWidgets import QLineEdit
 		timeframe_layout = QHBoxLayout()
+		self.raw_search_edit = QLineEdit()
+		self.raw_search_edit.setPlaceholderText("Search subjects and notes…")
+		self.raw_search_edit.setClearButtonEnabled(True)
+		self.raw_search_edit.setMinimumWidth(240)
+		timeframe_layout.addWidget(self.raw_search_edit)
 		timeframe_layout.addStretch()
 		timeframe_label = QLabel("Show study time for:")
 		self.raw_timeframe_combo = QComboBox()
-		self.raw_timeframe_combo.addItems(["Week", "Month"])
+		self.raw_timeframe_combo.addItems(["Week", "Month", "All Time"])
 		self.raw_timeframe_combo.setCurrentIndex(0)  # Default to Week
 		self.raw_timeframe_combo.setMinimumWidth(140)
 		timeframe_layout.addWidget(timeframe_label)
@@ -636,15 +851,50 @@ class MainWindow(QMainWindow):
 		nav_row.addStretch()
 		layout.addLayout(nav_row)
 
+		# Filters; applied in SQL together with the sort column
+		from PySide6.QtWidgets import QSpinBox
+		self.raw_filter_bar = QWidget()
+		filter_layout = QHBoxLayout()
+		filter_layout.setContentsMargins(0, 0, 0, 0)
+		self.raw_filter_bar.setLayout(filter_layout)
+		self.raw_source_combo = QComboBox()
+		self.raw_source_combo.addItem("All sources", None)
+		self.raw_source_combo.addItem("Timer", "timer")
+		self.raw_source_combo.addItem("Pomodoro", "pomodoro")
+		self.raw_subject_combo = QComboBox()
+		self.raw_subject_combo.setMinimumWidth(160)
+		self.raw_min_dur_spin = QSpinBox()
+		self.raw_max_dur_spin = QSpinBox()
+		for spin in (self.raw_min_dur_spin, self.raw_max_dur_spin):
+			spin.setRange(0, 24 * 60)
+			spin.setSingleStep(5)
+			spin.setSuffix(" min")
+			spin.setSpecialValueText("Any")  # 0 == no limit
+		filter_layout.addWidget(self.raw_source_combo)
+		filter_layout.addWidget(self.raw_subject_combo)
+		filter_layout.addStretch()
+		filter_layout.addWidget(QLabel("Duration:"))
+		filter_layout.addWidget(self.raw_min_dur_spin)
+		filter_layout.addWidget(QLabel("to"))
+		filter_layout.addWidget(self.raw_max_dur_spin)
+		layout.addWidget(self.raw_filter_bar)
+
 		# Data table
 		self.raw_data_table = QTableWidget()
-		self.raw_data_table.setColumnCount(6)
+		self.raw_data_table.setColumnCount(7)
 		self.raw_data_table.setHorizontalHeaderLabels([
-			"Date", "Start (UTC)", "End (UTC)", "Duration", "Subject", "Source"
+			"Date", "Start (UTC)", "End (UTC)", "Duration", "Subject", "Source", "Match"
 		])
+		# matched text is only shown while searching
+		self.raw_data_table.setColumnHidden(6, True)
 		self.raw_data_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
 		self.raw_data_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
 		self.raw_data_table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+		# header clicks re-query sorted in SQL; the table itself never sorts
+		header = self.raw_data_table.horizontalHeader()
+		header.setSectionsClickable(True)
+		header.setSortIndicatorShown(True)
+		header.setSortIndicator(1, Qt.SortOrder.DescendingOrder)
 		layout.addWidget(self.raw_data_table)
 		w.setLayout(layout)
 		
@@ -659,10 +909,30 @@ class MainWindow(QMainWindow):
 		self.raw_timeframe_combo.currentIndexChanged.connect(_on_raw_timeframe_changed)
 		self.raw_prev_btn.clicked.connect(lambda: (setattr(self, 'raw_data_offset', self.raw_data_offset + 1), self._update_raw_data()))
 		self.raw_next_btn.clicked.connect(lambda: (setattr(self, 'raw_data_offset', max(0, self.raw_data_offset - 1)), self._update_raw_data()))
-
-		# populate initial view
+		self.raw_source_combo.currentIndexChanged.connect(lambda _: self._update_raw_data())
+		self.raw_subject_combo.currentIndexChanged.connect(lambda _: self._update_raw_data())
+		self.raw_min_dur_spin.valueChanged.connect(lambda _: self._update_raw_data())
+		self.raw_max_dur_spin.valueChanged.connect(lambda _: self._update_raw_data())
+		header.sortIndicatorChanged.connect(lambda *_: self._update_raw_data())
+		# further pages are fetched as the table is scrolled to the bottom
+		self._raw_next_key = None
+		self._raw_query = {}
+		self.raw_data_table.verticalScrollBar().valueChanged.connect(self._on_raw_scrolled)
+
+		# search runs once typing pauses; results replace the period view
+		from PySide6.QtCore import QTimer
+		self._raw_search_gen = 0
+		self._raw_search_batches = None
+		self._raw_search_timer = QTimer(self)
+		self._raw_search_timer.setSingleShot(True)
+		self._raw_search_timer.setInterval(200)
+		self._raw_search_timer.timeout.connect(self._run_raw_search)
+		self.raw_search_edit.textChanged.connect(lambda _: self._raw_search_timer.start())
+
+		# populate when first shown
 		self.raw_data_offset = 0
-		self._update_raw_data()
+		self.refresh_bus.register("raw", self._update_raw_data, w)
+		self.refresh_bus.mark_dirty("raw")
 		return w
 
 	def _build_pomodoro_tab(self):
@@ -689,6 +959,10 @@ class MainWindow(QMainWindow):
 		self.pomo_timer_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 		p_layout.addWidget(self.pomo_timer_label)
 
+		self.pomo_subject_combo = self._make_subject_combo()
+		p_layout.addSpacing(12)
+		p_layout.addWidget(self.pomo_subject_combo, alignment=Qt.AlignmentFlag.AlignHCenter)
+
 		# Buttons row: Start/Pause centered, Skip on right
 		controls = QHBoxLayout()
 		controls.setSpacing(24)
@@ -737,11 +1011,12 @@ class MainWindow(QMainWindow):
 
 		w.setLayout(outer)
 
-		# Pomodoro parameters (adjustable variables)
-		self.POMO_STUDY_SEC = 25 * 60
-		self.POMO_SHORT_BREAK_SEC = 5 * 60
-		self.POMO_LONG_BREAK_SEC = 15 * 60
-		self.POMO_CYCLES = 4
+		# Pomodoro parameters (adjustable in PomodoroCycle)
+		self.pomo_cycle = PomodoroCycle()
+		self.POMO_STUDY_SEC = self.pomo_cycle.study_sec
+		self.POMO_SHORT_BREAK_SEC = self.pomo_cycle.short_break_sec
+		self.POMO_LONG_BREAK_SEC = self.pomo_cycle.long_break_sec
+		self.POMO_CYCLES = self.pomo_cycle.cycles
 
 		# Runtime state
 		self.pomo_phase = 'study'  # 'study' or 'break'
@@ -749,11 +1024,16 @@ class MainWindow(QMainWindow):
 		self.pomo_elapsed = 0
 		self.pomo_running = False
 		self.pomo_session_id = None
+		# seconds ticked since pomo_session_id was opened; pomo_elapsed spans the
+		# whole phase, whose earlier parts may already be saved sessions after a pause
+		self.pomo_session_elapsed = 0
 
 		from PySide6.QtCore import QTimer
 		self.pomo_timer = QTimer(self)
 		self.pomo_timer.setInterval(1000)
 		self.pomo_timer.timeout.connect(self._pomo_tick)
+		# jitter is measured between ticks of one run; _pomo_timer_start() resets it
+		self.pomo_timer.timeout.connect(self.perf_monitor.watch_ticks("pomodoro"))
 
 		self.pomo_start_btn.clicked.connect(self._pomo_start_pause)
 		self.pomo_skip_btn.clicked.connect(self._pomo_skip)
@@ -1122,6 +1402,11 @@ class MainWindow(QMainWindow):
 			pass
 
 
+	def _pomo_timer_start(self):
+		# the first tick after a start/resume has no predecessor in this run
+		self.perf_monitor.reset_ticks("pomodoro")
+		self.pomo_timer.start()
+
 	def _pomo_start_pause(self):
 		if not self.pomo_running:
 			# start or resume
@@ -1129,8 +1414,8 @@ class MainWindow(QMainWindow):
 			self.pomo_start_btn.setText('Pause')
 			# if starting a study session, open DB session
 			if self.pomo_phase == 'study' and self.pomo_session_id is None:
-				self.pomo_session_id = session_repo.start_session(source='pomodoro')
-			self.pomo_timer.start()
+				self._pomo_open_session()
+			self._pomo_timer_start()
 		else:
 			# pause
 			self.pomo_running = False
@@ -1143,12 +1428,7 @@ class MainWindow(QMainWindow):
 				except Exception:
 					pass
 				self.pomo_session_id = None
-				# update UI and graphs
-				self._update_today_label()
-				self._update_summary_stats()
-				self._refresh_history()
-				if hasattr(self, '_update_bar_chart'):
-					self._update_bar_chart()
+				self._sessions_changed()
 
 	def _pomo_skip(self):
 		# Skip to next phase immediately
@@ -1162,25 +1442,15 @@ class MainWindow(QMainWindow):
 			except Exception:
 				pass
 			self.pomo_session_id = None
-			# update UI and graphs
-			self._update_today_label()
-			self._update_summary_stats()
-			self._refresh_history()
-			if hasattr(self, '_update_bar_chart'):
-				self._update_bar_chart()
+			self._sessions_changed()
 		# Advance to next phase
-		if self.pomo_phase == 'study':
-			self.pomo_cycle_count += 1
-			# decide break length
-			if self.pomo_cycle_count % self.POMO_CYCLES == 0:
-				self._pomo_enter_phase('break', long=True)
-			else:
-				self._pomo_enter_phase('break', long=False)
-		else:
-			self._pomo_enter_phase('study')
+		self._pomo_advance()
 
 	def _pomo_tick(self):
 		self.pomo_elapsed += 1
+		if self.pomo_session_id is not None:
+			self.pomo_session_elapsed += 1
+			self._update_goal_progress()
 		remaining = self._pomo_current_duration() - self.pomo_elapsed
 		if remaining < 0:
 			# phase finished
@@ -1192,27 +1462,24 @@ class MainWindow(QMainWindow):
 					except Exception:
 						pass
 					self.pomo_session_id = None
-					# update UI and graphs
-					self._update_today_label()
-					self._update_summary_stats()
-					self._refresh_history()
-					if hasattr(self, '_update_bar_chart'):
-						self._update_bar_chart()
-				self.pomo_cycle_count += 1
-				# auto-enter break
-				if self.pomo_cycle_count % self.POMO_CYCLES == 0:
-					self._pomo_enter_phase('break', long=True)
-				else:
-					self._pomo_enter_phase('break', long=False)
-			else:
-				# break finished -> start next study
-				self._pomo_enter_phase('study')
+					self._sessions_changed()
+			# auto-enter the next phase (break after study, study after break)
+			self._pomo_advance()
 		else:
 			# update label
 			mins = remaining // 60
 			secs = remaining % 60
 			self.pomo_timer_label.setText(f"{mins:02d}:{secs:02d}")
 
+	def _pomo_advance(self, autostart=True):
+		phase, self.pomo_cycle_count, long = self.pomo_cycle.next_phase(self.pomo_phase, self.pomo_cycle_count)
+		self._pomo_enter_phase(phase, long=long, autostart=autostart)
+
+	def _pomo_open_session(self):
+		self.pomo_subject = self._selected_subject(self.pomo_subject_combo)
+		self.pomo_session_id = session_repo.start_session(subject=self.pomo_subject, source='pomodoro')
+		self.pomo_session_elapsed = 0
+
 	def _pomo_current_duration(self):
 		if self.pomo_phase == 'study':
 			return self.POMO_STUDY_SEC
@@ -1264,12 +1531,7 @@ class MainWindow(QMainWindow):
 					except Exception:
 						pass
 					self.pomo_session_id = None
-					# update graphs/UI
-					self._update_today_label()
-					self._update_summary_stats()
-					self._refresh_history()
-					if hasattr(self, '_update_bar_chart'):
-						self._update_bar_chart()
+					self._sessions_changed()
 			except Exception:
 				pass
 			# Reset cycle count
@@ -1295,7 +1557,7 @@ class MainWindow(QMainWindow):
 			# prepare DB session (only start when user presses start)
 			self.pomo_session_id = None
 		else:
-			self.pomo_target = self.POMO_LONG_BREAK_SEC if long else self.POMO_SHORT_BREAK_SEC
+			self.pomo_target = self.pomo_cycle.duration('break', long)
 			self.pomo_timer_label.setText(f"{self.pomo_target//60:02d}:00")
 
 		# Update phase label (includes cycle number). Do this after we set
@@ -1312,50 +1574,69 @@ class MainWindow(QMainWindow):
 			self.pomo_start_btn.setText('Pause')
 			if phase == 'study':
 				# start a DB session immediately for accurate study tracking
-				self.pomo_session_id = session_repo.start_session(source='pomodoro')
-			self.pomo_timer.start()
+				self._pomo_open_session()
+			self._pomo_timer_start()
 		else:
 			self.pomo_running = False
 			self.pomo_start_btn.setText('Start')
 
 	def _update_bar_chart(self):
 		import calendar
-		import sqlite3
-		from BackEnd.core.paths import db_path
+		if self.day_cache is None:
+			return
 		tf = self.timeframe_combo.currentText().lower()
-		now = datetime.datetime.now()
-		dbfile = db_path()
-		conn = sqlite3.connect(dbfile)
-		conn.row_factory = sqlite3.Row
+		today = local_today()
 		x = []
 		y = []
 		xlabel = ""
 		# Determine the target period based on history_offset (0 == current)
 		offset = getattr(self, 'history_offset', 0)
-		# No 'Today' option; only handle 'week' and 'month'
-		if tf == "week":
+		# No 'Today' option; handle 'week', 'month' and 'year heatmap'
+		if tf == "year heatmap":
+			year = today.year - offset
+			first = datetime.date(year, 1, 1)
+			last = datetime.date(year, 12, 31)
+			# paging years is just a slice of the mapped per-day totals
+			year_daily = self.day_cache.slice(day_number(first), day_number(last))
+			start_str = first.isoformat()
+			end_str = last.isoformat()
+		elif tf in ("quarter", "year", "all time"):
+			# Long ranges are bucketed in SQL (weeks/months) instead of per-day lists
+			if tf == "quarter":
+				q_index = (today.year * 4 + (today.month - 1) // 3) - offset
+				first = datetime.date(q_index // 4, q_index % 4 * 3 + 1, 1)
+				last = datetime.date(first.year + (first.month + 2) // 12, (first.month + 2) % 12 + 1, 1) - datetime.timedelta(days=1)
+				bucket = "week"
+			elif tf == "year":
+				first = datetime.date(today.year - offset, 1, 1)
+				last = datetime.date(today.year - offset, 12, 31)
+				bucket = "month"
+			else:
+				# same engine refresh as the stats view in this pass
+				first_day = self.refresh_bus.shared_fetch().first_day()
+				first = day_date(first_day) if first_day is not None else today
+				last = today
+				bucket = "month"
+			start_str = first.isoformat()
+			end_str = last.isoformat()
+			bucket, rows = session_repo.bucket_totals(start_str, end_str, bucket)
+			x = [self._bucket_label(b, bucket, tf) for b, _ in rows]
+			y = [sec / 3600 for _, sec in rows]
+			xlabel = bucket.capitalize()
+		elif tf == "week":
 			# Find Monday of target week
-			start_of_week = (now - datetime.timedelta(days=now.weekday())) - datetime.timedelta(weeks=offset)
-			days = [(start_of_week + datetime.timedelta(days=i)).date() for i in range(7)]
+			start_of_week = (today - datetime.timedelta(days=today.weekday())) - datetime.timedelta(weeks=offset)
+			days = [start_of_week + datetime.timedelta(days=i) for i in range(7)]
 			x = [d.strftime("%a") for d in days]
-			y = [0]*7
 			day_strs = [d.isoformat() for d in days]
-			cur = conn.execute(f"""
-				SELECT local_date, SUM(duration_sec) as total_sec
-				FROM sessions
-				WHERE local_date IN ({','.join(['?']*7)}) AND duration_sec IS NOT NULL
-				GROUP BY local_date
-			""", day_strs)
-			totals = {row["local_date"]: row["total_sec"] or 0 for row in cur.fetchall()}
-			for i, d in enumerate(day_strs):
-				y[i] = (totals.get(d, 0) or 0) / 3600
+			y = list(self._daily_hours(days[0], days[-1]))
 			xlabel = "Day of Week"
 			start_str = day_strs[0]
 			end_str = day_strs[-1]
 		else:
 			# Target month/year adjusted by offset months back
-			year = now.year
-			month = now.month - offset
+			year = today.year
+			month = today.month - offset
 			# normalize month/year when month <= 0
 			while month <= 0:
 				month += 12
@@ -1363,73 +1644,20 @@ class MainWindow(QMainWindow):
 			num_days = calendar.monthrange(year, month)[1]
 			days = [datetime.date(year, month, i+1) for i in range(num_days)]
 			x = [str(d.day) for d in days]
-			y = [0]*num_days
 			day_strs = [d.isoformat() for d in days]
-			cur = conn.execute(f"""
-				SELECT local_date, SUM(duration_sec) as total_sec
-				FROM sessions
-				WHERE local_date IN ({','.join(['?']*num_days)}) AND duration_sec IS NOT NULL
-				GROUP BY local_date
-			""", day_strs)
-			totals = {row["local_date"]: row["total_sec"] or 0 for row in cur.fetchall()}
-			for i, d in enumerate(day_strs):
-				y[i] = (totals.get(d, 0) or 0) / 3600
+			y = list(self._daily_hours(days[0], days[-1]))
 			xlabel = "Day of Month"
 			start_str = day_strs[0]
 			end_str = day_strs[-1]
-		conn.close()
-		
-		# Apply modern matplotlib styling
-		import matplotlib.pyplot as plt
-		plt.style.use('seaborn-v0_8-whitegrid')
-		
-		self.figure.clear()
-		# Set figure background to match app theme
-		self.figure.patch.set_facecolor('#E2E8F0')
-		self.figure.patch.set_alpha(0.0)  # Transparent to blend with app
-		
-		ax = self.figure.add_subplot(111)
-		# Set axis background
-		ax.set_facecolor('#F7FAFC')
-		
-		# Modern color palette - gradient blue matching app theme
-		bars = ax.bar(x, y, color='#8FAEC4', edgecolor='#7B9BB0', linewidth=1.5, alpha=0.9)
-		
-		# Add value labels on top of bars for better readability
-		for i, (bar, value) in enumerate(zip(bars, y)):
-			if value > 0:
-				ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.05,
-				       f'{value:.1f}h', ha='center', va='bottom', 
-				       fontsize=9, fontweight='600', color='#1E3A56')
-		
-		# Styling
-		ax.set_ylabel("Hours Studied", fontsize=12, fontweight='600', color='#1E3A56', labelpad=10)
-		ax.set_xlabel(xlabel, fontsize=12, fontweight='600', color='#1E3A56', labelpad=10)
-		ax.set_title(f"Study Time by {xlabel}", fontsize=14, fontweight='bold', 
-		            color='#1E3A56', pad=15)
-		ax.set_ylim(bottom=0)
-		
-		# Grid styling - soft transparency
-		ax.grid(True, axis='y', alpha=0.25, linestyle='--', linewidth=0.8, color='#C9D8E2')
-		ax.set_axisbelow(True)  # Grid behind bars
 		
-		# Tick styling
-		ax.tick_params(axis='both', colors='#1E3A56', labelsize=10)
-		
-		# Spine styling - cleaner look
-		for spine in ['top', 'right']:
-			ax.spines[spine].set_visible(False)
-		for spine in ['bottom', 'left']:
-			ax.spines[spine].set_color('#C9D8E2')
-			ax.spines[spine].set_linewidth(1.2)
-		
-		# Rotate x-labels if month view for better readability
-		if tf == "month" and len(x) > 15:
-			ax.tick_params(axis='x', rotation=45)
-		
-		# Add extra padding to prevent title/label cutoff
-		self.figure.tight_layout(pad=2.0)
-		self.canvas.draw()
+		# a newer request supersedes any render still in flight
+		if self.history_view_combo.currentText() == "By Subject":
+			rows, prev = self._subject_breakdown(start_str, end_str)
+			self.chart_view.render(charts.draw_subject_bars, rows, prev)
+		elif tf == "year heatmap":
+			self.chart_view.render(charts.draw_year_heatmap, year, year_daily)
+		else:
+			self.chart_view.render(charts.draw_daily_bars, x, y, xlabel, rotate_labels=(tf != "week" and len(x) > 15))
 		# update the centered period label (This Week / Last Week / date)
 		try:
 			label_text = ""
@@ -1440,6 +1668,23 @@ class MainWindow(QMainWindow):
 					label_text = "Last Week"
 				else:
 					label_text = datetime.date.fromisoformat(start_str).strftime("%b-%d-%Y")
+			elif tf == "quarter":
+				if offset == 0:
+					label_text = "This Quarter"
+				elif offset == 1:
+					label_text = "Last Quarter"
+				else:
+					first_day = datetime.date.fromisoformat(start_str)
+					label_text = f"Q{(first_day.month - 1) // 3 + 1} {first_day.year}"
+			elif tf == "all time":
+				label_text = "All Time"
+			elif tf in ("year", "year heatmap"):
+				if offset == 0:
+					label_text = "This Year"
+				elif offset == 1:
+					label_text = "Last Year"
+				else:
+					label_text = str(datetime.date.fromisoformat(start_str).year)
 			else:
 				# month
 				if offset == 0:
@@ -1452,25 +1697,58 @@ class MainWindow(QMainWindow):
 				self.hist_period_label.setText(label_text)
 		except Exception:
 			pass
+		# the current week/month bar chart is what startup shows from the snapshot
+		if offset == 0 and tf in ("week", "month") and self.history_view_combo.currentText() == "Daily Totals":
+			self._save_dashboard_snapshot(chart={
+				"timeframe": tf,
+				"start": start_str,
+				"end": end_str,
+				"x": x,
+				"y": [round(float(v), 3) for v in y],
+				"xlabel": xlabel,
+				"label": self.hist_period_label.text(),
+			})
 		# enable/disable forward (next) button when at current period
 		try:
 			if hasattr(self, 'hist_next_btn'):
 				self.hist_next_btn.setEnabled(getattr(self, 'history_offset', 0) > 0)
+			if hasattr(self, 'hist_prev_btn'):
+				# All Time has no earlier period to page to
+				self.hist_prev_btn.setEnabled(tf != "all time")
 		except Exception:
 			pass
 
+	def _bucket_label(self, bucket_start, bucket, tf):
+		d = datetime.date.fromisoformat(bucket_start)
+		if bucket == "week":
+			return d.strftime("%b %d")
+		if bucket == "month":
+			return d.strftime("%b") if tf == "year" else d.strftime("%b %y")
+		if bucket == "quarter":
+			return f"Q{(d.month - 1) // 3 + 1} {d.strftime('%y')}"
+		return str(d.year)
+
+	def _subject_breakdown(self, start_str, end_str):
+		"""Per-subject rows for the range plus {subject: seconds} for the previous equal-length range."""
+		start = datetime.date.fromisoformat(start_str)
+		end = datetime.date.fromisoformat(end_str)
+		span = (end - start).days + 1
+		prev_end = start - datetime.timedelta(days=1)
+		prev_start = prev_end - datetime.timedelta(days=span - 1)
+		rows = session_repo.subject_totals(start_str, end_str)
+		prev = {r["subject"]: r["total_sec"] or 0 for r in session_repo.subject_totals(prev_start.isoformat(), prev_end.isoformat())}
+		return rows, prev
 
 	def _on_tick(self, elapsed):
 		self.timer_label.setText(fmt_hms(elapsed))
+		self._update_goal_progress()
 		# Optionally: pulse or brighten timer card when running
 
 	def _on_state(self, state):
 		self._set_buttons(state)
 		if state in ("idle", "stopped"):
 			self.timer_label.setText("00:00:00")
-			self._update_today_label()
-			self._update_summary_stats()
-			self._refresh_history()
+			self._sessions_changed()
 
 
 	def _set_buttons(self, state):
@@ -1495,7 +1773,7 @@ class MainWindow(QMainWindow):
 	def _start_pause(self):
 		# Use running/paused attributes from TimerService
 		if not self.timer_service.running:
-			self.timer_service.start()
+			self.timer_service.start(subject=self._selected_subject(self.subject_combo))
 			self._set_buttons("running")
 		elif self.timer_service.running and not self.timer_service.paused:
 			self.timer_service.pause_resume()
@@ -1508,17 +1786,60 @@ class MainWindow(QMainWindow):
 		self.timer_service.stop()
 		self._set_buttons("idle")
 
+	def _sessions_changed(self):
+		"""Session data changed: redraw dependent views on the next idle turn."""
+		self.goals.invalidate()
+		self.refresh_bus.mark_dirty()
+
+	def _live_sessions(self):
+		"""(subject, elapsed_sec) for each session currently being timed."""
+		live = []
+		if self.timer_service.running:
+			live.append((self.timer_service.subject, self.timer_service.elapsed_sec))
+		if getattr(self, 'pomo_session_id', None) is not None:
+			live.append((getattr(self, 'pomo_subject', ''), self.pomo_session_elapsed))
+		return live
+
+	def _update_goal_progress(self):
+		try:
+			progress = self.goals.progress(self._live_sessions())
+		except Exception:
+			return
+		self.timer_goals.set_progress(progress)
+		self.history_goals.set_progress(progress)
+
+	def _edit_goals(self):
+		dialog = GoalDialog(self)
+		dialog.exec()
+		if dialog.changed:
+			self.goals.invalidate()
+			self.refresh_bus.mark_dirty("goals")
+
+	def _fetch_analytics(self):
+		self.analytics.refresh()
+		return self.analytics
+
 	def _update_today_label(self):
-		total_sec = session_repo.today_total_seconds()
-		if hasattr(self, 'footer_today'):
-			self.footer_today.set_today(f"Today: {total_sec // 60}m")
+		if not hasattr(self, 'footer_today') or self.day_cache is None:
+			return
+		today = day_number(local_today())
+		total_sec = self.day_cache.seconds(today, today)
+		self.footer_today.set_today(f"Today: {total_sec // 60}m")
+
+	def _daily_hours(self, first_date, last_date):
+		"""Hours studied per day in [first_date, last_date], sliced from the day cache."""
+		return self.day_cache.slice(day_number(first_date), day_number(last_date)) / 3600
 
 	def _update_summary_stats(self):
-		"""Update the Daily Streak, Total Days Studied, and Total Hours Studied labels."""
+		"""Update the Daily Streak, Total Days Studied, Total Hours Studied and Focus Ratio labels."""
+		if self.day_cache is None:
+			return
 		try:
-			streak = session_repo.get_daily_streak()
-			total_days = session_repo.get_total_days_studied()
-			total_hours = session_repo.get_total_hours_studied()
+			streak = self.day_cache.streak()
+			total_days = self.day_cache.days_studied()
+			total_hours = self.day_cache.total_seconds() / 3600.0
+			self.refresh_bus.shared_fetch()
+			focus = self.analytics.focus_ratio()
 			
 			if hasattr(self, 'streak_value_label'):
 				self.streak_value_label.setText(str(streak))
@@ -1527,41 +1848,37 @@ class MainWindow(QMainWindow):
 			if hasattr(self, 'total_hours_value_label'):
 				# Format hours nicely (e.g., "12.5h" or "120.2h")
 				self.total_hours_value_label.setText(f"{total_hours:.1f}h")
+			self.focus_value_label.setText(f"{focus:.0%}")
+			self._save_dashboard_snapshot(stats={
+				"streak": streak,
+				"total_days": total_days,
+				"total_hours": round(total_hours, 1),
+				"focus": round(focus, 3),
+			})
 		except Exception:
 			pass
 
-	def _refresh_history(self, start_date=None, end_date=None):
-		# This method is now just a placeholder for compatibility.
-		# The Study History tab no longer has a table - only graphs.
-		# The Raw Data tab has its own update method.
-		pass
-
-	def _get_sessions(self):
-		with session_repo.connect() as conn:
-			cur = conn.execute(
-				"SELECT local_date, start_utc, end_utc, duration_sec, subject, source FROM sessions ORDER BY start_utc DESC"
-			)
-			return [dict(row) for row in cur.fetchall()]
-
 	def _update_raw_data(self):
 		"""Update the Raw Data tab with sessions for the selected period."""
 		import calendar
-		import sqlite3
-		from BackEnd.core.paths import db_path
+
+		if self.raw_search_edit.text().strip():
+			self._run_raw_search()
+			return
 		
 		tf = self.raw_timeframe_combo.currentText().lower()
-		now = datetime.datetime.now()
+		today = local_today()
 		offset = getattr(self, 'raw_data_offset', 0)
 		
 		# Calculate date range based on timeframe and offset
 		if tf == "week":
-			start_of_week = (now - datetime.timedelta(days=now.weekday())) - datetime.timedelta(weeks=offset)
-			days = [(start_of_week + datetime.timedelta(days=i)).date() for i in range(7)]
+			start_of_week = (today - datetime.timedelta(days=today.weekday())) - datetime.timedelta(weeks=offset)
+			days = [start_of_week + datetime.timedelta(days=i) for i in range(7)]
 			start_str = days[0].isoformat()
 			end_str = days[-1].isoformat()
-		else:  # month
-			year = now.year
-			month = now.month - offset
+		elif tf == "month":
+			year = today.year
+			month = today.month - offset
 			while month <= 0:
 				month += 12
 				year -= 1
@@ -1569,6 +1886,8 @@ class MainWindow(QMainWindow):
 			days = [datetime.date(year, month, i+1) for i in range(num_days)]
 			start_str = days[0].isoformat()
 			end_str = days[-1].isoformat()
+		else:  # all time
+			start_str = end_str = None
 		
 		# Update period label
 		label_text = ""
@@ -1579,6 +1898,8 @@ class MainWindow(QMainWindow):
 				label_text = "Last Week"
 			else:
 				label_text = datetime.date.fromisoformat(start_str).strftime("%b-%d-%Y")
+		elif tf == "all time":
+			label_text = "All Time"
 		else:
 			if offset == 0:
 				label_text = "This Month"
@@ -1588,28 +1909,120 @@ class MainWindow(QMainWindow):
 				label_text = datetime.date.fromisoformat(start_str).strftime("%b-%d-%Y")
 		self.raw_period_label.setText(label_text)
 		
-		# Query sessions in range
-		with session_repo.connect() as conn:
-			cur = conn.execute(
-				"SELECT local_date, start_utc, end_utc, duration_sec, subject, source "
-				"FROM sessions WHERE local_date BETWEEN ? AND ? ORDER BY start_utc DESC",
-				(start_str, end_str)
-			)
-			sessions = [dict(row) for row in cur.fetchall()]
-		
-		# Populate table
-		self.raw_data_table.setRowCount(len(sessions))
-		for row, sess in enumerate(sessions):
-			self.raw_data_table.setItem(row, 0, QTableWidgetItem(sess["local_date"]))
-			self.raw_data_table.setItem(row, 1, QTableWidgetItem(sess["start_utc"]))
-			self.raw_data_table.setItem(row, 2, QTableWidgetItem(sess.get("end_utc") or ""))
-			dur = fmt_hms(sess["duration_sec"] or 0) if sess.get("duration_sec") is not None else ""
-			self.raw_data_table.setItem(row, 3, QTableWidgetItem(dur))
-			self.raw_data_table.setItem(row, 4, QTableWidgetItem(sess.get("subject") or ""))
-			self.raw_data_table.setItem(row, 5, QTableWidgetItem(sess.get("source", "timer")))
+		self._refresh_raw_subjects()
+
+		# Sort column and filters become one indexed query; rows are fetched a
+		# page at a time as the table scrolls (see _load_raw_page)
+		header = self.raw_data_table.horizontalHeader()
+		sort = _RAW_SORT_COLUMNS.get(header.sortIndicatorSection(), "start")
+		min_min = self.raw_min_dur_spin.value()
+		max_min = self.raw_max_dur_spin.value()
+		self._raw_query = dict(
+			sort=sort,
+			descending=header.sortIndicatorOrder() == Qt.SortOrder.DescendingOrder,
+			start_date=start_str,
+			end_date=end_str,
+			source=self.raw_source_combo.currentData(),
+			subject=self.raw_subject_combo.currentData(),
+			min_duration=min_min * 60 if min_min else None,
+			max_duration=max_min * 60 if max_min else None,
+		)
+		self.raw_data_table.setRowCount(0)
+		self._load_raw_page(None)
 		
 		# Enable/disable forward (next) button when at current period
-		self.raw_next_btn.setEnabled(getattr(self, 'raw_data_offset', 0) > 0)
+		self.raw_prev_btn.setEnabled(tf != "all time")
+		self.raw_next_btn.setEnabled(tf != "all time" and getattr(self, 'raw_data_offset', 0) > 0)
+
+	def _load_raw_page(self, after):
+		"""Append the page of the current Raw Data query that follows keyset `after`."""
+		records, self._raw_next_key = session_repo.page_sessions(after=after, **self._raw_query)
+		self._fill_session_rows(records)
+
+	def _on_raw_scrolled(self, value):
+		bar = self.raw_data_table.verticalScrollBar()
+		if self._raw_next_key is not None and value >= bar.maximum() - bar.pageStep() // 2:
+			self._load_raw_page(self._raw_next_key)
+
+	def _refresh_raw_subjects(self):
+		"""Refill the subject filter from history, keeping the current choice."""
+		combo = self.raw_subject_combo
+		current = combo.currentData()
+		combo.blockSignals(True)
+		combo.clear()
+		combo.addItem("All subjects", None)
+		combo.addItem("(No subject)", "")
+		for subject in session_repo.list_subjects():
+			combo.addItem(subject, subject)
+		index = combo.findData(current) if current is not None else 0
+		combo.setCurrentIndex(max(0, index))
+		combo.blockSignals(False)
+
+	def _run_raw_search(self):
+		"""Show ranked full-text matches for the search box, a batch per event-loop turn."""
+		import time
+		from PySide6.QtCore import QTimer
+		from BackEnd.core import perf
+		text = self.raw_search_edit.text().strip()
+		self._raw_search_gen += 1
+		searching = bool(text)
+		# release the previous stream's read cursor before querying again
+		if self._raw_search_batches is not None:
+			self._raw_search_batches.close()
+			self._raw_search_batches = None
+		# search results are ranked; period, filters and sort order don't apply
+		self._raw_next_key = None
+		self.raw_filter_bar.setEnabled(not searching)
+		self.raw_data_table.horizontalHeader().setSortIndicatorShown(not searching)
+		self.raw_timeframe_combo.setEnabled(not searching)
+		self.raw_prev_btn.setEnabled(not searching)
+		self.raw_data_table.setColumnHidden(6, not searching)
+		if not searching:
+			self._update_raw_data()
+			return
+		self.raw_next_btn.setEnabled(False)
+		self.raw_period_label.setText("Search results")
+		self.raw_data_table.setRowCount(0)
+		gen = self._raw_search_gen
+		batches = self._raw_search_batches = session_repo.search_sessions(text)
+		t0 = time.perf_counter()
+
+		def step():
+			# a newer search (or clearing the box) abandons this one
+			if gen != self._raw_search_gen:
+				batches.close()
+				return
+			try:
+				batch = next(batches, None)
+			except Exception:
+				batch = None
+			if batch is None:
+				return
+			if not self.raw_data_table.rowCount():
+				perf.record("raw_search_first", (time.perf_counter() - t0) * 1000)
+			self._fill_session_rows((rec for rec, _ in batch), [snip for _, snip in batch])
+			QTimer.singleShot(0, step)
+		step()
+
+	def _fill_session_rows(self, records, snippets=None):
+		"""Append SessionRecord rows to the Raw Data table, formatting timestamps at render time.
+
+		`snippets` (search matches) fill the Match column, one per record.
+		"""
+		table = self.raw_data_table
+		row = table.rowCount()
+		for i, rec in enumerate(records):
+			table.insertRow(row)
+			table.setItem(row, 0, QTableWidgetItem(rec.local_date))
+			table.setItem(row, 1, QTableWidgetItem(_utc_text(rec.start_ts)))
+			table.setItem(row, 2, QTableWidgetItem(_utc_text(rec.end_ts)))
+			dur = fmt_hms(rec.duration_sec) if rec.duration_sec is not None else ""
+			table.setItem(row, 3, QTableWidgetItem(dur))
+			table.setItem(row, 4, QTableWidgetItem(rec.subject))
+			table.setItem(row, 5, QTableWidgetItem(rec.source))
+			if snippets is not None:
+				table.setItem(row, 6, QTableWidgetItem(snippets[i]))
+			row += 1
 
 	def _check_resume_session(self):
 		# Resume prompts are disabled. Previously unfinished sessions are
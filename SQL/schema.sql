@@ -12,8 +12,82 @@ CREATE TABLE IF NOT EXISTS sessions (
 	updated_at TEXT NOT NULL,      -- UTC ISO, touched on every update
 	deleted_at TEXT,               -- null; reserved for soft deletes
 	elapsed_sec INTEGER,           -- seconds elapsed for robust resume
-	source TEXT DEFAULT 'timer'    -- 'timer' or 'pomodoro'
+	source TEXT DEFAULT 'timer',   -- 'timer' or 'pomodoro'
+	span_sec INTEGER               -- wall seconds start -> end, pauses included; set when stopped
 );
 
 CREATE INDEX IF NOT EXISTS idx_sessions_local_date ON sessions(local_date);
 CREATE INDEX IF NOT EXISTS idx_sessions_updated   ON sessions(updated_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_subject_date ON sessions(subject, local_date);
+-- sort keys of the Raw Data table; the implicit rowid suffix makes each one
+-- serve keyset paging on (key, id) directly (see session_repo.page_sessions)
+CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start_utc);
+CREATE INDEX IF NOT EXISTS idx_sessions_end ON sessions(COALESCE(end_utc, ''));
+CREATE INDEX IF NOT EXISTS idx_sessions_duration ON sessions(COALESCE(duration_sec, -1));
+CREATE INDEX IF NOT EXISTS idx_sessions_subject_sort ON sessions(COALESCE(subject, ''));
+CREATE INDEX IF NOT EXISTS idx_sessions_source ON sessions(COALESCE(source, 'timer'));
+-- partial index: only open (end_utc IS NULL) rows, used by startup reconciliation
+CREATE INDEX IF NOT EXISTS idx_sessions_open ON sessions(start_utc) WHERE end_utc IS NULL;
+
+-- Per-day slices of finished sessions. A session crossing local midnight
+-- contributes one row per local day it covers; all daily/subject aggregates
+-- read from here so day bucketing stays consistent. Rebuilt by session_repo.
+CREATE TABLE IF NOT EXISTS session_days (
+	session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+	local_date TEXT NOT NULL,      -- YYYY-MM-DD local day of this slice
+	subject TEXT NOT NULL DEFAULT '',
+	seconds INTEGER NOT NULL,      -- part of duration_sec falling on local_date
+	PRIMARY KEY (session_id, local_date)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_session_days_date ON session_days(local_date, subject, seconds);
+
+-- Active (unpaused) intervals of a session as (offset from start_utc, length)
+-- in whole seconds. Sessions without rows here (pomodoro, older history)
+-- count as one interval from start_utc to end_utc.
+CREATE TABLE IF NOT EXISTS session_segments (
+	session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+	start_offset INTEGER NOT NULL,
+	length INTEGER NOT NULL,
+	PRIMARY KEY (session_id, start_offset)
+) WITHOUT ROWID;
+
+-- Small app-wide values. 'history_version' is a random token replaced by
+-- writes that change history without moving it forward in updated_at order
+-- (purges, merged remote rows, restores); in-memory copies of the history
+-- reload when it changes.
+CREATE TABLE IF NOT EXISTS meta (
+	key TEXT PRIMARY KEY,
+	value TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- Study targets. period is 'daily' or 'weekly'; subject '' means all subjects.
+CREATE TABLE IF NOT EXISTS goals (
+	id INTEGER PRIMARY KEY,
+	period TEXT NOT NULL CHECK (period IN ('daily', 'weekly')),
+	subject TEXT NOT NULL DEFAULT '',
+	target_sec INTEGER NOT NULL CHECK (target_sec > 0),
+	updated_at TEXT NOT NULL,
+	UNIQUE (period, subject)
+);
+
+-- Full-text index over subject and note. External content: the text lives
+-- only in sessions; the triggers below keep the index in step with it.
+CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5(
+	subject, note,
+	content='sessions', content_rowid='id',
+	tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS sessions_fts_ai AFTER INSERT ON sessions BEGIN
+	INSERT INTO sessions_fts (rowid, subject, note) VALUES (new.id, new.subject, new.note);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sessions_fts_ad AFTER DELETE ON sessions BEGIN
+	INSERT INTO sessions_fts (sessions_fts, rowid, subject, note) VALUES ('delete', old.id, old.subject, old.note);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sessions_fts_au AFTER UPDATE OF subject, note ON sessions BEGIN
+	INSERT INTO sessions_fts (sessions_fts, rowid, subject, note) VALUES ('delete', old.id, old.subject, old.note);
+	INSERT INTO sessions_fts (rowid, subject, note) VALUES (new.id, new.subject, new.note);
+END;
@@ -1,6 +1,8 @@
 import os, sys
 from PySide6.QtWidgets import QApplication
 from FrontEnd.ui_main import MainWindow
+from FrontEnd.single_instance import SingleInstance
+from BackEnd.services.session_service import run_startup_recovery
 
 def resource_path(relative_path):
     # works in dev and in PyInstaller .exe
@@ -10,9 +12,31 @@ def resource_path(relative_path):
 
 def main():
     app = QApplication(sys.argv)
+    # a second launch brings the running window forward instead of opening
+    # another timer against the same database
+    instance = SingleInstance()
+    if not instance.primary:
+        if not instance.forward():
+            print("Study Tracker is already running.")
+        sys.exit(0)
+    # replay heartbeats and close sessions left open by a crash before any UI reads the DB
+    report = run_startup_recovery()
+    if report["orphans_closed"]:
+        print(f"Recovered {report['orphans_closed']} unfinished session(s) "
+              f"({report['orphan_seconds'] // 60}m)")
     win = MainWindow()
     win.show()
-    sys.exit(app.exec())
+    instance.activated.connect(lambda: _bring_to_front(win))
+    code = app.exec()
+    instance.release()
+    sys.exit(code)
+
+def _bring_to_front(win):
+    if win.isMinimized():
+        win.showNormal()
+    win.show()
+    win.raise_()
+    win.activateWindow()
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,16 @@
 """
 Reset all study tracker stats by clearing the database.
 This will delete all session history and reset stats to 0.
+
+With filters, only matching sessions are purged and the rest is kept:
+
+    python reset_stats.py --from 2024-01-01 --to 2024-06-30 --subject Math
+    python reset_stats.py --source pomodoro --dry-run
 """
 
+import argparse
 import os
+from BackEnd.core.clock import fmt_hms
 from BackEnd.core.paths import db_path, user_data_dir
 
 def reset_all_stats():
@@ -40,10 +47,48 @@ def reset_all_stats():
             except Exception as e:
                 print(f"✗ Error deleting To-Do list: {e}")
 
+def purge_stats(args):
+    """Delete only the sessions matching the command-line filters."""
+    from BackEnd.repos import session_repo
+
+    filters = dict(start_date=args.start, end_date=args.end, source=args.source, subject=args.subject)
+    if not db_path().exists():
+        print("No database found. Nothing to purge.")
+        return
+    preview = session_repo.purge_sessions(dry_run=True, **filters)
+    if not preview["sessions"]:
+        print("No sessions match these filters.")
+        return
+    print(f"{preview['sessions']} sessions ({fmt_hms(preview['seconds'])}) match.")
+    if args.dry_run:
+        return
+    if not args.yes:
+        confirm = input("Delete them permanently? This cannot be undone. (yes/no): ")
+        if confirm.lower() not in ['yes', 'y']:
+            print("Purge cancelled.")
+            return
+    try:
+        report = session_repo.purge_sessions(**filters)
+        print(f"✓ Deleted {report['sessions']} sessions, freed {report['pages_freed']} pages")
+    except Exception as e:
+        print(f"✗ Error purging sessions: {e}")
+
 if __name__ == "__main__":
-    print("=" * 50)
-    print("Study Tracker - Reset All Stats")
-    print("=" * 50)
-    reset_all_stats()
-    print("\nPress Enter to exit...")
-    input()
+    parser = argparse.ArgumentParser(description="Reset all stats, or purge selected sessions.")
+    parser.add_argument("--from", dest="start", metavar="YYYY-MM-DD", help="first local day to purge")
+    parser.add_argument("--to", dest="end", metavar="YYYY-MM-DD", help="last local day to purge")
+    parser.add_argument("--source", choices=["timer", "pomodoro"])
+    parser.add_argument("--subject", help="subject to purge ('' for sessions without one)")
+    parser.add_argument("--dry-run", action="store_true", help="only count matching sessions")
+    parser.add_argument("-y", "--yes", action="store_true", help="don't ask for confirmation")
+    args = parser.parse_args()
+
+    if any(v is not None for v in (args.start, args.end, args.source, args.subject)):
+        purge_stats(args)
+    else:
+        print("=" * 50)
+        print("Study Tracker - Reset All Stats")
+        print("=" * 50)
+        reset_all_stats()
+        print("\nPress Enter to exit...")
+        input()
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from BackEnd.core import clock
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+	"""Point study.db, the journal and the day cache at a fresh directory, in UTC."""
+	monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+	monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+	if hasattr(time, "tzset"):
+		monkeypatch.setenv("TZ", "UTC")
+		time.tzset()
+	from BackEnd.repos import day_cache_repo
+	monkeypatch.setattr(day_cache_repo, "_shared", None)
+	yield tmp_path / "StudyTracker"
+	if hasattr(time, "tzset"):
+		monkeypatch.undo()
+		time.tzset()
+
+
+@pytest.fixture
+def vclock():
+	"""VirtualClock starting 2024-03-10 08:00 UTC."""
+	with clock.use_clock(clock.VirtualClock(datetime(2024, 3, 10, 8, 0, tzinfo=timezone.utc))) as c:
+		yield c
+
+
+@pytest.fixture
+def finished_session(vclock):
+	"""Factory: start a session, let `seconds` of virtual time pass, stop it; returns its id."""
+	from BackEnd.repos import session_repo
+
+	def finish(seconds=600, subject="Math", source="timer"):
+		sid = session_repo.start_session(subject, source=source)
+		vclock.advance(seconds)
+		session_repo.stop_session(sid)
+		return sid
+	return finish
@@ -0,0 +1,67 @@
+import pytest
+
+from BackEnd.repos import session_repo
+from BackEnd.services import backup_service
+from BackEnd.services.analytics_service import SessionAnalytics
+
+
+def test_refresh_is_incremental(finished_session):
+	analytics = SessionAnalytics()
+	finished_session(600)
+	assert analytics.refresh() == 1
+	finished_session(300)
+	analytics.refresh()
+	assert len(analytics) == 2
+	assert analytics.total_seconds() == 900
+
+
+def test_focus_ratio_uses_stored_spans(vclock, finished_session):
+	analytics = SessionAnalytics()
+	sid = session_repo.start_session("Math")
+	session_repo.add_segment(sid, 0, 600)
+	session_repo.add_segment(sid, 1200, 600)   # paused for 10 minutes in between
+	vclock.advance(1800)
+	session_repo.stop_session(sid)
+	analytics.refresh()
+	assert analytics.focus_ratio() == pytest.approx(2 / 3)
+	finished_session(1800)
+	analytics.refresh()
+	assert analytics.focus_ratio() == pytest.approx(3000 / 3600)
+
+
+def test_purge_reloads_the_engine(finished_session):
+	analytics = SessionAnalytics()
+	finished_session(600, subject="Math")
+	finished_session(300, subject="Art")
+	analytics.refresh()
+	session_repo.purge_sessions(subject="Art")
+	analytics.refresh()
+	assert len(analytics) == 1
+	assert analytics.total_seconds() == 600
+
+
+def test_merge_behind_the_watermark_reloads_the_engine(finished_session):
+	analytics = SessionAnalytics()
+	finished_session(600)
+	analytics.refresh()
+	# written on another device a day earlier: updated_at is behind the watermark
+	session_repo.merge_remote_rows([{
+		"client_id": "peer-1", "start_utc": "2024-03-09T10:00:00+00:00",
+		"end_utc": "2024-03-09T11:00:00+00:00", "duration_sec": 3600,
+		"local_date": "2024-03-09", "subject": "Remote", "note": "",
+		"updated_at": "2024-03-09T11:00:00+00:00", "deleted_at": None, "elapsed_sec": None, "source": "timer",
+	}])
+	analytics.refresh()
+	assert analytics.total_seconds() == 4200
+
+
+def test_restore_reloads_the_engine(finished_session):
+	finished_session(600)
+	backup = backup_service.create_backup()
+	finished_session(300)
+	analytics = SessionAnalytics()
+	analytics.refresh()
+	assert analytics.total_seconds() == 900
+	backup_service.restore_backup(backup)
+	analytics.refresh()
+	assert analytics.total_seconds() == 600
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from PySide6.QtCore import QLockFile
+
+from BackEnd.core import clock
+from BackEnd.core.paths import app_lock_path, backups_dir
+from BackEnd.repos import session_repo
+from BackEnd.services import backup_service
+
+
+def test_backup_and_restore_round_trip(vclock, finished_session):
+	finished_session(600)
+	backup = backup_service.create_backup()
+	vclock.advance(60)
+	finished_session(300)
+	backup_service.restore_backup(backup.name)
+	assert session_repo.daily_totals("2024-03-10", "2024-03-10") == {"2024-03-10": 600}
+
+
+def test_rotate_keeps_newest_and_removes_stale_temp_copies(vclock):
+	directory = backups_dir()
+	now = clock.unix_time()
+	for i in range(4):
+		path = directory / f"study-2024010{i}-000000.db"
+		path.write_bytes(b"")
+		os.utime(path, (now - 100 + i, now - 100 + i))
+	stale = directory / "study-20240101-000000.tmp"
+	fresh = directory / "study-20240102-000000.tmp"
+	for path, age in ((stale, backup_service.STALE_TMP_SEC + 1), (fresh, 10)):
+		path.write_bytes(b"")
+		os.utime(path, (now - age, now - age))
+
+	removed = backup_service.rotate(keep=2)
+	assert sorted(p.name for p in removed) == [
+		"study-20240100-000000.db", "study-20240101-000000.db", stale.name]
+	assert fresh.exists()
+
+
+def test_restore_refuses_while_app_is_running(finished_session):
+	finished_session(600)
+	backup = backup_service.create_backup()
+	app_lock = QLockFile(str(app_lock_path()))
+	assert app_lock.tryLock(0)
+	try:
+		with pytest.raises(RuntimeError):
+			backup_service.restore_backup(backup)
+	finally:
+		app_lock.unlock()
+	backup_service.restore_backup(backup)
+
+
+def test_scheduler_stop_waits_for_the_thread():
+	scheduler = backup_service.BackupScheduler(delay=0, poll=3600)
+	scheduler.start()
+	scheduler.stop(timeout=5)
+	assert not scheduler._thread.is_alive()
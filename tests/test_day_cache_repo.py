@@ -0,0 +1,118 @@
+import datetime
+import sqlite3
+
+import numpy as np
+
+from BackEnd.core.paths import day_cache_path
+from BackEnd.repos import day_cache_repo, session_repo
+from BackEnd.repos.day_cache_repo import GROW_DAYS, HEADER, DayCache
+from BackEnd.services.analytics_service import day_number
+
+DAY = 86400
+MAR_10 = day_number(datetime.date(2024, 3, 10))
+
+
+def test_stop_updates_the_open_cache_in_place(finished_session):
+	cache = day_cache_repo.shared()
+	assert cache.total_seconds() == 0
+	finished_session(1500)
+	assert cache.seconds(MAR_10, MAR_10) == 1500
+	assert cache.days_studied() == 1
+	assert cache.base == MAR_10
+
+
+def test_split_session_updates_both_days(vclock, finished_session):
+	cache = day_cache_repo.shared()
+	vclock.advance(15 * 3600 + 1800)  # 23:30
+	sid = finished_session(3600)
+	assert list(cache.slice(MAR_10, MAR_10 + 1)) == [1800, 1800]
+	with session_repo.connect() as conn:
+		assert session_repo.refresh_session_days(conn, [sid]) == {"2024-03-10", "2024-03-11"}
+
+
+def test_new_days_grow_the_file_in_blocks(vclock, finished_session):
+	cache = day_cache_repo.shared()
+	finished_session(600)
+	assert len(cache.days) == GROW_DAYS
+	vclock.advance(GROW_DAYS * DAY)
+	finished_session(900)
+	assert len(cache.days) == 2 * GROW_DAYS
+	assert day_cache_path().stat().st_size == HEADER.size + 4 * 2 * GROW_DAYS
+	assert cache.seconds(MAR_10, MAR_10) == 600
+	assert cache.seconds(MAR_10 + GROW_DAYS, MAR_10 + GROW_DAYS) == 900
+
+
+def test_merged_day_before_base_rebuilds(finished_session):
+	cache = day_cache_repo.shared()
+	finished_session(600)
+	session_repo.merge_remote_rows([{
+		"client_id": "peer-1", "start_utc": "2024-03-01T10:00:00+00:00",
+		"end_utc": "2024-03-01T11:00:00+00:00", "duration_sec": 3600,
+		"local_date": "2024-03-01", "subject": "Remote", "note": "",
+		"updated_at": "2024-03-10T08:00:00+00:00", "deleted_at": None, "elapsed_sec": None, "source": "timer",
+	}])
+	assert cache.base == MAR_10 - 9
+	assert cache.seconds(MAR_10 - 9, MAR_10 - 9) == 3600
+	assert cache.total_seconds() == 4200
+
+
+def test_checksum_mismatch_rebuilds_at_open(finished_session):
+	finished_session(600)
+	DayCache().open().close()
+	with open(day_cache_path(), "r+b") as f:
+		f.seek(HEADER.size)
+		f.write(np.array([999], dtype="<i4").tobytes())
+	stale = DayCache().open(verify=False)
+	assert stale.total_seconds() == 999
+	stale.close()
+	assert DayCache().open().total_seconds() == 600
+
+
+def test_invalidate_remaps_on_next_read(finished_session):
+	cache = day_cache_repo.shared()
+	finished_session(600)
+	day_cache_repo.invalidate()
+	assert not day_cache_path().exists()
+	assert cache.total_seconds() == 600
+	assert day_cache_path().exists()
+
+
+def test_other_mapping_sees_updates_and_growth(vclock, finished_session):
+	cache = day_cache_repo.shared()
+	finished_session(600)
+	other = DayCache().open(verify=False)
+	finished_session(300)
+	assert other.seconds(MAR_10, MAR_10) == 900
+	vclock.advance(GROW_DAYS * DAY)
+	finished_session(120)
+	assert other.total_seconds() == 1020
+	assert len(other.days) == len(cache.days) == 2 * GROW_DAYS
+	other.close()
+
+
+def test_streak_and_slice(vclock, finished_session):
+	cache = day_cache_repo.shared()
+	for _ in range(3):
+		finished_session(600)
+		vclock.advance(DAY - 600)
+	assert list(cache.slice(MAR_10 - 1, MAR_10 + 3)) == [0, 600, 600, 600, 0]
+	assert cache.streak(MAR_10 + 2) == 3
+	assert cache.streak(MAR_10 + 3) == 0
+	assert cache.streak() == 0   # nothing studied yet today
+
+
+def test_failed_update_drops_cache_without_retrying_the_write(vclock, monkeypatch):
+	cache = day_cache_repo.shared()
+	sid = session_repo.start_session("Math")
+	vclock.advance(600)
+	calls = []
+
+	def locked(self, dates, conn=None):
+		calls.append(dates)
+		raise sqlite3.OperationalError("database is locked")
+
+	monkeypatch.setattr(day_cache_repo.DayCache, "update", locked)
+	assert session_repo.stop_session(sid) == 600
+	assert len(calls) == 1
+	assert not day_cache_path().exists()
+	assert cache.total_seconds() == 600
@@ -0,0 +1,58 @@
+from BackEnd.core import clock
+from BackEnd.core.paths import journal_path
+from BackEnd.repos import journal_repo, session_repo
+from BackEnd.repos.journal_repo import HEARTBEAT, RECORD, START, STOP, Journal
+
+
+def test_records_round_trip(vclock):
+	journal = Journal(fsync_every=2)
+	journal.append(START, 7, 0)
+	vclock.advance(30)
+	journal.append(HEARTBEAT, 7, 30)
+	journal.close()
+	records = journal_repo.read_records()
+	assert records == [(START, 7, 0, clock.unix_time() - 30), (HEARTBEAT, 7, 30, clock.unix_time())]
+
+
+def test_torn_tail_is_ignored(vclock):
+	journal = Journal()
+	journal.append(START, 1, 0)
+	journal.append(HEARTBEAT, 1, 10)
+	journal.close()
+	with open(journal_path(), "ab") as f:
+		f.write(RECORD.pack(HEARTBEAT, 1, 20, 0)[:7])
+	assert [r[2] for r in journal_repo.read_records()] == [0, 10]
+
+
+def test_stop_of_last_open_session_truncates(vclock):
+	journal = Journal()
+	journal.append(START, 1, 0)
+	journal.append(START, 2, 0)
+	journal.append(STOP, 1, 5)
+	assert journal_path().stat().st_size == 3 * RECORD.size
+	journal.append(STOP, 2, 5)
+	assert journal_path().stat().st_size == 0
+	journal.close()
+
+
+def test_latest_heartbeats_skips_stopped_and_keeps_highest():
+	records = [
+		(START, 1, 0, 100), (HEARTBEAT, 1, 60, 160), (HEARTBEAT, 1, 30, 190),
+		(START, 2, 0, 100), (HEARTBEAT, 2, 10, 110), (STOP, 2, 10, 111),
+	]
+	assert journal_repo.latest_heartbeats(records) == {1: (60, 160)}
+
+
+def test_replay_updates_open_session_and_truncates(vclock):
+	sid = session_repo.start_session("Math")
+	journal = Journal()
+	journal.append(START, sid, 0)
+	vclock.advance(90)
+	journal.append(HEARTBEAT, sid, 90)
+	journal.close()
+
+	assert journal_repo.replay() == 1
+	assert session_repo.active_session()["elapsed_sec"] == 90
+	assert journal_path().stat().st_size == 0
+	# an older heartbeat never moves elapsed_sec backwards
+	assert session_repo.apply_heartbeats({sid: (30, clock.unix_time())}) == 0
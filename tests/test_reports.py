@@ -0,0 +1,22 @@
+import datetime
+
+import pytest
+
+from FrontEnd import reports
+
+
+def test_period_bounds_end_with_the_current_period():
+	assert reports.period_bounds("week", 2, datetime.date(2024, 3, 13)) == [
+		(datetime.date(2024, 3, 4), datetime.date(2024, 3, 10)),
+		(datetime.date(2024, 3, 11), datetime.date(2024, 3, 17)),
+	]
+	assert reports.period_bounds("month", 1, datetime.date(2024, 2, 10)) == [
+		(datetime.date(2024, 2, 1), datetime.date(2024, 2, 29))]
+
+
+@pytest.mark.parametrize("count", [0, -3])
+def test_count_below_one_is_rejected(count):
+	with pytest.raises(ValueError):
+		reports.period_bounds("week", count)
+	with pytest.raises(ValueError):
+		reports.build_jobs("month", count)
@@ -0,0 +1,261 @@
+import pytest
+
+from BackEnd.repos import session_repo
+
+
+# ---- per-day split (session_days) -------------------------------------------
+
+def test_session_across_midnight_is_split(vclock, finished_session):
+	vclock.advance(15 * 3600 + 1800)  # 23:30
+	finished_session(3600)
+	assert session_repo.daily_totals("2024-03-10", "2024-03-11") == {"2024-03-10": 1800, "2024-03-11": 1800}
+
+
+def test_session_spanning_two_midnights(vclock, finished_session):
+	vclock.advance(15 * 3600)  # 23:00
+	finished_session(26 * 3600)
+	assert session_repo.daily_totals("2024-03-10", "2024-03-12") == {
+		"2024-03-10": 3600, "2024-03-11": 86400, "2024-03-12": 3600}
+
+
+def test_paused_time_lands_on_no_day(vclock):
+	vclock.advance(15 * 3600)  # 23:00
+	sid = session_repo.start_session("Math")
+	session_repo.add_segment(sid, 0, 600)       # 23:00-23:10
+	session_repo.add_segment(sid, 4200, 900)    # 00:10-00:25, after a pause over midnight
+	vclock.advance(5100)
+	assert session_repo.stop_session(sid) == 1500
+	assert session_repo.daily_totals("2024-03-10", "2024-03-11") == {"2024-03-10": 600, "2024-03-11": 900}
+
+
+# ---- orphaned session reconciliation ----------------------------------------
+
+def row_of(sid):
+	with session_repo.connect() as conn:
+		return conn.execute(
+			"SELECT start_utc, end_utc, duration_sec FROM sessions WHERE id=?", (sid,)).fetchone()
+
+
+def test_orphan_is_closed_from_its_last_heartbeat(vclock, finished_session):
+	done = finished_session(300)
+	sid = session_repo.start_session("Math")
+	vclock.advance(1600)
+	session_repo.update_elapsed(sid, 1500)
+	vclock.advance(3 * 3600)   # the app was gone long after the last heartbeat
+	report = session_repo.close_orphaned_sessions()
+	assert report == {"closed": 1, "recovered_sec": 1500, "ids": [sid], "remaining": False}
+	row = row_of(sid)
+	assert row["duration_sec"] == 1500
+	assert row["end_utc"] == "2024-03-10T08:30:00+00:00"
+	assert row_of(done)["duration_sec"] == 300
+	assert session_repo.active_session() is None
+
+
+def test_orphan_without_heartbeat_falls_back_to_updated_at(vclock):
+	sid = session_repo.start_session("Math")
+	with session_repo.connect() as conn:
+		conn.execute("UPDATE sessions SET updated_at = '2024-03-10T08:15:00+00:00' WHERE id=?", (sid,))
+	vclock.advance(3600)
+	assert session_repo.close_orphaned_sessions()["recovered_sec"] == 900
+	assert row_of(sid)["duration_sec"] == 900
+
+
+def test_orphans_are_closed_oldest_first_up_to_max_rows(vclock):
+	ids = []
+	for _ in range(3):
+		ids.append(session_repo.start_session("Math"))
+		vclock.advance(60)
+	report = session_repo.close_orphaned_sessions(max_rows=2)
+	assert report["ids"] == ids[:2] and report["closed"] == 2 and report["remaining"]
+	assert row_of(ids[2])["end_utc"] is None
+	report = session_repo.close_orphaned_sessions(max_rows=2)
+	assert report["ids"] == ids[2:] and not report["remaining"]
+
+
+def test_closed_orphan_is_split_into_days(vclock):
+	vclock.advance(15 * 3600 + 1800)  # 23:30
+	sid = session_repo.start_session("Math")
+	vclock.advance(3600)
+	session_repo.update_elapsed(sid, 3600)
+	session_repo.close_orphaned_sessions()
+	assert session_repo.daily_totals("2024-03-10", "2024-03-11") == {"2024-03-10": 1800, "2024-03-11": 1800}
+
+
+# ---- stored wall-clock span -------------------------------------------------
+
+def span_of(sid):
+	with session_repo.connect() as conn:
+		return conn.execute("SELECT span_sec FROM sessions WHERE id=?", (sid,)).fetchone()[0]
+
+
+def test_stop_stores_span_including_pauses(vclock):
+	sid = session_repo.start_session("Math")
+	session_repo.add_segment(sid, 0, 600)
+	session_repo.add_segment(sid, 1200, 600)
+	vclock.advance(1800)
+	assert session_repo.stop_session(sid) == 1200
+	assert span_of(sid) == 1800
+
+
+def test_span_is_backfilled_for_older_databases(finished_session):
+	sid = finished_session(900)
+	with session_repo.connect() as conn:
+		conn.execute("UPDATE sessions SET span_sec = NULL")
+		conn.execute("PRAGMA user_version = 3")
+	assert span_of(sid) == 900
+
+
+# ---- purge ------------------------------------------------------------------
+
+def session_count():
+	with session_repo.connect() as conn:
+		return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def test_purge_needs_a_filter(vclock):
+	with pytest.raises(ValueError):
+		session_repo.purge_sessions()
+
+
+def test_purge_by_subject_and_source(finished_session):
+	finished_session(600, subject="Math")
+	finished_session(600, subject="")
+	finished_session(600, subject="Math", source="pomodoro")
+	report = session_repo.purge_sessions(subject="Math", source="timer")
+	assert (report["sessions"], report["seconds"]) == (1, 600)
+	# subject '' means "no subject", not "any subject"
+	assert session_repo.purge_sessions(subject="")["sessions"] == 1
+	assert [r["subject"] for r in session_repo.subject_totals("2024-03-10", "2024-03-10")] == ["Math"]
+	assert session_count() == 1
+
+
+def test_purge_by_date_range_and_dry_run(vclock, finished_session):
+	finished_session(600)
+	vclock.advance(86400)
+	finished_session(900)
+	dry = session_repo.purge_sessions(end_date="2024-03-10", dry_run=True)
+	assert (dry["sessions"], dry["seconds"]) == (1, 600)
+	assert session_count() == 2
+	session_repo.purge_sessions(end_date="2024-03-10")
+	assert session_repo.daily_totals("2024-03-10", "2024-03-11") == {"2024-03-11": 900}
+
+
+def test_purge_never_deletes_open_sessions(vclock, finished_session):
+	finished_session(600)
+	sid = session_repo.start_session("Math")
+	vclock.advance(60)
+	assert session_repo.purge_sessions(start_date="2024-03-10")["sessions"] == 1
+	assert session_repo.active_session()["id"] == sid
+
+
+# ---- compact records --------------------------------------------------------
+
+def test_iter_sessions_yields_compact_records(vclock, finished_session):
+	first = finished_session(600)
+	vclock.advance(86400)
+	second = finished_session(300)
+	open_id = session_repo.start_session("Math")
+	records = list(session_repo.iter_sessions(batch_size=2))
+	assert [r.id for r in records] == [open_id, second, first]
+	assert records[1].end_ts - records[1].start_ts == 300
+	assert records[0].end_ts is None and records[0].duration_sec is None
+	# repeated strings are shared between records
+	assert records[1].subject is records[2].subject
+	assert [r.id for r in session_repo.iter_sessions("2024-03-10", "2024-03-10")] == [first]
+
+
+# ---- keyset paging ----------------------------------------------------------
+
+def all_pages(**kwargs):
+	pages, after = [], None
+	while True:
+		records, after = session_repo.page_sessions(after=after, **kwargs)
+		pages.append([r.id for r in records])
+		if after is None:
+			return pages
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_paging_over_ties_visits_every_row_once(finished_session, descending):
+	# two runs of equal keys that cross page boundaries
+	ids = [finished_session(seconds) for seconds in [300] * 5 + [600] * 6]
+	pages = all_pages(sort="duration", descending=descending, limit=3)
+	seen = [sid for page in pages for sid in page]
+	assert sorted(seen) == sorted(ids)
+	assert [len(p) for p in pages] == [3, 3, 3, 2]
+
+	records = [r for r in session_repo.page_sessions(sort="duration", descending=descending, limit=100)[0]]
+	assert [r.id for r in records] == seen
+	keys = [(r.duration_sec, r.id) for r in records]
+	assert keys == sorted(keys, reverse=descending)
+
+
+def test_paging_with_filters(finished_session):
+	for i in range(5):
+		finished_session(300 * (i + 1), subject="Math" if i % 2 else "")
+	records, after = session_repo.page_sessions(sort="start", subject="Math", limit=10)
+	assert after is None and [r.duration_sec for r in records] == [1200, 600]
+	records, _ = session_repo.page_sessions(sort="duration", descending=False, min_duration=600, max_duration=1200)
+	assert [r.duration_sec for r in records] == [600, 900, 1200]
+	# open sessions have no duration and stay out of a duration filter
+	session_repo.start_session("Math")
+	assert len(session_repo.page_sessions(min_duration=0)[0]) == 5
+	assert len(session_repo.page_sessions()[0]) == 6
+
+
+# ---- full-text search -------------------------------------------------------
+
+def noted_session(vclock, subject, note):
+	sid = session_repo.start_session(subject, note=note)
+	vclock.advance(600)
+	session_repo.stop_session(sid)
+	return sid
+
+
+def search_ids(text):
+	return [record.id for batch in session_repo.search_sessions(text) for record, _ in batch]
+
+
+def fts_ids(query):
+	with session_repo.connect() as conn:
+		return [row[0] for row in conn.execute("SELECT rowid FROM sessions_fts WHERE sessions_fts MATCH ?", (query,))]
+
+
+def test_fts_query_quotes_words_as_prefixes():
+	assert session_repo.fts_query("alg lin") == '"alg"* "lin"*'
+	assert session_repo.fts_query('NOT "x" OR (y*) -z:') == '"NOT"* "x"* "OR"* "y"* "z"*'
+	assert session_repo.fts_query(" ?! ") == ""
+
+
+def test_search_matches_prefixes_of_every_word(vclock):
+	algebra = noted_session(vclock, "Linear Algebra", "eigenvalues")
+	noted_session(vclock, "Linear Programming", "simplex")
+	assert search_ids("lin alg") == [algebra]
+	assert search_ids("eigen") == [algebra]
+	assert search_ids("") == []
+
+
+def test_search_treats_operators_and_punctuation_literally(vclock):
+	sid = noted_session(vclock, "Chemistry", "read chapter NOT finished (part 2)")
+	assert search_ids('NOT (part') == [sid]
+	assert search_ids('"chem*') == [sid]
+	assert search_ids("AND OR") == []
+
+
+def test_subject_matches_rank_above_note_matches(vclock):
+	in_note = noted_session(vclock, "History", "notes on physics homework")
+	in_subject = noted_session(vclock, "Physics", "")
+	assert search_ids("physics") == [in_subject, in_note]
+
+
+def test_index_follows_updates_deletes_and_purges(vclock):
+	sid = noted_session(vclock, "Biology", "cells")
+	with session_repo.connect() as conn:
+		conn.execute("UPDATE sessions SET subject = 'Genetics', note = 'genes' WHERE id = ?", (sid,))
+	assert search_ids("biology") == [] and search_ids("cells") == []
+	assert search_ids("genetics") == [sid]
+	session_repo.soft_delete_session(sid)
+	assert search_ids("genetics") == []
+	assert fts_ids('"genetics"') == [sid]   # kept for sync until purged
+	session_repo.purge_sessions(subject="Genetics")
+	assert fts_ids('"genetics"') == []
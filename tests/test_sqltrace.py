@@ -0,0 +1,51 @@
+import pytest
+
+from BackEnd.core import sqltrace
+
+SELECT = "SELECT value FROM generate WHERE value < ?"
+
+
+@pytest.fixture
+def traced():
+	sqltrace.reset()
+	sqltrace.enable()
+	conn = sqltrace.connect(":memory:")
+	conn.execute("CREATE TABLE generate (value INTEGER)")
+	conn.executemany("INSERT INTO generate VALUES (?)", [(i,) for i in range(10)])
+	sqltrace.reset()
+	yield conn
+	conn.close()
+	sqltrace.disable()
+	sqltrace.reset()
+
+
+def stat(sql):
+	key = sqltrace._key(sql)
+	return next(r for r in sqltrace.snapshot() if r["sql"] == key)
+
+
+def test_fetchmany_loop_records_one_sample(traced):
+	cur = traced.execute(SELECT, (10,))
+	while cur.fetchmany(3):
+		pass
+	# extra calls on the drained cursor add no sample
+	assert cur.fetchmany(3) == []
+	assert cur.fetchone() is None
+	cur.close()
+	assert stat(SELECT)["count"] == 1
+	assert stat(SELECT)["rows"] == 10
+
+
+def test_fetchall_and_iteration_record_one_sample_each(traced):
+	traced.execute(SELECT, (5,)).fetchall()
+	assert len(list(traced.execute(SELECT, (5,)))) == 5
+	assert stat(SELECT)["count"] == 2
+	assert stat(SELECT)["rows"] == 10
+
+
+def test_abandoned_query_is_recorded_on_next_execute(traced):
+	cur = traced.cursor()
+	cur.execute(SELECT, (10,))
+	cur.fetchone()
+	cur.execute("SELECT 1").fetchall()
+	assert stat(SELECT)["count"] == 1
@@ -0,0 +1,75 @@
+import pytest
+
+from BackEnd.repos import session_repo
+from BackEnd.services import sync_service
+from BackEnd.services.sync_service import SyncRemote
+
+
+class MemoryRemote(SyncRemote):
+	"""Remote that serves `inbox` once and records every push."""
+
+	key = "memory"
+
+	def __init__(self, inbox=()):
+		self.inbox = list(inbox)
+		self.pushed = []
+
+	def push(self, device_id, rows):
+		self.pushed.append(rows)
+
+	def pull(self, device_id, cursor):
+		rows, self.inbox = self.inbox, []
+		return rows, cursor
+
+
+def remote_row(client_id, updated_at, subject="Remote", deleted_at=None):
+	return {
+		"client_id": client_id, "start_utc": "2024-03-09T10:00:00+00:00",
+		"end_utc": "2024-03-09T11:00:00+00:00", "duration_sec": 3600,
+		"local_date": "2024-03-09", "subject": subject, "note": "",
+		"updated_at": updated_at, "deleted_at": deleted_at, "elapsed_sec": None, "source": "timer",
+	}
+
+
+def test_remote_must_implement_push_and_pull():
+	with pytest.raises(TypeError):
+		SyncRemote()
+
+
+def test_merge_is_last_writer_wins(vclock):
+	assert session_repo.merge_remote_rows([remote_row("a", "2024-03-09T12:00:00+00:00")]) == (1, 0)
+	older = remote_row("a", "2024-03-09T11:59:59+00:00", subject="Older")
+	newer = remote_row("a", "2024-03-09T12:00:01+00:00", subject="Newer", deleted_at="2024-03-09T12:00:01+00:00")
+	assert session_repo.merge_remote_rows([older]) == (0, 0)
+	assert session_repo.merge_remote_rows([newer]) == (0, 1)
+	row = session_repo.changed_since()[0]
+	assert (row["subject"], row["deleted_at"]) == ("Newer", newer["deleted_at"])
+	# the soft delete removed its time from the per-day rollup
+	assert session_repo.daily_totals("2024-03-09", "2024-03-09") == {}
+
+
+def test_sync_pushes_local_rows_once(vclock, finished_session):
+	finished_session()
+	remote = MemoryRemote()
+	assert sync_service.sync(remote)["pushed"] == 1
+	vclock.advance(5)
+	assert sync_service.sync(remote)["pushed"] == 0
+	finished_session(subject="Physics")
+	assert sync_service.sync(remote)["pushed"] == 1
+	assert remote.pushed[-1][0]["subject"] == "Physics"
+
+
+def test_peer_clock_ahead_does_not_hide_later_local_edits(vclock, finished_session):
+	finished_session()
+	# a peer whose clock runs a day ahead
+	remote = MemoryRemote([remote_row("peer", "2024-03-11T08:00:00+00:00")])
+	report = sync_service.sync(remote)
+	assert (report["pulled"], report["inserted"], report["pushed"]) == (1, 1, 1)
+	assert all(r["client_id"] != "peer" for r in remote.pushed[-1])
+
+	vclock.advance(60)
+	sid = finished_session(subject="Physics")
+	sync_service.sync(remote)
+	pushed = {r["client_id"] for r in remote.pushed[-1]}
+	local_ids = {r["client_id"] for r in session_repo.changed_since() if r["subject"] == "Physics"}
+	assert local_ids <= pushed, f"session {sid} was never pushed"
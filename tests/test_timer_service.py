@@ -0,0 +1,49 @@
+import sqlite3
+
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from BackEnd.repos import session_repo
+from BackEnd.services.timer_service import TimerService
+
+
+@pytest.fixture(scope="module", autouse=True)
+def qt_app():
+	# TimerService owns a QTimer; no event loop runs in these tests
+	return QCoreApplication.instance() or QCoreApplication([])
+
+
+def durations():
+	with session_repo.connect() as conn:
+		return [row[0] for row in conn.execute("SELECT duration_sec FROM sessions ORDER BY id")]
+
+
+def test_paused_time_is_excluded(vclock):
+	timer = TimerService()
+	timer.start("Math")
+	vclock.advance(600)
+	timer.pause_resume()
+	vclock.advance(300)
+	timer.pause_resume()
+	vclock.advance(120)
+	timer.stop()
+	assert durations() == [720]
+
+
+def test_failed_segment_write_is_stored_at_stop(vclock, monkeypatch):
+	timer = TimerService()
+	timer.start("Math")
+	vclock.advance(600)
+
+	def locked(*args):
+		raise sqlite3.OperationalError("database is locked")
+	with monkeypatch.context() as m:
+		m.setattr(session_repo, "add_segment", locked)
+		timer.pause_resume()
+	assert timer._pending_segments == [(0, 600)]
+	vclock.advance(300)
+	timer.pause_resume()
+	vclock.advance(120)
+	timer.stop()
+	assert durations() == [720]
+	assert session_repo.daily_totals("2024-03-10", "2024-03-10") == {"2024-03-10": 720}